@@ -0,0 +1,155 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+
+
+def _encode_value(value):
+    # 날짜/시각 key는 마이크로초까지 그대로 담아야 경계 행이 빠지거나 중복되지 않음
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f'cursor에 담을 수 없는 값입니다: {value!r}')
+
+
+def encode_cursor(position):
+    raw = json.dumps(position, separators=(',', ':'), default=_encode_value).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """cursor 문자열 → 마지막으로 읽은 위치, cursor가 없으면 None"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        return json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise ParseError('cursor 값이 올바르지 않습니다.')
+
+
+class KeysetPagination:
+    """
+    pk처럼 인덱스가 있고 단조 증가하는 컬럼 기준 cursor 페이지네이션
+    key에 ('timestamp', 'pk')처럼 여러 컬럼을 주면 그 순서(뒤 컬럼은 동률 정리용)로 페이지를 나눔
+    ?cursor 또는 ?page_size가 있을 때만 동작하므로 기존 클라이언트는 그대로 전체 목록을 받음
+    OFFSET 대신 "key > 마지막으로 읽은 값" 조건으로 읽으므로 몇 번째 페이지든 비용이 같음
+    응답: {"next_cursor": 다음 페이지 cursor 또는 null, "results": [...]}
+    """
+    default_page_size = 100
+    max_page_size = 1000
+
+    def __init__(self, key='pk', descending=False):
+        self.key = key
+        self.descending = descending
+        self.next_cursor = None
+
+    def is_requested(self, request):
+        return 'cursor' in request.query_params or 'page_size' in request.query_params
+
+    def get_page_size(self, request):
+        value = request.query_params.get('page_size')
+        if not value:
+            return self.default_page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            raise ParseError('page_size는 정수여야 합니다.')
+        return max(1, min(page_size, self.max_page_size))
+
+    @property
+    def _keys(self):
+        return self.key if isinstance(self.key, tuple) else (self.key,)
+
+    def _ordering(self):
+        return [('-' if self.descending else '') + key for key in self._keys]
+
+    def _position_of(self, obj):
+        values = [getattr(obj, key) for key in self._keys]
+        return values if isinstance(self.key, tuple) else values[0]
+
+    def _after(self, queryset, key, position, descending):
+        op = 'lt' if descending else 'gt'
+        if not isinstance(key, tuple):
+            condition = Q(**{f'{key}__{op}': position})
+        elif isinstance(position, list) and len(position) == len(key):
+            # (a, b) > (x, y) ⇔ a > x 또는 (a = x 이고 b > y)
+            condition = Q()
+            for i in range(len(key)):
+                equal = {k: v for k, v in zip(key[:i], position[:i])}
+                condition |= Q(**equal, **{f'{key[i]}__{op}': position[i]})
+        else:
+            raise ParseError('cursor 값이 올바르지 않습니다.')
+        try:
+            return queryset.filter(condition)
+        except (TypeError, ValueError, ValidationError):
+            raise ParseError('cursor 값이 올바르지 않습니다.')
+
+    def paginate_queryset(self, queryset, request):
+        page_size = self.get_page_size(request)
+        position = decode_cursor(request.query_params.get('cursor'))
+        if position is not None:
+            queryset = self._after(queryset, self.key, position, self.descending)
+
+        # 다음 페이지 존재 여부를 알기 위해 한 건 더 읽음
+        rows = list(queryset.order_by(*self._ordering())[:page_size + 1])
+        page = rows[:page_size]
+        self.next_cursor = encode_cursor(self._position_of(page[-1])) if len(rows) > page_size else None
+        return page
+
+    def paginate_merged(self, querysets, request, sort_key):
+        """
+        여러 테이블을 한 목록으로 이어 붙일 때 사용 ({"pest": qs, "disease": qs})
+        테이블마다 key 기준으로 page_size + 1건씩 읽고 sort_key로 병합, cursor에는 테이블별 마지막 위치를 담음
+        반환값: [(이름, 객체), ...]
+        """
+        page_size = self.get_page_size(request)
+        position = decode_cursor(request.query_params.get('cursor')) or {}
+        if not isinstance(position, dict):
+            raise ParseError('cursor 값이 올바르지 않습니다.')
+
+        candidates = []
+        for name, queryset in querysets.items():
+            if position.get(name) is not None:
+                queryset = self._after(queryset, self.key, position[name], self.descending)
+            candidates.extend((name, obj) for obj in queryset.order_by(*self._ordering())[:page_size + 1])
+
+        candidates.sort(key=lambda item: sort_key(item[1]), reverse=self.descending)
+        page = candidates[:page_size]
+
+        if len(candidates) > page_size:
+            next_position = {name: position.get(name) for name in querysets}
+            for name, obj in page:
+                next_position[name] = self._position_of(obj)
+            self.next_cursor = encode_cursor(next_position)
+        else:
+            self.next_cursor = None
+        return page
+
+    def paginate_filtered(self, queryset, request, predicate):
+        """
+        DB 조건으로는 후보까지만 좁히고 나머지(다각형 안 여부 등)는 Python에서 거를 때 사용
+        key 순서로 page_size + 1건씩 읽어 predicate를 통과한 객체가 page_size + 1건 모이거나 끝날 때까지 반복
+        """
+        page_size = self.get_page_size(request)
+        position = decode_cursor(request.query_params.get('cursor'))
+
+        accepted = []
+        while len(accepted) <= page_size:
+            chunk = queryset if position is None else self._after(queryset, self.key, position, self.descending)
+            rows = list(chunk.order_by(*self._ordering())[:page_size + 1])
+            accepted.extend(obj for obj in rows if predicate(obj))
+            if len(rows) <= page_size:
+                break
+            position = self._position_of(rows[-1])
+
+        page = accepted[:page_size]
+        self.next_cursor = encode_cursor(self._position_of(page[-1])) if len(accepted) > page_size else None
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({"next_cursor": self.next_cursor, "results": data})
@@ -188,6 +188,42 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'repository')
 
+# 사진 파일 전달 (/photo/media/): 권한은 Django에서 확인하고 전송은 앞단 웹 서버에 넘김
+# 'nginx' = X-Accel-Redirect (internal location이 MEDIA_ROOT를 가리키도록 설정), 'apache' = X-Sendfile,
+# 'django' = Django가 직접 전송 (개발용, Range 지원)
+FIELDPIC_MEDIA_SERVER = env('FIELDPIC_MEDIA_SERVER', default='django')
+FIELDPIC_MEDIA_ACCEL_PREFIX = env('FIELDPIC_MEDIA_ACCEL_PREFIX', default='/protected-media/')
+# 사진 URL 서명 유효 시간 / 발급 시각 내림 단위 (초), 같은 구간 안에서는 같은 URL
+FIELDPIC_MEDIA_URL_MAX_AGE = env.int('FIELDPIC_MEDIA_URL_MAX_AGE', default=24 * 3600)
+FIELDPIC_MEDIA_URL_ROUNDING = 3600
+# 파일은 내용 해시 경로라 바뀌지 않지만 URL이 만료되므로 브라우저 캐시도 URL 유효 시간까지만 (초)
+FIELDPIC_MEDIA_MAX_AGE = FIELDPIC_MEDIA_URL_MAX_AGE
+
+# FieldPic 업로드 후 Celery로 만드는 축소본 (긴 변 픽셀 기준)
+FIELDPIC_DERIVATIVE_SIZES = {'thumb': 256, 'preview': 1024}
+FIELDPIC_DERIVATIVE_FORMATS = ['webp', 'jpeg']
+FIELDPIC_DERIVATIVE_QUALITY = 80
+
+# 일괄 업로드(/photo/upload/bulk/): 저장/해시/EXIF 스레드 수, bulk_create 및 Celery 작업 묶음 크기
+FIELDPIC_BULK_UPLOAD_WORKERS = 4
+FIELDPIC_BULK_CREATE_BATCH = 500
+FIELDPIC_BULK_TASK_BATCH = 50
+# 일괄 업로드 압축 파일을 풀었을 때 사진 전체 크기 상한 (멤버 하나는 FIELDPIC_UPLOAD_MAX_SIZE까지)
+FIELDPIC_ARCHIVE_MAX_SIZE = 2 * 1024 * 1024 * 1024
+# 이어받기 업로드(/photo/upload/resumable/) 최대 파일 크기, 완료되지 않은 업로드 보관 시간
+FIELDPIC_UPLOAD_MAX_SIZE = 200 * 1024 * 1024
+FIELDPIC_UPLOAD_EXPIRE_HOURS = 24
+# 사진 위치 조회(/photo/search/) 격자: 셀 한 변(도, 0.001 ≈ 위도 방향 111m), 한 번에 조회할 수 있는 최대 행 수
+FIELDPIC_GEO_CELL_SIZE = 0.001
+FIELDPIC_GEO_MAX_ROWS = 500
+# 거의 같은 사진(정지 비행 / 겹치는 경로): 같은 노지, 촬영 시각 차이(초) / 위치 차이(m) 이내이고
+# dHash 해밍 거리(64비트 중)가 DISTANCE 이하이면 먼저 찍은 사진의 중복으로 표시하고 분석 생략
+FIELDPIC_NEAR_DUPLICATE_WINDOW = 600
+FIELDPIC_NEAR_DUPLICATE_RADIUS = 5.0
+FIELDPIC_NEAR_DUPLICATE_DISTANCE = 4
+# multipart 한 요청의 최대 파일 수 (Django 기본 100 → 비행 한 번 분량)
+DATA_UPLOAD_MAX_NUMBER_FILES = 1000
+
 
 # JWT token settings
 from datetime import timedelta
@@ -224,6 +260,46 @@ CORS_ORIGIN_WHITELIST = (
 OPENAI_API_KEY = env("OPENAI_API_KEY")
 # VWORLD_API 키
 VWORLD_API_KEY = os.getenv('VWORLD_API_KEY')
+# VWorld 호출 설정 (로컬 대체 서버: python manage.py fake_vworld)
+VWORLD_API_URL = env('VWORLD_API_URL', default='https://api.vworld.kr/ned/wfs/getPossessionWFS')
+VWORLD_TIMEOUT = env.float('VWORLD_TIMEOUT', default=5.0)
+# 필지 캐시: bbox 좌표를 소수점 N자리로 양자화해서 키로 사용 (4자리 ≒ 10m)
+VWORLD_BBOX_PRECISION = env.int('VWORLD_BBOX_PRECISION', default=4)
+VWORLD_CACHE_TTL = env.int('VWORLD_CACHE_TTL', default=60 * 60 * 24 * 7)
+VWORLD_CACHE_MAX_ENTRIES = env.int('VWORLD_CACHE_MAX_ENTRIES', default=50000)
+# 일괄 등록 시 VWorld 동시 호출 수 상한
+VWORLD_MAX_CONCURRENCY = env.int('VWORLD_MAX_CONCURRENCY', default=4)
+
+# 노지 공간 인덱스 격자 크기(도 단위, 0.01 ≒ 1km)
+FIELD_INDEX_CELL_SIZE = 0.01
+# 다른 프로세스의 노지 변경(캐시 version)을 확인하는 최소 간격(초)
+FIELD_INDEX_VERSION_CHECK_INTERVAL = 1.0
+# version별 변경된 노지 id를 캐시에 남겨두는 시간(초). 이보다 오래 뒤처진 프로세스는 전체 재적재
+FIELD_INDEX_CHANGES_TTL = 60 * 60
+# 한 번에 따라잡을 변경 노지 수 상한. 넘으면 증분 반영 대신 전체 재적재
+FIELD_INDEX_MAX_CHANGES = 1000
+
+# 노지 geometry 단순화 단계별 허용 오차(도 단위). ?lod=1 이 가장 정밀, 숫자가 클수록 거침 (0 = 원본)
+FIELD_LOD_TOLERANCES = [0.00001, 0.00005, 0.0002]
+# 노지 geometry/LOD 저장 형식 버전. updated_at을 바꾸지 않는 일괄 변환(migration backfill 등) 뒤에 올려서
+# GeoJSON 내보내기 ETag를 무효화 (0011 LOD backfill → 2)
+FIELD_GEOMETRY_SCHEMA_VERSION = 2
+
+# 노지 저장 시 주소가 없으면 이 반경(도 단위) 안의 다른 노지 주소로 추정, 이후 VWorld로 백그라운드 보정
+FIELD_ADDRESS_NEIGHBOR_RADIUS = 0.02
+FIELD_VWORLD_ENRICHMENT = env.bool('FIELD_VWORLD_ENRICHMENT', default=True)
+
+# /field/dashboard/ 사용자별 캐시 유지 시간(초, 0 = 캐시 사용 안 함), 최근 병해충 집계 기간(일)
+FIELD_DASHBOARD_CACHE_TIMEOUT = env.int('FIELD_DASHBOARD_CACHE_TIMEOUT', default=60)
+FIELD_DASHBOARD_DAMAGE_DAYS = 7
+
+# Redis 캐시 (장애 시 각 기능에서 DB로 fallback)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': env('REDIS_CACHE_URL', default='redis://localhost:6379/1'),
+    }
+}
 
 # Celery + Redis 설정
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
@@ -231,6 +307,30 @@ CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 
+# 병해충 분석 서버 전송: Redis 대기 목록에 모아 BATCH_SIZE 장이 차거나 가장 오래된 사진이 MAX_WAIT 초 기다리면 전송
+# (대기 목록은 Redis에만 있으므로 Redis AOF/RDB 지속성 설정 필요)
+FIELDPIC_ANALYZER_URL = env('FIELDPIC_ANALYZER_URL', default='http://172.26.21.246:5000/analyze')
+FIELDPIC_ANALYZER_CONNECT_TIMEOUT = 3
+FIELDPIC_ANALYZER_TIMEOUT = 60  # 응답 대기 (초)
+FIELDPIC_ANALYZER_RETRIES = env.int('FIELDPIC_ANALYZER_RETRIES', default=3)
+FIELDPIC_ANALYZER_BACKOFF = 0.5  # 재시도 대기 상한 = BACKOFF * 2^시도 (jitter)
+FIELDPIC_ANALYZER_MAX_CONCURRENCY = env.int('FIELDPIC_ANALYZER_MAX_CONCURRENCY', default=2)  # 프로세스당 동시 요청 수
+# 분석 서버 → /photo/analysis/results/ 콜백 인증 토큰 (비어 있으면 콜백 비활성), 요청당 최대 결과 수
+FIELDPIC_ANALYZER_CALLBACK_TOKEN = env('FIELDPIC_ANALYZER_CALLBACK_TOKEN', default='')
+FIELDPIC_ANALYSIS_RESULT_MAX = 10000
+FIELDPIC_ANALYSIS_REDIS_URL = env('FIELDPIC_ANALYSIS_REDIS_URL', default=CELERY_BROKER_URL)
+FIELDPIC_ANALYSIS_BATCH_SIZE = 10
+FIELDPIC_ANALYSIS_MAX_WAIT = 60
+FIELDPIC_ANALYSIS_LOCK_TIMEOUT = 300  # flush가 도중에 죽었을 때 lock 자동 해제 (초)
+
+# django_celery_beat DatabaseScheduler가 시작 시 DB에 등록
+CELERY_BEAT_SCHEDULE = {
+    'flush-pic-analysis-queue': {
+        'task': 'photoapp.tasks.flush_analysis_queue',
+        'schedule': FIELDPIC_ANALYSIS_MAX_WAIT / 2,
+    },
+}
+
 # ✅ 테스트용: 비동기 대신 즉시 실행하도록 Celery 설정 지원
 # CELERY_TASK_ALWAYS_EAGER = True
 # CELERY_TASK_EAGER_PROPAGATES = True
\ No newline at end of file
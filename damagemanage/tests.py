@@ -1,3 +1,44 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import User
+from fieldmanage.models import Field
+from photoapp.models import DiseaseResult, FieldPic, PestResult
+
+
+class DamageManagePaginationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@test.com', password='pw', username='owner')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        field = Field.objects.create(
+            field_name='노지', field_address='전라남도 목포시', field_area=100.0,
+            crop_name='배추', description='', owner=self.user,
+        )
+        pic = FieldPic.objects.create(field=field, pic_name='a.jpg')
+        for i in range(4):
+            PestResult.objects.create(field_pic=pic, pest_name=f'해충{i}')
+            DiseaseResult.objects.create(field_pic=pic, disease_name=f'병해{i}')
+
+    def test_merged_pages_cover_all_results_once(self):
+        seen, detected, cursor = [], [], None
+        while True:
+            params = {'page_size': 3, **({'cursor': cursor} if cursor else {})}
+            response = self.client.get('/damage/damagemanage/', params)
+            self.assertEqual(response.status_code, 200)
+            seen += [(item['type'], item['name']) for item in response.data['results']]
+            detected += [item['detected_at'] for item in response.data['results']]
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+
+        self.assertEqual(len(seen), 8)
+        self.assertEqual(len(set(seen)), 8)
+        # 최신 탐지순
+        self.assertEqual(detected, sorted(detected, reverse=True))
+
+    def test_unpaginated_response_is_unchanged(self):
+        response = self.client.get('/damage/damagemanage/')
+        self.assertEqual(len(response.data['results']), 8)
+        self.assertNotIn('next_cursor', response.data)
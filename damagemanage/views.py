@@ -1,11 +1,38 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from photoapp.media import media_url
 from photoapp.models import FieldPic, PestResult, DiseaseResult
 from fieldmanage.models import Field
+from config.pagination import KeysetPagination
 import base64
 import os
 
+def build_result(kind, result, viewer_id):
+    """pest / disease 결과 하나를 응답용 딕셔너리로 구성 (viewer_id = 이미지 URL을 받는 사용자)"""
+    pic = result.field_pic
+    field = pic.field
+
+    # 이미지 파일이 존재하는 경우 base64 인코딩
+    image_file = None
+    if pic.pic_path and os.path.exists(pic.file_path):
+        with open(pic.file_path, "rb") as img:
+            image_file = base64.b64encode(img.read()).decode("utf-8")
+
+    return {
+        "type": kind,  # 결과 유형
+        "name": result.pest_name if kind == "pest" else result.disease_name,  # 해충 / 병해 이름
+        "field_pic_id": pic.field_pic_id,  # 이미지 ID
+        "detected_at": result.detected_at,  # 탐지 일시
+        "image_file": image_file,  # 인코딩된 이미지 파일
+        "image_url": media_url(pic.field_pic_id, viewer_id) if pic.pic_path else None,  # 원본 파일 URL (base64 대신 사용 권장)
+        "field_id": field.field_id,  # 노지 ID
+        "field_name": field.field_name,  # 노지 이름
+        "description": field.description,  # 노지 설명
+        "geometry": field.geometry,  # GeoJSON 형태의 위치 정보
+    }
+
+
 class DamageManageView(APIView):
     permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 허용
 
@@ -23,57 +50,21 @@ class DamageManageView(APIView):
         # 필터링된 노지들에 속한 모든 FieldPic 조회
         field_pics = FieldPic.objects.filter(field__in=fields)
 
-        results = []  # 응답할 데이터 리스트 초기화
+        # 병해충 타입 구분 없이 pest_result / disease_result 전부 가져옴
+        querysets = {
+            "pest": PestResult.objects.filter(field_pic__in=field_pics).select_related('field_pic__field'),
+            "disease": DiseaseResult.objects.filter(field_pic__in=field_pics).select_related('field_pic__field'),
+        }
 
-        # 병해충 타입 구분 없이 pest_result 전부 가져옴
-        pest_qs = PestResult.objects.filter(field_pic__in=field_pics).select_related('field_pic__field')
-        for pest in pest_qs:
-            pic = pest.field_pic
-            field = pic.field
-
-            # 이미지 파일이 존재하는 경우 base64 인코딩
-            image_file = None
-            if pic.pic_path and os.path.exists(pic.pic_path):
-                with open(pic.pic_path, "rb") as img:
-                    image_file = base64.b64encode(img.read()).decode("utf-8")
-
-            # pest 결과 하나를 딕셔너리로 구성하여 results에 추가
-            results.append({
-                "type": "pest",  # 결과 유형
-                "name": pest.pest_name,  # 해충 이름
-                "field_pic_id": pic.field_pic_id,  # 이미지 ID
-                "detected_at": pest.detected_at,  # 탐지 일시
-                "image_file": image_file,  # 인코딩된 이미지 파일
-                "field_id": field.field_id,  # 노지 ID
-                "field_name": field.field_name,  # 노지 이름
-                "description": field.description,  # 노지 설명
-                "geometry": field.geometry,  # GeoJSON 형태의 위치 정보
-            })
-
-        # disease_result 전부 가져옴
-        disease_qs = DiseaseResult.objects.filter(field_pic__in=field_pics).select_related('field_pic__field')
-        for disease in disease_qs:
-            pic = disease.field_pic
-            field = pic.field
-
-            # 이미지 파일이 존재하는 경우 base64 인코딩
-            image_file = None
-            if pic.pic_path and os.path.exists(pic.pic_path):
-                with open(pic.pic_path, "rb") as img:
-                    image_file = base64.b64encode(img.read()).decode("utf-8")
-
-            # disease 결과 하나를 딕셔너리로 구성하여 results에 추가
-            results.append({
-                "type": "disease",  # 결과 유형
-                "name": disease.disease_name,  # 병해 이름
-                "field_pic_id": pic.field_pic_id,  # 이미지 ID
-                "detected_at": disease.detected_at,  # 탐지 일시
-                "image_file": image_file,  # 인코딩된 이미지 파일
-                "field_id": field.field_id,  # 노지 ID
-                "field_name": field.field_name,  # 노지 이름
-                "description": field.description,  # 노지 설명
-                "geometry": field.geometry,  # GeoJSON 형태의 위치 정보
-            })
+        # ?cursor / ?page_size가 있으면 두 결과를 최신 탐지순으로 병합해서 페이지 단위로 반환
+        paginator = KeysetPagination(descending=True)
+        if paginator.is_requested(request):
+            page = paginator.paginate_merged(querysets, request, sort_key=lambda r: (r.detected_at, r.pk))
+            return paginator.get_paginated_response([build_result(kind, r, user.pk) for kind, r in page])
+
+        results = []  # 응답할 데이터 리스트 초기화
+        for kind, queryset in querysets.items():
+            results.extend(build_result(kind, r, user.pk) for r in queryset)
 
         # pest + disease 결과 모두를 포함한 응답 반환
         return Response({"results": results})
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-18 08:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dronemanage', '0004_alter_drone_name'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='droneerrorlog',
+            options={'ordering': ['-timestamp', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='droneerrorlog',
+            index=models.Index(fields=['drone', 'timestamp', 'id'], name='drone_error_drone_i_03a16f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dronelog',
+            index=models.Index(fields=['drone', 'timestamp', 'log_id'], name='drone_log_drone_i_64934c_idx'),
+        ),
+    ]
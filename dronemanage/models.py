@@ -46,6 +46,10 @@ class DroneLog(models.Model):
 
     class Meta:
         db_table = 'drone_log'
+        indexes = [
+            # 드론별 최신순 조회/cursor 페이지네이션
+            models.Index(fields=['drone', 'timestamp', 'log_id']),
+        ]
 
     def __str__(self):
         return f"Log - Field {self.field_id}, Drone {self.drone_id} @ {self.timestamp}"
@@ -75,8 +79,11 @@ class DroneErrorLog(models.Model):
     message = models.CharField(max_length=255)
 
     class Meta:
-        ordering = ['-timestamp']
+        ordering = ['-timestamp', '-id']
         db_table = 'drone_error_log'
+        indexes = [
+            models.Index(fields=['drone', 'timestamp', 'id']),
+        ]
 
     def __str__(self):
         return f"Error for Drone {self.drone_id} at {self.timestamp}"
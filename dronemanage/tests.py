@@ -1,3 +1,69 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from .models import Drone, DroneErrorLog, DroneLog
+
+
+class DroneLogPaginationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='drone@test.com', password='pw', username='drone')
+        self.drone = Drone.objects.create(name='드론', owner=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def walk(self, url, page_size=2):
+        seen, cursor = [], None
+        for _ in range(20):
+            params = {'drone_id': self.drone.pk, 'page_size': page_size, **({'cursor': cursor} if cursor else {})}
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            seen += response.data['results']
+            cursor = response.data['next_cursor']
+            if cursor is None:
+                return seen
+        self.fail('cursor가 끝나지 않음')
+
+    def create_logs(self, count):
+        return [DroneLog.objects.create(drone=self.drone, longitude=126.0 + i, latitude=35.0) for i in range(count)]
+
+    def test_location_log_cursor_pagination(self):
+        self.create_logs(5)
+        url = '/drone/log/location/'
+        full = self.client.get(url, {'drone_id': self.drone.pk}).data
+
+        self.assertEqual(self.walk(url), full)
+        self.assertEqual(len({log['longitude'] for log in full}), 5)
+        self.assertEqual(self.client.get(url, {'drone_id': self.drone.pk, 'cursor': '!!'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'drone_id': self.drone.pk, 'cursor': 'MQ'}).status_code, 400)
+
+    def test_location_log_pages_follow_timestamp_not_log_id(self):
+        # 동시 저장 등으로 log_id 순서와 timestamp 순서가 어긋나고 timestamp가 같은 행도 있는 경우
+        logs = self.create_logs(5)
+        now = timezone.now()
+        offsets = [0, 3, 3, 1, 2]
+        for log, minutes in zip(logs, offsets):
+            DroneLog.objects.filter(pk=log.pk).update(timestamp=now - timedelta(minutes=minutes))
+        url = '/drone/log/location/'
+
+        # 최신순, timestamp가 같으면 log_id 역순
+        ordered = sorted(zip(offsets, logs), key=lambda item: (item[0], -item[1].pk))
+        expected = [{"longitude": log.longitude, "latitude": log.latitude} for _, log in ordered]
+        self.assertEqual(self.client.get(url, {'drone_id': self.drone.pk}).data, expected)
+        self.assertEqual(self.walk(url), expected)
+        self.assertEqual(self.walk(url, page_size=1), expected)
+
+    def test_error_log_cursor_pagination(self):
+        for i in range(5):
+            DroneErrorLog.objects.create(drone=self.drone, drone_time=timezone.now(), message=f'오류{i}')
+        url = '/drone/log/error-log/'
+        full = self.client.get(url, {'drone_id': self.drone.pk}).data
 
-# Create your tests here.
+        seen = self.walk(url)
+        self.assertEqual([log['id'] for log in seen], [log['id'] for log in full])
+        self.assertEqual(len({log['id'] for log in seen}), 5)
+        self.assertEqual(self.client.get(url, {'drone_id': self.drone.pk, 'cursor': '!!'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'drone_id': self.drone.pk, 'cursor': 'WyJ4IiwxXQ'}).status_code, 400)
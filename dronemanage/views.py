@@ -9,6 +9,8 @@ from django.db.models.functions import TruncDate
 from .models import DroneLog, DroneErrorLog
 from .serializers import DroneLogSerializer, DroneErrorLogSerializer, DroneSerializer
 from fieldmanage.models import Field
+from fieldmanage.spatial_index import fields_containing
+from config.pagination import KeysetPagination
 from datetime import datetime, timedelta
 from .models import Drone
 # import numpy as np
@@ -108,6 +110,17 @@ class UploadLogView(APIView):
         except (KeyError, ValueError):
             return Response({"error": "flight_time 필드 누락 또는 형식 오류 (ISO8601 형식 필요)"}, status=400)
 
+        # field_id 없이 올라온 로그는 좌표가 포함된 드론 소유자의 노지로 지정
+        if not data.get("field_id"):
+            try:
+                lat, lon = float(data["latitude"]), float(data["longitude"])
+                owner_id = Drone.objects.filter(pk=data.get("drone")).values_list("owner_id", flat=True).first()
+                matched = fields_containing(lat, lon, owner_id=owner_id) if owner_id else []
+                if matched:
+                    data["field_id"] = matched[0]
+            except (KeyError, TypeError, ValueError):
+                pass
+
         serializer = DroneLogSerializer(data=data)
         if serializer.is_valid():
             serializer.save()
@@ -125,7 +138,7 @@ class DroneLogBaseAPIView(APIView):
         return drone_id
 
     def get_queryset(self, drone_id):
-        return DroneLog.objects.filter(drone_id=drone_id).order_by('-timestamp')
+        return DroneLog.objects.filter(drone_id=drone_id).order_by('-timestamp', '-log_id')
 
 
 class GenericDroneLogView(DroneLogBaseAPIView):
@@ -192,6 +205,15 @@ class LocationLogView(DroneLogBaseAPIView):
         try:
             drone_id = self.get_drone_id(request)
             logs = self.get_queryset(drone_id)
+
+            # 전체 목록과 같은 최신순 cursor 페이지네이션 (timestamp가 같으면 log_id로 정리)
+            # 동시 저장 시 log_id 순서가 timestamp 순서와 어긋날 수 있으므로 log_id만으로 나누지 않음
+            paginator = KeysetPagination(key=('timestamp', 'log_id'), descending=True)
+            if paginator.is_requested(request):
+                page = paginator.paginate_queryset(logs.only('log_id', 'timestamp', 'longitude', 'latitude'), request)
+                data = [{"longitude": log.longitude, "latitude": log.latitude} for log in page]
+                return paginator.get_paginated_response(data)
+
             data = [{"longitude": log.longitude, "latitude": log.latitude} for log in logs]
             return Response(data, status=status.HTTP_200_OK)
         except ValidationError as e:
@@ -247,6 +269,13 @@ class DroneErrorLogView(APIView):
             return Response({"error": "drone_id는 필수입니다."}, status=400)
 
         logs = DroneErrorLog.objects.filter(drone_id=drone_id)
+
+        # 전체 목록(Meta.ordering = -timestamp)과 같은 순서로 페이지를 나눔
+        paginator = KeysetPagination(key=('timestamp', 'id'), descending=True)
+        if paginator.is_requested(request):
+            page = paginator.paginate_queryset(logs, request)
+            return paginator.get_paginated_response(DroneErrorLogSerializer(page, many=True).data)
+
         serializer = DroneErrorLogSerializer(logs, many=True)
         return Response(serializer.data)
 
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FieldmanageConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'fieldmanage'
+
+    def ready(self):
+        from . import gazetteer, signals  # noqa: F401  (행정구역 사전은 기동 시 한 번 적재)
@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from photoapp.derivatives import derivative_urls
+from photoapp.media import media_url
+from photoapp.models import DiseaseResult, PestResult
+from todolist.models import FieldTodo
+from weather.models import Weather
+from weather.utils import get_region_name_from_address
+from .models import Field
+
+CACHE_KEY_PREFIX = 'fieldmanage:dashboard:'
+
+
+def _counts_by_field(queryset, field_lookup):
+    return {
+        row[field_lookup]: row['count']
+        for row in queryset.values(field_lookup).annotate(count=Count('pk')).order_by()
+    }
+
+
+def build_dashboard(user):
+    """
+    사용자의 노지별 최신 사진 / 오늘 할 일 / 최근 병해충 / 오늘 날씨를 한 번에 집계
+    노지 수와 무관하게 쿼리 5회 (노지, 할 일, 해충, 병해, 날씨)
+    """
+    today = timezone.localdate()
+    damage_since = timezone.now() - timedelta(days=settings.FIELD_DASHBOARD_DAMAGE_DAYS)
+
+    fields = list(
+        Field.objects.filter(owner=user)
+        .only('field_id', 'field_name', 'field_address', 'crop_name')
+        .with_latest_pic()
+        .order_by('field_id')
+    )
+
+    # 오늘 시작하는 할 일 + 수행 기록(TaskProgress)에 오늘 날짜가 있는 기간 할 일
+    todo_counts = {
+        row['field_id']: row
+        for row in FieldTodo.objects.filter(owner=user)
+        .filter(Q(start_date__date=today) | Q(progresses__date=today))
+        .values('field_id')
+        .annotate(
+            total=Count('task_id', distinct=True),
+            done=Count('task_id', filter=Q(progresses__date=today, progresses__status='done'), distinct=True),
+        )
+        .order_by()
+    }
+
+    damage_filter = {'field_pic__field__owner': user, 'detected_at__gte': damage_since}
+    pest_counts = _counts_by_field(PestResult.objects.filter(**damage_filter), 'field_pic__field_id')
+    disease_counts = _counts_by_field(DiseaseResult.objects.filter(**damage_filter), 'field_pic__field_id')
+
+    region_names = {field.field_id: get_region_name_from_address(field.field_address) for field in fields}
+    forecasts = {
+        weather.region_name: weather
+        for weather in Weather.objects.filter(region_name__in=set(region_names.values()), date=today)
+    }
+
+    result = []
+    for field in fields:
+        todo = todo_counts.get(field.field_id, {})
+        forecast = forecasts.get(region_names[field.field_id])
+        result.append({
+            "field_id": field.field_id,
+            "field_name": field.field_name,
+            "field_address": field.field_address,
+            "crop_name": field.crop_name,
+            "image_url": media_url(field.latest_pic_id, user.pk) if field.latest_pic_id else None,
+            "thumbnails": derivative_urls(field.latest_pic_id, field.latest_pic_derivatives, user.pk),
+            "todos": {"total": todo.get('total', 0), "done": todo.get('done', 0)},
+            "damage": {
+                "pest": pest_counts.get(field.field_id, 0),
+                "disease": disease_counts.get(field.field_id, 0),
+            },
+            "weather": {
+                "weather": forecast.weather,
+                "temperature_avg": forecast.temperature_avg,
+                "precipitation": forecast.precipitation,
+            } if forecast else None,
+        })
+    return {"date": today.isoformat(), "fields": result}
+
+
+def get_dashboard(user, refresh=False):
+    """build_dashboard 결과를 FIELD_DASHBOARD_CACHE_TIMEOUT 초 동안 사용자별로 캐시 (Redis 장애 시 매번 집계)"""
+    timeout = settings.FIELD_DASHBOARD_CACHE_TIMEOUT
+    if not timeout:
+        return build_dashboard(user)
+
+    cache_key = f"{CACHE_KEY_PREFIX}{user.pk}"
+    if not refresh:
+        try:
+            data = cache.get(cache_key)
+        except Exception as e:
+            print(f"[경고] Redis 캐시 조회 실패 → 직접 집계: {e}")
+            data = None
+        if data is not None:
+            return data
+
+    data = build_dashboard(user)
+    try:
+        cache.set(cache_key, data, timeout=timeout)
+    except Exception as e:
+        print(f"[경고] Redis 캐시 저장 실패: {e}")
+    return data
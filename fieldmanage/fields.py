@@ -0,0 +1,136 @@
+import json
+from collections.abc import Mapping
+
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+from .geometry import decode_geometry, encode_geometry, encode_geometry_tiers, geometry_tier_offsets
+
+
+class LazyGeometryAttribute(DeferredAttribute):
+    """DB에서 읽은 bytes를 그대로 들고 있다가 처음 접근할 때 한 번만 GeoJSON dict로 디코딩"""
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if isinstance(value, (bytes, memoryview)):
+            value = instance.__dict__[self.field.attname] = decode_geometry(value)
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class GeometryField(models.BinaryField):
+    """
+    GeoJSON geometry를 WKB로 저장하는 필드 (형식은 geometry.encode_geometry 참고)
+    모델 속성으로 접근하면 dict, values()/values_list()로 읽으면 bytes이므로 decode_geometry로 변환해서 사용
+    """
+    descriptor_class = LazyGeometryAttribute
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('editable', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs.pop('editable', None)
+        return name, path, args, kwargs
+
+    def from_db_value(self, value, expression, connection):
+        # DB 드라이버에 따라 memoryview로 오는 경우 bytes로 복사
+        return bytes(value) if isinstance(value, memoryview) else value
+
+    def to_python(self, value):
+        if isinstance(value, str):
+            return json.loads(value)
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return decode_geometry(value)
+        return value
+
+    def pre_save(self, model_instance, add):
+        # 한 번도 접근하지 않은 값은 디코딩 없이 bytes 그대로 저장
+        if self.attname in model_instance.__dict__:
+            return model_instance.__dict__[self.attname]
+        return getattr(model_instance, self.attname)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is not None and not isinstance(value, (bytes, bytearray, memoryview)):
+            value = encode_geometry(value)
+        return super().get_db_prep_value(value, connection, prepared)
+
+    def value_to_string(self, obj):
+        return json.dumps(self.value_from_object(obj))
+
+
+class GeometryTiers(Mapping):
+    """
+    GeometryTiersField 값. DB bytes를 그대로 들고 있다가 요청한 단계만 디코딩
+    (응답에는 한 단계만 쓰이므로 노지를 읽을 때마다 모든 단계를 파싱하지 않음)
+    """
+
+    def __init__(self, data=b''):
+        self.data = bytes(data or b'')
+        self._offsets = None
+        self._decoded = {}
+
+    def _index(self):
+        if self._offsets is None:
+            self._offsets = geometry_tier_offsets(self.data)
+        return self._offsets
+
+    def __getitem__(self, level):
+        level = str(level)
+        if level not in self._decoded:
+            start, end = self._index()[level]
+            self._decoded[level] = decode_geometry(self.data[start:end])
+        return self._decoded[level]
+
+    def __iter__(self):
+        return iter(self._index())
+
+    def __len__(self):
+        return len(self._index())
+
+    def __repr__(self):
+        return f'GeometryTiers({sorted(self._index())})'
+
+
+class GeometryTiersField(models.BinaryField):
+    """
+    {"1": 단순화 geometry, ...}를 단계별 WKB로 묶어 저장하는 필드 (형식은 geometry.encode_geometry_tiers 참고)
+    모델 속성 / values()로 읽으면 GeometryTiers(읽기 전용 Mapping), 저장할 때는 dict도 받음
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('editable', True)
+        kwargs.setdefault('default', dict)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs.pop('editable', None)
+        if kwargs.get('default') is dict:
+            kwargs.pop('default')
+        return name, path, args, kwargs
+
+    def from_db_value(self, value, expression, connection):
+        return GeometryTiers(value)
+
+    def to_python(self, value):
+        if isinstance(value, str):
+            return json.loads(value)
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return GeometryTiers(value)
+        return value
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if isinstance(value, GeometryTiers):
+            value = value.data
+        elif isinstance(value, dict):
+            value = encode_geometry_tiers(value)
+        return super().get_db_prep_value(value, connection, prepared)
+
+    def value_to_string(self, obj):
+        return json.dumps(dict(self.value_from_object(obj)))
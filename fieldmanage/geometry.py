@@ -0,0 +1,336 @@
+# GeoJSON(Polygon / MultiPolygon) 계산 유틸. 좌표는 GeoJSON 순서대로 [lon, lat]
+import json
+import math
+import struct
+import sys
+from array import array
+from itertools import chain
+
+import numpy as np
+
+
+def iter_polygons(geometry):
+    """geometry 안의 polygon들을 ring 리스트 형태로 순회 (첫 ring = 외곽선, 나머지 = 구멍)"""
+    if not geometry or not isinstance(geometry, dict):
+        return
+    geom_type = geometry.get("type")
+    if geom_type == "Polygon":
+        yield geometry["coordinates"]
+    elif geom_type == "MultiPolygon":
+        for polygon in geometry["coordinates"]:
+            yield polygon
+    elif geom_type == "GeometryCollection":
+        for sub in geometry.get("geometries", []):
+            yield from iter_polygons(sub)
+
+
+def get_bbox(geometry):
+    """(min_lon, min_lat, max_lon, max_lat), polygon이 없으면 None"""
+    lons, lats = [], []
+    for polygon in iter_polygons(geometry):
+        for point in polygon[0]:
+            lons.append(point[0])
+            lats.append(point[1])
+    if not lons:
+        return None
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+def point_in_ring(lon, lat, ring):
+    # ray casting
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def point_in_polygon(lon, lat, polygon):
+    if not polygon or not point_in_ring(lon, lat, polygon[0]):
+        return False
+    return not any(point_in_ring(lon, lat, hole) for hole in polygon[1:])
+
+
+def contains_point(geometry, lon, lat):
+    return any(point_in_polygon(lon, lat, polygon) for polygon in iter_polygons(geometry))
+
+
+EARTH_RADIUS = 6378137.0  # WGS84 장반경(m)
+
+
+def ring_area(ring):
+    """구면 위 ring 면적(㎡, 부호 없음). Chamberlain & Duquette 근사 (turf/geojson-area 방식)"""
+    if len(ring) < 3:
+        return 0.0
+    total = 0.0
+    for i in range(len(ring)):
+        lon1, lat1 = ring[i - 1][0], ring[i - 1][1]
+        lon2, lat2 = ring[i][0], ring[i][1]
+        total += math.radians(lon2 - lon1) * (2 + math.sin(math.radians(lat1)) + math.sin(math.radians(lat2)))
+    return abs(total * EARTH_RADIUS * EARTH_RADIUS / 2.0)
+
+
+# 꼭짓점이 이보다 적으면 NumPy 배열 변환 비용이 계산보다 커서 순수 Python으로 계산
+VECTORIZE_MIN_VERTICES = 256
+
+
+def geodesic_area(geometry):
+    """polygon 면적 합(㎡), 구멍은 제외"""
+    polygons = [polygon for polygon in iter_polygons(geometry) if polygon]
+    if sum(len(ring) for polygon in polygons for ring in polygon) < VECTORIZE_MIN_VERTICES:
+        return sum(
+            (ring_area(polygon[0]) - sum(ring_area(hole) for hole in polygon[1:]) for polygon in polygons), 0.0
+        )
+    return _geodesic_area_vectorized(polygons)
+
+
+def _geodesic_area_vectorized(polygons):
+    # ring_area와 같은 식을 모든 ring의 꼭짓점을 이어 붙여 NumPy로 한 번에 계산
+    arrays, starts, signs = [], [], []
+    count = 0
+    for polygon in polygons:
+        for i, ring in enumerate(polygon):
+            if len(ring) < 3:
+                continue
+            # 좌표 차원(2 또는 3)이 ring 안에서는 같다고 보고 한 번에 변환
+            flat = np.fromiter(chain.from_iterable(ring), dtype=float)
+            arrays.append(flat.reshape(len(ring), -1)[:, :2])
+            starts.append(count)
+            signs.append(1.0 if i == 0 else -1.0)
+            count += len(ring)
+    if not arrays:
+        return 0.0
+
+    coords = np.radians(np.concatenate(arrays))
+    starts = np.asarray(starts)
+    ends = np.append(starts[1:], len(coords))
+    # 각 꼭짓점의 직전 꼭짓점 (ring 첫 점은 같은 ring의 마지막 점)
+    prev = np.arange(len(coords)) - 1
+    prev[starts] = ends - 1
+
+    lon, sin_lat = coords[:, 0], np.sin(coords[:, 1])
+    terms = (lon - lon[prev]) * (2 + sin_lat[prev] + sin_lat)
+    ring_areas = np.abs(np.add.reduceat(terms, starts)) * EARTH_RADIUS * EARTH_RADIUS / 2.0
+    return float(np.dot(ring_areas, signs))
+
+
+def _ring_centroid(ring):
+    # 평면 polygon 무게중심 (signed area, cx, cy). 필지 크기에서는 위경도 평면 근사로 충분
+    area = cx = cy = 0.0
+    for i in range(len(ring)):
+        x1, y1 = ring[i - 1][0], ring[i - 1][1]
+        x2, y2 = ring[i][0], ring[i][1]
+        cross = x1 * y2 - x2 * y1
+        area += cross
+        cx += (x1 + x2) * cross
+        cy += (y1 + y2) * cross
+    return area / 2.0, cx, cy
+
+
+def get_centroid(geometry):
+    """면적 가중 무게중심 (lon, lat), polygon이 없으면 None"""
+    total_area = total_cx = total_cy = 0.0
+    for polygon in iter_polygons(geometry):
+        for i, ring in enumerate(polygon):
+            area, cx, cy = _ring_centroid(ring)
+            # 외곽선과 구멍의 방향이 섞여 들어와도 구멍은 항상 빼도록 부호 보정
+            sign = 1 if (area >= 0) == (i == 0) else -1
+            total_area += abs(area) * (1 if i == 0 else -1)
+            total_cx += cx * sign
+            total_cy += cy * sign
+    if total_area == 0:
+        bbox = get_bbox(geometry)
+        if bbox is None:
+            return None
+        return (bbox[0] + bbox[2]) / 2.0, (bbox[1] + bbox[3]) / 2.0
+    return total_cx / (6.0 * total_area), total_cy / (6.0 * total_area)
+
+
+def count_vertices(geometry):
+    return sum(len(ring) for polygon in iter_polygons(geometry) for ring in polygon)
+
+
+def _perpendicular_distance(point, start, end):
+    (x, y), (x1, y1), (x2, y2) = point[:2], start[:2], end[:2]
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 0 and dy == 0:
+        return math.hypot(x - x1, y - y1)
+    return abs(dy * x - dx * y + x2 * y1 - y2 * x1) / math.hypot(dx, dy)
+
+
+def simplify_line(points, tolerance):
+    """Douglas-Peucker (재귀 대신 스택 사용). 시작점과 끝점은 항상 유지"""
+    if len(points) < 3:
+        return list(points)
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        max_distance, index = 0.0, None
+        for i in range(start + 1, end):
+            distance = _perpendicular_distance(points[i], points[start], points[end])
+            if distance > max_distance:
+                max_distance, index = distance, i
+        if index is not None and max_distance > tolerance:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def simplify_ring(ring, tolerance):
+    """닫힌 ring 단순화. 삼각형(4점) 미만으로 줄어들면 None"""
+    if len(ring) <= 4:
+        return ring
+    # 시작점 하나를 기준으로 자르면 그 근처가 과하게 남으므로, 시작점에서 가장 먼 꼭짓점으로 둘로 나눠 처리
+    far = max(range(len(ring)), key=lambda i: _perpendicular_distance(ring[i], ring[0], ring[0]))
+    simplified = simplify_line(ring[:far + 1], tolerance)[:-1] + simplify_line(ring[far:], tolerance)
+    return simplified if len(simplified) >= 4 else None
+
+
+def simplify_geometry(geometry, tolerance, precision=6):
+    """Polygon / MultiPolygon을 tolerance(도 단위)로 단순화하고 좌표를 precision 자리로 반올림"""
+    polygons = []
+    for polygon in iter_polygons(geometry):
+        rings = []
+        for i, ring in enumerate(polygon):
+            simplified = simplify_ring(ring, tolerance)
+            if simplified is None:
+                if i == 0:
+                    # 외곽선이 무너지면 원본 유지
+                    simplified = ring
+                else:
+                    continue
+            rings.append([[round(p[0], precision), round(p[1], precision)] for p in simplified])
+        polygons.append(rings)
+
+    if not polygons:
+        return geometry
+    if geometry.get("type") == "Polygon":
+        return {"type": "Polygon", "coordinates": polygons[0]}
+    return {"type": "MultiPolygon", "coordinates": polygons}
+
+
+# geometry 저장 형식: Polygon / MultiPolygon / GeometryCollection은 WKB(little endian, 2차원),
+# 그 외(3차원 좌표, 다른 type 등)는 JSON 텍스트 그대로 저장. 첫 바이트가 0/1(WKB 바이트 순서)이 아니면 JSON
+WKB_POLYGON = 3
+WKB_MULTIPOLYGON = 6
+WKB_GEOMETRYCOLLECTION = 7
+
+
+def _pack_rings(parts, rings):
+    parts.append(struct.pack('<I', len(rings)))
+    for ring in rings:
+        if any(len(point) != 2 for point in ring):
+            raise ValueError("2차원 좌표만 WKB로 저장")
+        coords = array('d', [value for point in ring for value in point])
+        if sys.byteorder == 'big':
+            coords.byteswap()
+        parts.append(struct.pack('<I', len(ring)))
+        parts.append(coords.tobytes())
+
+
+def _pack_wkb(parts, geometry):
+    geom_type = geometry.get("type")
+    if geom_type == "Polygon":
+        parts.append(struct.pack('<BI', 1, WKB_POLYGON))
+        _pack_rings(parts, geometry["coordinates"])
+    elif geom_type == "MultiPolygon":
+        parts.append(struct.pack('<BII', 1, WKB_MULTIPOLYGON, len(geometry["coordinates"])))
+        for polygon in geometry["coordinates"]:
+            parts.append(struct.pack('<BI', 1, WKB_POLYGON))
+            _pack_rings(parts, polygon)
+    elif geom_type == "GeometryCollection":
+        geometries = geometry.get("geometries", [])
+        parts.append(struct.pack('<BII', 1, WKB_GEOMETRYCOLLECTION, len(geometries)))
+        for sub in geometries:
+            _pack_wkb(parts, sub)
+    else:
+        raise ValueError(f"WKB로 저장하지 않는 type: {geom_type}")
+
+
+def encode_geometry(geometry):
+    """GeoJSON dict → bytes (None은 None)"""
+    if geometry is None:
+        return None
+    if isinstance(geometry, dict) and set(geometry) <= {"type", "coordinates", "geometries"}:
+        parts = []
+        try:
+            _pack_wkb(parts, geometry)
+            return b''.join(parts)
+        except (KeyError, TypeError, ValueError):
+            pass
+    return json.dumps(geometry, separators=(',', ':')).encode()
+
+
+def _unpack_wkb(data, offset):
+    order = '<' if data[offset] == 1 else '>'
+    geom_type, = struct.unpack_from(order + 'I', data, offset + 1)
+    offset += 5
+
+    if geom_type == WKB_POLYGON:
+        count, = struct.unpack_from(order + 'I', data, offset)
+        offset += 4
+        rings = []
+        for _ in range(count):
+            size, = struct.unpack_from(order + 'I', data, offset)
+            coords = struct.unpack_from(f'{order}{size * 2}d', data, offset + 4)
+            rings.append([[coords[i], coords[i + 1]] for i in range(0, size * 2, 2)])
+            offset += 4 + size * 16
+        return {"type": "Polygon", "coordinates": rings}, offset
+
+    count, = struct.unpack_from(order + 'I', data, offset)
+    offset += 4
+    children = []
+    for _ in range(count):
+        child, offset = _unpack_wkb(data, offset)
+        children.append(child)
+    if geom_type == WKB_MULTIPOLYGON:
+        return {"type": "MultiPolygon", "coordinates": [child["coordinates"] for child in children]}, offset
+    if geom_type == WKB_GEOMETRYCOLLECTION:
+        return {"type": "GeometryCollection", "geometries": children}, offset
+    raise ValueError(f"지원하지 않는 WKB type: {geom_type}")
+
+
+def decode_geometry(data):
+    """encode_geometry로 저장한 bytes → GeoJSON dict"""
+    if data is None:
+        return None
+    data = bytes(data)
+    if not data:
+        return None
+    if data[0] in (0, 1):
+        return _unpack_wkb(data, 0)[0]
+    return json.loads(data)
+
+
+# LOD 단계별 geometry 묶음: [단계 번호 1바이트 + 길이 4바이트 + encode_geometry] 반복
+TIER_HEADER = struct.Struct('<BI')
+
+
+def encode_geometry_tiers(tiers):
+    """{"1": geometry, ...} → bytes (비어 있으면 b'')"""
+    parts = []
+    for level, geometry in sorted(tiers.items(), key=lambda item: int(item[0])):
+        blob = encode_geometry(geometry) or b''
+        parts.append(TIER_HEADER.pack(int(level), len(blob)))
+        parts.append(blob)
+    return b''.join(parts)
+
+
+def geometry_tier_offsets(data):
+    """encode_geometry_tiers bytes → {"1": (시작, 끝), ...} (헤더만 읽고 geometry는 디코딩하지 않음)"""
+    offsets = {}
+    offset = 0
+    while offset < len(data):
+        level, size = TIER_HEADER.unpack_from(data, offset)
+        offset += TIER_HEADER.size
+        offsets[str(level)] = (offset, offset + size)
+        offset += size
+    return offsets
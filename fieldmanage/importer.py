@@ -0,0 +1,140 @@
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+
+from .gazetteer import address_for_code
+from .models import Field
+from .serializers import FieldSerializer
+from .spatial_index import on_fields_bulk_created
+from .tasks import enqueue_address_enrichment
+from .vworld import VWorldError, fetch_parcel, get_cached_parcel, normalize_bbox, point_bbox, store_parcel
+
+
+def _row_bbox(row):
+    if row.get('bbox'):
+        return normalize_bbox(row['bbox'])
+    if row.get('lat') is not None and row.get('lon') is not None:
+        return point_bbox(float(row['lat']), float(row['lon']))
+    return None
+
+
+def _fetch(bbox_key):
+    try:
+        return fetch_parcel(bbox_key), None
+    except VWorldError as e:
+        return None, f"VWorld API 호출 실패: {e}"
+
+
+def resolve_parcels(bbox_keys):
+    """
+    중복을 제거한 bbox들을 캐시에서 먼저 찾고, 나머지만 VWORLD_MAX_CONCURRENCY 개까지 동시에 VWorld 호출
+    반환값: {bbox_key: (parcel, error)}
+    워커 스레드는 HTTP 호출만 하고, 캐시 조회/저장(DB)은 호출한 스레드에서 처리
+    """
+    results = {}
+    missing = []
+    for bbox_key in dict.fromkeys(bbox_keys):
+        parcel = get_cached_parcel(bbox_key)
+        if parcel:
+            results[bbox_key] = (parcel, None)
+        else:
+            missing.append(bbox_key)
+
+    workers = max(1, min(settings.VWORLD_MAX_CONCURRENCY, len(missing)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        fetched = dict(zip(missing, executor.map(_fetch, missing)))
+
+    for bbox_key, (parcel, error) in fetched.items():
+        if parcel:
+            store_parcel(bbox_key, parcel)
+        results[bbox_key] = (parcel, error)
+    return results
+
+
+def _assign_created_ids(owner, fields, after_id):
+    """
+    MySQL은 bulk_create가 pk를 채우지 않으므로 삽입 전 마지막 ID 이후의 owner 노지를 다시 조회해
+    (이름, 무게중심, 주소)가 같은 행의 pk를 삽입 순서대로 지정
+    """
+    ids = defaultdict(deque)
+    rows = (
+        Field.objects.filter(owner=owner, pk__gt=after_id)
+        .order_by('pk')
+        .values_list('pk', 'field_name', 'centroid_lat', 'centroid_lon', 'field_address')
+    )
+    for pk, *key in rows:
+        ids[tuple(key)].append(pk)
+    for field in fields:
+        matched = ids[(field.field_name, field.centroid_lat, field.centroid_lon, field.field_address)]
+        field.field_id = matched.popleft() if matched else None
+
+
+def import_fields(owner, rows, skip_invalid=False):
+    """
+    노지 일괄 등록
+    각 행은 geometry를 직접 주거나, bbox 또는 lat/lon을 주면 VWorld(캐시)로 geometry/면적/주소를 채움
+    반환값: (생성된 Field 리스트, [{"row": i, "errors": ...}, ...])
+    skip_invalid=False면 오류가 하나라도 있을 때 아무것도 저장하지 않음
+    """
+    errors = []
+    bbox_by_row = {}
+    for i, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors.append({"row": i, "errors": {"non_field_errors": ["각 행은 객체여야 합니다."]}})
+            continue
+        if not row.get('geometry'):
+            try:
+                bbox_key = _row_bbox(row)
+            except (TypeError, ValueError):
+                errors.append({"row": i, "errors": {"bbox": ["bbox 또는 lat/lon 형식이 잘못되었습니다."]}})
+                continue
+            if bbox_key is None:
+                errors.append({"row": i, "errors": {"geometry": ["geometry, bbox, lat/lon 중 하나가 필요합니다."]}})
+                continue
+            bbox_by_row[i] = bbox_key
+
+    parcels = resolve_parcels(bbox_by_row.values())
+
+    fields = []
+    failed_rows = {error["row"] for error in errors}
+    for i, row in enumerate(rows):
+        if i in failed_rows:
+            continue
+        data = dict(row)
+        if i in bbox_by_row:
+            parcel, error = parcels[bbox_by_row[i]]
+            if error or not parcel:
+                errors.append({"row": i, "errors": {"bbox": [error or "해당 위치에 필지가 없습니다."]}})
+                continue
+            # 면적은 VWorld lndpcl_ar 대신 geometry로 직접 계산 (fill_missing_from_geometry)
+            data['geometry'] = parcel['geometry']
+            data.setdefault('field_address', address_for_code(parcel['ld_cpsg_code'], default=''))
+
+        serializer = FieldSerializer(data=data)
+        if not serializer.is_valid():
+            errors.append({"row": i, "errors": serializer.errors})
+            continue
+
+        field = Field(owner=owner, **serializer.validated_data)
+        # bulk_create는 save()를 거치지 않으므로 파생값을 직접 계산
+        field.update_geometry_derivatives()
+        field.fill_missing_from_geometry()
+        fields.append(field)
+
+    errors.sort(key=lambda error: error["row"])
+    if errors and not skip_invalid:
+        return [], errors
+
+    with transaction.atomic():
+        after_id = Field.objects.aggregate(last=Max('pk'))['last'] or 0
+        created = Field.objects.bulk_create(fields, batch_size=500)
+        if created and created[0].field_id is None:
+            _assign_created_ids(owner, created, after_id)
+        on_fields_bulk_created(created)
+        for field in created:
+            if field.address_is_estimated and field.field_id:
+                enqueue_address_enrichment(field)
+    return created, errors
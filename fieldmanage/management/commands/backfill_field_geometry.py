@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from fieldmanage.models import Field
+
+
+class Command(BaseCommand):
+    help = "기존 Field의 centroid/bbox/면적/꼭짓점 수/기상청 격자 값을 geometry에서 다시 계산"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--only-missing", action="store_true", help="centroid가 비어있는 노지만 계산")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Field.objects.order_by("field_id")
+        if options["only_missing"]:
+            queryset = queryset.filter(centroid_lat__isnull=True)
+
+        # geojson 내보내기 ETag가 바뀌도록 updated_at도 함께 갱신
+        update_fields = Field.GEOMETRY_DERIVED_FIELDS + ["updated_at"]
+        now = timezone.now()
+        batch = []
+        updated = 0
+        for field in queryset.iterator(chunk_size=batch_size):
+            field.update_geometry_derivatives()
+            field.updated_at = now
+            batch.append(field)
+            if len(batch) >= batch_size:
+                Field.objects.bulk_update(batch, update_fields)
+                updated += len(batch)
+                batch = []
+
+        if batch:
+            Field.objects.bulk_update(batch, update_fields)
+            updated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"{updated}개 노지 geometry 파생값 갱신 완료"))
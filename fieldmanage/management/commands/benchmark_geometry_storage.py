@@ -0,0 +1,102 @@
+import json
+import math
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import User
+from fieldmanage.fields import GeometryTiers
+from fieldmanage.geometry import decode_geometry, encode_geometry, encode_geometry_tiers
+from fieldmanage.models import Field
+
+
+def _polygon(index, vertices):
+    lon = 126.0 + (index % 100) * 0.01
+    lat = 34.0 + (index // 100) * 0.01
+    ring = [
+        [round(lon + 0.001 * math.cos(2 * math.pi * i / vertices), 7),
+         round(lat + 0.001 * math.sin(2 * math.pi * i / vertices), 7)]
+        for i in range(vertices)
+    ]
+    return {"type": "MultiPolygon", "coordinates": [[ring + [ring[0]]]]}
+
+
+def _measure(func):
+    """(소요 시간(초), 최대 메모리(bytes), 반환값). 시간은 tracemalloc 없이 따로 측정"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+class Command(BaseCommand):
+    help = (
+        "노지 geometry / LOD 단계 저장 방식 비교 (JSON 텍스트 vs WKB). "
+        "임시 노지를 만들어 측정한 뒤 트랜잭션을 롤백하므로 DB에는 남지 않음"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=10000)
+        parser.add_argument("--vertices", type=int, default=40, help="노지당 꼭짓점 수")
+
+    def handle(self, *args, **options):
+        count, vertices = options["count"], options["vertices"]
+        geometries = [_polygon(i, vertices) for i in range(count)]
+        json_texts = [json.dumps(geometry) for geometry in geometries]
+        wkb_blobs = [encode_geometry(geometry) for geometry in geometries]
+
+        rows = []
+        with transaction.atomic():
+            owner = User.objects.create_user(
+                email="geometry-benchmark@example.com", password=None, username="geometry-benchmark"
+            )
+            fields = [
+                Field(field_name=f"bench{i}", field_address="", field_area=0, crop_name="", description="",
+                      owner=owner, geometry=geometry)
+                for i, geometry in enumerate(geometries)
+            ]
+            # 실제 저장과 같이 LOD 단계까지 채움 (bulk_create는 save()를 거치지 않음)
+            for field in fields:
+                field.update_geometry_derivatives()
+            Field.objects.bulk_create(fields, batch_size=500)
+            queryset = Field.objects.filter(owner=owner)
+            lod_texts = [json.dumps(field.geometry_lod) for field in fields]
+            lod_blobs = [encode_geometry_tiers(field.geometry_lod) for field in fields]
+
+            rows.append(("JSON 파싱 (이전 jsonfield 방식)",) + _measure(
+                lambda: [json.loads(text) for text in json_texts]
+            )[:2])
+            rows.append(("WKB 디코딩",) + _measure(lambda: [decode_geometry(blob) for blob in wkb_blobs])[:2])
+            rows.append(("Field 로드 (geometry 미접근)",) + _measure(lambda: list(queryset.all()))[:2])
+            rows.append(("Field 로드 + geometry 접근",) + _measure(
+                lambda: [field.geometry for field in queryset.all()]
+            )[:2])
+            rows.append(("Field 로드 (defer geometry)",) + _measure(lambda: list(queryset.defer("geometry")))[:2])
+            rows.append(("LOD JSON 파싱 (이전 JSONField 방식)",) + _measure(
+                lambda: [json.loads(text) for text in lod_texts]
+            )[:2])
+            rows.append(("LOD 1단계만 디코딩 (WKB)",) + _measure(
+                lambda: [GeometryTiers(blob).get("1") for blob in lod_blobs]
+            )[:2])
+            rows.append(("Field 로드 + LOD 1단계 접근",) + _measure(
+                lambda: [field.geometry_lod.get("1") for field in queryset.defer("geometry")]
+            )[:2])
+
+            transaction.set_rollback(True)
+
+        json_size = sum(len(text.encode()) for text in json_texts)
+        wkb_size = sum(len(blob) for blob in wkb_blobs)
+        lod_json_size = sum(len(text.encode()) for text in lod_texts)
+        lod_wkb_size = sum(len(blob) for blob in lod_blobs)
+        self.stdout.write(f"노지 {count}개, 노지당 꼭짓점 {vertices + 1}개")
+        self.stdout.write(f"저장 크기: JSON {json_size / 1024:.0f} KiB / WKB {wkb_size / 1024:.0f} KiB")
+        self.stdout.write(f"LOD 단계 저장 크기: JSON {lod_json_size / 1024:.0f} KiB / WKB {lod_wkb_size / 1024:.0f} KiB")
+        for name, elapsed, peak in rows:
+            self.stdout.write(f"{name:<36} {elapsed * 1000:8.1f} ms  최대 메모리 {peak / 1024 / 1024:7.1f} MiB")
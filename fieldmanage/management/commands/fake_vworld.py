@@ -0,0 +1,72 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management.base import BaseCommand
+
+
+class FakeVWorldHandler(BaseHTTPRequestHandler):
+    """
+    VWorld getPossessionWFS 로컬 대체 서버
+    요청한 bbox 사각형을 그대로 필지 polygon으로 돌려줌 (오프라인 테스트/벤치마크용)
+    """
+    latency = 0.0
+    sigungu_code = "46110"
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        query = parse_qs(urlparse(self.path).query)
+        try:
+            minx, miny, maxx, maxy = [float(v) for v in query["bbox"][0].split(",")[:4]]
+        except (KeyError, ValueError):
+            self.send_error(400, "invalid bbox")
+            return
+
+        ring = [[minx, miny], [maxx, miny], [maxx, maxy], [minx, maxy], [minx, miny]]
+        body = {
+            "type": "FeatureCollection",
+            "features": [{
+                "type": "Feature",
+                "geometry": {"type": "MultiPolygon", "coordinates": [[ring]]},
+                "properties": {
+                    # 위도 35도 부근 기준 대략적인 면적(㎡)
+                    "lndpcl_ar": str(round((maxx - minx) * 91290 * (maxy - miny) * 110940, 1)),
+                    "ld_cpsg_code": self.sigungu_code,
+                },
+            }],
+        }
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = "VWorld 필지 API 로컬 대체 서버 실행 (VWORLD_API_URL=http://127.0.0.1:<port>/ 로 지정)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=8099)
+        parser.add_argument("--latency", type=float, default=0.0, help="응답 지연(초)")
+        parser.add_argument("--sigungu-code", default="46110")
+
+    def handle(self, *args, **options):
+        FakeVWorldHandler.latency = options["latency"]
+        FakeVWorldHandler.sigungu_code = options["sigungu_code"]
+        server = ThreadingHTTPServer(("127.0.0.1", options["port"]), FakeVWorldHandler)
+        self.stdout.write(f"fake VWorld listening on http://127.0.0.1:{options['port']}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,49 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from fieldmanage.importer import import_fields
+
+
+class Command(BaseCommand):
+    help = (
+        "JSON 파일([{field_name, crop_name, description, geometry | bbox | lat/lon}, ...])로 노지 일괄 등록. "
+        "로컬 벤치마크: python manage.py fake_vworld --latency 0.2 실행 후 --vworld-url http://127.0.0.1:8099/"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="노지 목록 JSON 파일 경로")
+        parser.add_argument("--owner", required=True, help="소유자 이메일")
+        parser.add_argument("--skip-invalid", action="store_true", help="오류 행은 건너뛰고 나머지만 등록")
+        parser.add_argument("--concurrency", type=int, help="VWorld 동시 호출 수 (기본: VWORLD_MAX_CONCURRENCY)")
+        parser.add_argument("--vworld-url", help="VWorld API 주소 (로컬 대체 서버 등)")
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(email=options["owner"])
+        except User.DoesNotExist:
+            raise CommandError(f"사용자를 찾을 수 없습니다: {options['owner']}")
+
+        with open(options["path"], encoding="utf-8") as f:
+            rows = json.load(f)
+        if not isinstance(rows, list):
+            raise CommandError("JSON 최상위는 리스트여야 합니다.")
+
+        if options["concurrency"]:
+            settings.VWORLD_MAX_CONCURRENCY = options["concurrency"]
+        if options["vworld_url"]:
+            settings.VWORLD_API_URL = options["vworld_url"]
+
+        started = time.perf_counter()
+        created, errors = import_fields(owner, rows, skip_invalid=options["skip_invalid"])
+        elapsed = time.perf_counter() - started
+
+        for error in errors:
+            self.stderr.write(f"[row {error['row']}] {json.dumps(error['errors'], ensure_ascii=False)}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(created)}/{len(rows)}개 등록, 오류 {len(errors)}건, {elapsed:.2f}초 "
+            f"(VWorld 동시 호출 {settings.VWORLD_MAX_CONCURRENCY})"
+        ))
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fieldmanage', '0004_monthlykeyword'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParcelCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bbox_key', models.CharField(max_length=200, unique=True)),
+                ('geometry', models.JSONField()),
+                ('lndpcl_ar', models.FloatField(null=True)),
+                ('ld_cpsg_code', models.CharField(blank=True, max_length=10)),
+                ('fetched_at', models.DateTimeField()),
+                ('last_accessed', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'vworld_parcel_cache',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fieldmanage', '0006_field_geometry_derivatives'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='field',
+            name='geometry_lod',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
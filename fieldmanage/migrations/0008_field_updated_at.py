@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fieldmanage', '0007_field_geometry_lod'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='field',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
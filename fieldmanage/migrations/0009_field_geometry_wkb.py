@@ -0,0 +1,64 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:12
+
+import fieldmanage.fields
+import jsonfield.fields
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def pack_geometry(apps, schema_editor):
+    Field = apps.get_model('fieldmanage', 'Field')
+    batch = []
+    for field in Field.objects.only('field_id', 'geometry').iterator(chunk_size=BATCH_SIZE):
+        field.geometry_packed = field.geometry or None
+        batch.append(field)
+        if len(batch) >= BATCH_SIZE:
+            Field.objects.bulk_update(batch, ['geometry_packed'])
+            batch = []
+    if batch:
+        Field.objects.bulk_update(batch, ['geometry_packed'])
+
+
+def unpack_geometry(apps, schema_editor):
+    Field = apps.get_model('fieldmanage', 'Field')
+    batch = []
+    for field in Field.objects.only('field_id', 'geometry_packed').iterator(chunk_size=BATCH_SIZE):
+        field.geometry = field.geometry_packed or {}
+        batch.append(field)
+        if len(batch) >= BATCH_SIZE:
+            Field.objects.bulk_update(batch, ['geometry'])
+            batch = []
+    if batch:
+        Field.objects.bulk_update(batch, ['geometry'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fieldmanage', '0008_field_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='field',
+            name='geometry_packed',
+            field=fieldmanage.fields.GeometryField(blank=True, null=True),
+        ),
+        # 되돌릴 때 새 컬럼을 먼저 만들고 값을 채울 수 있도록 기존 컬럼을 nullable로 변경
+        migrations.AlterField(
+            model_name='field',
+            name='geometry',
+            field=jsonfield.fields.JSONField(null=True),
+        ),
+        migrations.RunPython(pack_geometry, unpack_geometry),
+        migrations.RemoveField(
+            model_name='field',
+            name='geometry',
+        ),
+        migrations.RenameField(
+            model_name='field',
+            old_name='geometry_packed',
+            new_name='geometry',
+        ),
+    ]
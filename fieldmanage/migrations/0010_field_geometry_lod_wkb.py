@@ -0,0 +1,63 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:40
+
+import fieldmanage.fields
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def pack_tiers(apps, schema_editor):
+    Field = apps.get_model('fieldmanage', 'Field')
+    batch = []
+    for field in Field.objects.only('field_id', 'geometry_lod').iterator(chunk_size=BATCH_SIZE):
+        field.geometry_lod_packed = field.geometry_lod or {}
+        batch.append(field)
+        if len(batch) >= BATCH_SIZE:
+            Field.objects.bulk_update(batch, ['geometry_lod_packed'])
+            batch = []
+    if batch:
+        Field.objects.bulk_update(batch, ['geometry_lod_packed'])
+
+
+def unpack_tiers(apps, schema_editor):
+    Field = apps.get_model('fieldmanage', 'Field')
+    batch = []
+    for field in Field.objects.only('field_id', 'geometry_lod_packed').iterator(chunk_size=BATCH_SIZE):
+        field.geometry_lod = dict(field.geometry_lod_packed)
+        batch.append(field)
+        if len(batch) >= BATCH_SIZE:
+            Field.objects.bulk_update(batch, ['geometry_lod'])
+            batch = []
+    if batch:
+        Field.objects.bulk_update(batch, ['geometry_lod'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fieldmanage', '0009_field_geometry_wkb'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='field',
+            name='geometry_lod_packed',
+            field=fieldmanage.fields.GeometryTiersField(blank=True),
+        ),
+        # 되돌릴 때 새 컬럼을 먼저 만들고 값을 채울 수 있도록 기존 컬럼을 nullable로 변경
+        migrations.AlterField(
+            model_name='field',
+            name='geometry_lod',
+            field=models.JSONField(blank=True, default=dict, null=True),
+        ),
+        migrations.RunPython(pack_tiers, unpack_tiers),
+        migrations.RemoveField(
+            model_name='field',
+            name='geometry_lod',
+        ),
+        migrations.RenameField(
+            model_name='field',
+            old_name='geometry_lod_packed',
+            new_name='geometry_lod',
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:20
+
+from django.conf import settings
+from django.db import migrations
+
+from fieldmanage.geometry import simplify_geometry
+
+BATCH_SIZE = 500
+
+
+def backfill_tiers(apps, schema_editor):
+    # 0007 이전에 저장된 노지는 LOD 단계가 비어 있으므로 한 번 채움 (이후에는 save / 일괄 등록에서 계산)
+    Field = apps.get_model('fieldmanage', 'Field')
+    batch = []
+    queryset = Field.objects.filter(geometry__isnull=False).only('field_id', 'geometry', 'geometry_lod')
+    for field in queryset.iterator(chunk_size=BATCH_SIZE):
+        if len(field.geometry_lod) or not field.geometry:
+            continue
+        field.geometry_lod = {
+            str(level): simplify_geometry(field.geometry, tolerance)
+            for level, tolerance in enumerate(settings.FIELD_LOD_TOLERANCES, start=1)
+        }
+        batch.append(field)
+        if len(batch) >= BATCH_SIZE:
+            Field.objects.bulk_update(batch, ['geometry_lod'])
+            batch = []
+    if batch:
+        Field.objects.bulk_update(batch, ['geometry_lod'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fieldmanage', '0010_field_geometry_lod_wkb'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_tiers, migrations.RunPython.noop),
+    ]
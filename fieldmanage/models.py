@@ -1,22 +1,156 @@
+from django.conf import settings
 from django.db import models
-import jsonfield
+from django.db.models import OuterRef, Subquery
+
+from weather.utils import convert_to_grid
+from .fields import GeometryField, GeometryTiersField
+from .gazetteer import region_for_address
+from .geometry import count_vertices, geodesic_area, get_bbox, get_centroid, simplify_geometry
+
+
+class FieldQuerySet(models.QuerySet):
+    def with_latest_pic(self):
+        # 노지별 최신 사진 ID / 축소본을 서브쿼리로 붙임 (필드 수와 무관하게 쿼리 1회)
+        # (field, pic_time) 인덱스로 노지마다 사진 수와 무관하게 한 행만 읽음
+        from photoapp.models import FieldPic
+
+        latest_pic = FieldPic.objects.filter(field=OuterRef('pk')).order_by('-pic_time', '-field_pic_id')
+        return self.annotate(
+            latest_pic_id=Subquery(latest_pic.values('field_pic_id')[:1]),
+            latest_pic_derivatives=Subquery(latest_pic.values('derivatives')[:1], output_field=models.JSONField()),
+        )
+
+    def address_near(self, lat, lon, radius=None):
+        """
+        무게중심이 radius(도) 안에 있는 가장 가까운 노지의 시군구 주소, 없으면 None
+        (centroid 인덱스 범위 조회라 VWorld 없이 바로 응답)
+        """
+        radius = settings.FIELD_ADDRESS_NEIGHBOR_RADIUS if radius is None else radius
+        candidates = (
+            self.filter(
+                centroid_lat__range=(lat - radius, lat + radius),
+                centroid_lon__range=(lon - radius, lon + radius),
+            )
+            .exclude(field_address='')
+            .values_list('field_address', 'centroid_lat', 'centroid_lon')[:100]
+        )
+        for address, _, _ in sorted(candidates, key=lambda row: (row[1] - lat) ** 2 + (row[2] - lon) ** 2):
+            region = region_for_address(address)
+            if region:
+                return region.address
+        return None
+
 
 class Field(models.Model):
+    GEOMETRY_DERIVED_FIELDS = [
+        'centroid_lat', 'centroid_lon',
+        'bbox_min_lat', 'bbox_min_lon', 'bbox_max_lat', 'bbox_max_lon',
+        'geodesic_area', 'vertex_count', 'grid_nx', 'grid_ny', 'geometry_lod',
+    ]
+
     field_id = models.AutoField(primary_key=True)
     field_name = models.CharField(max_length=100)
     field_address = models.CharField(max_length=255)
     field_area = models.FloatField()
     crop_name = models.CharField(max_length=100)
     farm_startdate = models.DateField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     description = models.CharField(max_length=100)
     owner = models.ForeignKey("accounts.User", on_delete=models.CASCADE)
     # owner = models.ForeignKey("accounts.User", verbose_name=_(""), on_delete=models.CASCADE)
     
-    geometry = jsonfield.JSONField()  # GeoJSON 저장용
+    geometry = GeometryField(null=True, blank=True)  # GeoJSON을 WKB로 저장, 처음 접근할 때 디코딩
+
+    # geometry에서 미리 계산해두는 값 (save 시 갱신, 기존 데이터는 backfill_field_geometry)
+    centroid_lat = models.FloatField(null=True, blank=True)
+    centroid_lon = models.FloatField(null=True, blank=True)
+    bbox_min_lat = models.FloatField(null=True, blank=True)
+    bbox_min_lon = models.FloatField(null=True, blank=True)
+    bbox_max_lat = models.FloatField(null=True, blank=True)
+    bbox_max_lon = models.FloatField(null=True, blank=True)
+    geodesic_area = models.FloatField(null=True, blank=True)  # ㎡
+    vertex_count = models.PositiveIntegerField(default=0)
+    grid_nx = models.IntegerField(null=True, blank=True)  # 기상청 격자
+    grid_ny = models.IntegerField(null=True, blank=True)
+    # {"1": 단순화 geometry, ...}, 단계별 WKB로 저장하고 요청한 단계만 디코딩
+    geometry_lod = GeometryTiersField(blank=True)
+
+    objects = FieldQuerySet.as_manager()
+
+    # save 시 주소를 주변 노지로 추정했거나 비워둔 경우 True (DB 컬럼 아님)
+    address_is_estimated = False
 
     class Meta:
         db_table = "field_info"
-        
+        indexes = [
+            models.Index(fields=['centroid_lat', 'centroid_lon']),
+            models.Index(fields=['grid_nx', 'grid_ny']),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 공간 인덱스 반영 여부 판단용 (소유자만 바뀐 save도 인덱스에 반영해야 함)
+        instance._loaded_owner_id = instance.__dict__.get('owner_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.geometry_may_have_changed():
+            self.update_geometry_derivatives()
+        self.fill_missing_from_geometry()
+        super().save(*args, **kwargs)
+
+    def geometry_may_have_changed(self):
+        """
+        DB에서 읽은 뒤 geometry에 접근/대입하지 않았으면(아직 bytes이거나 defer) False
+        → 이름만 바꾸는 save에서 파생값/LOD 단계를 다시 계산하지 않음
+        """
+        if self._state.adding:
+            return True
+        value = self.__dict__.get('geometry', b'')
+        return not isinstance(value, (bytes, memoryview))
+
+    def spatial_index_may_have_changed(self):
+        # geometry나 소유자가 바뀌었을 수 있을 때만 True (이름/작물만 바꾸는 save는 인덱스와 무관)
+        if self.geometry_may_have_changed():
+            return True
+        return self.owner_id != getattr(self, '_loaded_owner_id', self.owner_id)
+
+    def fill_missing_from_geometry(self):
+        """
+        면적/주소가 비어 있으면 VWorld 호출 없이 geometry로 채움 (update_geometry_derivatives 이후 호출)
+        주소는 주변 노지 주소로 추정하고, 추정했거나 못 찾은 경우 address_is_estimated = True (VWorld 보정 대상)
+        """
+        if self.field_area is None:
+            self.field_area = round(self.geodesic_area or 0.0, 1)
+
+        self.address_is_estimated = not self.field_address
+        if self.address_is_estimated:
+            if self.centroid_lat is not None:
+                neighbors = Field.objects.exclude(pk=self.pk) if self.pk else Field.objects.all()
+                self.field_address = neighbors.address_near(self.centroid_lat, self.centroid_lon) or ''
+
+    def update_geometry_derivatives(self):
+        centroid = get_centroid(self.geometry)
+        bbox = get_bbox(self.geometry)
+        if centroid is None or bbox is None:
+            self.centroid_lon = self.centroid_lat = None
+            self.bbox_min_lon = self.bbox_min_lat = self.bbox_max_lon = self.bbox_max_lat = None
+            self.geodesic_area = self.grid_nx = self.grid_ny = None
+            self.vertex_count = 0
+            self.geometry_lod = {}
+            return
+
+        self.centroid_lon, self.centroid_lat = centroid
+        self.bbox_min_lon, self.bbox_min_lat, self.bbox_max_lon, self.bbox_max_lat = bbox
+        self.geodesic_area = geodesic_area(self.geometry)
+        self.vertex_count = count_vertices(self.geometry)
+        self.grid_nx, self.grid_ny = convert_to_grid(self.centroid_lat, self.centroid_lon)
+        self.geometry_lod = {
+            str(level): simplify_geometry(self.geometry, tolerance)
+            for level, tolerance in enumerate(settings.FIELD_LOD_TOLERANCES, start=1)
+        }
+
     def __str__(self):
         return self.field_name
 
@@ -33,3 +167,19 @@ class MonthlyKeyword(models.Model):
 
     def __str__(self):
         return f"{self.field_id.field_name} - {self.year}.{self.month}"
+
+
+class ParcelCache(models.Model):
+    # VWorld 필지 조회 결과 캐시 (Redis 장애 시 fallback, 오래 안 쓴 항목부터 삭제)
+    bbox_key = models.CharField(max_length=200, unique=True)
+    geometry = models.JSONField()
+    lndpcl_ar = models.FloatField(null=True)
+    ld_cpsg_code = models.CharField(max_length=10, blank=True)
+    fetched_at = models.DateTimeField()  # TTL 기준 시각
+    last_accessed = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        db_table = 'vworld_parcel_cache'
+
+    def __str__(self):
+        return self.bbox_key
@@ -1,24 +1,81 @@
 from rest_framework import serializers
+from photoapp.derivatives import derivative_urls
+from photoapp.media import media_url
 from photoapp.models import FieldPic
 from .models import Field
 from django.conf import settings
 import os
 
+class LodGeometryField(serializers.JSONField):
+    # context에 lod가 있으면 미리 단순화해 둔 geometry를 응답
+    # 없는 단계면 원본 (field_queryset_for_lod가 같은 쿼리로 읽어둔 bytes를 이때만 디코딩)
+    def get_attribute(self, instance):
+        lod = self.context.get('lod')
+        if lod:
+            simplified = (instance.geometry_lod or {}).get(str(lod))
+            if simplified:
+                return simplified
+        return super().get_attribute(instance)
+
+
 class FieldSerializer(serializers.ModelSerializer):
-    geometry = serializers.JSONField()
+    geometry = LodGeometryField()
     owner = serializers.PrimaryKeyRelatedField(read_only=True)
     image_url = serializers.SerializerMethodField()  
+    thumbnails = serializers.SerializerMethodField()
 
     
     class Meta:
         model = Field
-        fields = '__all__'
+        exclude = ['geometry_lod']
+        read_only_fields = [name for name in Field.GEOMETRY_DERIVED_FIELDS if name != 'geometry_lod']
+        # 비워두면 저장 시 geometry로 계산 (Field.fill_missing_from_geometry)
+        extra_kwargs = {
+            'field_area': {'required': False},
+            'field_address': {'required': False, 'allow_blank': True},
+        }
+
+    def _latest_pic(self, obj):
+        # with_latest_pic()로 조회된 경우 주석값 사용, 아니면 (생성/수정 응답) 단건 조회 → (ID, 축소본)
+        if hasattr(obj, 'latest_pic_id'):
+            return obj.latest_pic_id, obj.latest_pic_derivatives
+        latest = (
+            FieldPic.objects.filter(field=obj)
+            .order_by('-pic_time', '-field_pic_id')
+            .values_list('field_pic_id', 'derivatives')
+            .first()
+        )
+        return latest or (None, None)
+
+    def _viewer_id(self, obj):
+        # 사진 URL 서명에 넣을 사용자 (context에 request가 없으면 노지 주인 = 노지 API는 본인 노지만 응답)
+        request = self.context.get('request')
+        return request.user.pk if request else obj.owner_id
 
     def get_image_url(self, obj):
-        latest_pic = FieldPic.objects.filter(field=obj).order_by('-pic_time').first()
-        if latest_pic:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri('/media/' + latest_pic.pic_path)
-            return '/media/' + latest_pic.pic_path
+        field_pic_id, _ = self._latest_pic(obj)
+        if field_pic_id:
+            return media_url(field_pic_id, self._viewer_id(obj), request=self.context.get('request'))
         return None
+
+    def get_thumbnails(self, obj):
+        # 목록 화면용 최신 사진 축소본 URL ({"thumb": {"webp", "jpeg"}, "preview": {...}}), 아직 없으면 None
+        field_pic_id, derivatives = self._latest_pic(obj)
+        return derivative_urls(field_pic_id, derivatives, self._viewer_id(obj), self.context.get('request'))
+
+def parse_lod(value):
+    """?lod= 값 검증. 없거나 0이면 원본(None), 범위를 벗어나면 ValueError"""
+    if value in (None, ''):
+        return None
+    try:
+        lod = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("lod는 정수여야 합니다.")
+    if not 0 <= lod <= len(settings.FIELD_LOD_TOLERANCES):
+        raise ValueError(f"lod는 0~{len(settings.FIELD_LOD_TOLERANCES)} 사이여야 합니다.")
+    return lod or None
+
+
+def field_queryset_for_lod(queryset, lod):
+    # lod 응답도 단계가 없는 노지는 원본으로 대신하므로 geometry를 함께 읽음 (bytes로 들고 있다가 필요할 때만 디코딩)
+    return queryset if lod else queryset.defer('geometry_lod')
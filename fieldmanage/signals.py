@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Field
+from .spatial_index import on_field_deleted, on_field_saved
+from .tasks import enqueue_address_enrichment
+
+
+@receiver(post_save, sender=Field)
+def update_field_index(sender, instance, **kwargs):
+    on_field_saved(instance)
+
+
+@receiver(post_save, sender=Field)
+def enrich_estimated_address(sender, instance, **kwargs):
+    if instance.address_is_estimated:
+        enqueue_address_enrichment(instance)
+
+
+@receiver(post_delete, sender=Field)
+def remove_from_field_index(sender, instance, **kwargs):
+    on_field_deleted(instance)
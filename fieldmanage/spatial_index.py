@@ -0,0 +1,274 @@
+import math
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .geometry import decode_geometry, get_bbox, iter_polygons, point_in_polygon
+
+VERSION_CACHE_KEY = 'fieldmanage:spatial_index:version'
+# version별 변경된 노지 id 목록
+CHANGES_CACHE_KEY = 'fieldmanage:spatial_index:changes:{}'
+
+
+class FieldSpatialIndex:
+    """
+    Field polygon용 균일 격자(uniform grid) 인덱스
+    bbox가 걸치는 격자 셀에 field_id를 등록해두고, 좌표 조회 시 해당 셀 후보만 정확한 polygon 판정
+    """
+
+    def __init__(self, cell_size=0.01):
+        self.cell_size = cell_size  # 도(degree) 단위, 0.01 ≒ 1km
+        self._cells = defaultdict(set)
+        self._entries = {}  # field_id -> (owner_id, bbox, polygons, cells)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _cell(self, lon, lat):
+        return math.floor(lon / self.cell_size), math.floor(lat / self.cell_size)
+
+    def add(self, field_id, geometry, owner_id=None):
+        with self._lock:
+            self.remove(field_id)
+            bbox = get_bbox(geometry)
+            if bbox is None:
+                return
+
+            min_x, min_y = self._cell(bbox[0], bbox[1])
+            max_x, max_y = self._cell(bbox[2], bbox[3])
+            cells = [(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+            # ring 좌표를 tuple로 고정해두고 조회 시 재사용
+            polygons = [
+                [tuple((point[0], point[1]) for point in ring) for ring in polygon]
+                for polygon in iter_polygons(geometry)
+            ]
+            for cell in cells:
+                self._cells[cell].add(field_id)
+            self._entries[field_id] = (owner_id, bbox, polygons, cells)
+
+    def remove(self, field_id):
+        with self._lock:
+            entry = self._entries.pop(field_id, None)
+            if not entry:
+                return
+            for cell in entry[3]:
+                bucket = self._cells.get(cell)
+                if bucket:
+                    bucket.discard(field_id)
+                    if not bucket:
+                        del self._cells[cell]
+
+    def clear(self):
+        with self._lock:
+            self._cells.clear()
+            self._entries.clear()
+
+    def _match(self, field_id, lon, lat, owner_id):
+        entry_owner, bbox, polygons, _ = self._entries[field_id]
+        if owner_id is not None and entry_owner != owner_id:
+            return False
+        if not (bbox[0] <= lon <= bbox[2] and bbox[1] <= lat <= bbox[3]):
+            return False
+        return any(point_in_polygon(lon, lat, polygon) for polygon in polygons)
+
+    def fields_containing(self, lat, lon, owner_id=None):
+        """좌표를 포함하는 field_id 목록 (owner_id 지정 시 해당 사용자 노지만)"""
+        with self._lock:
+            candidates = self._cells.get(self._cell(lon, lat), ())
+            return sorted(fid for fid in candidates if self._match(fid, lon, lat, owner_id))
+
+    def assign_points(self, points, owner_id=None):
+        """
+        [(lat, lon), ...] 각 좌표가 속한 field_id 리스트 (없으면 None)
+        같은 셀에 떨어지는 점들은 후보 목록을 한 번만 정렬해서 재사용
+        """
+        result = []
+        candidates_by_cell = {}
+        with self._lock:
+            for lat, lon in points:
+                if lat is None or lon is None:
+                    result.append(None)
+                    continue
+                cell = self._cell(lon, lat)
+                if cell not in candidates_by_cell:
+                    candidates_by_cell[cell] = sorted(self._cells.get(cell, ()))
+                result.append(next(
+                    (fid for fid in candidates_by_cell[cell] if self._match(fid, lon, lat, owner_id)),
+                    None
+                ))
+        return result
+
+
+class _IndexHolder:
+    """
+    프로세스 단위 싱글톤. 처음 조회할 때 DB에서 한 번 적재하고 이후에는 signal로 증분 갱신
+    다른 워커 프로세스의 변경은 캐시의 version이 바뀌면 version별로 남긴 변경 노지 id만 다시 읽어 반영
+    (변경 기록이 만료됐거나 너무 많이 뒤처졌으면 전체 재적재)
+    version은 FIELD_INDEX_VERSION_CHECK_INTERVAL 초에 한 번만 확인 (조회마다 캐시를 왕복하지 않음)
+    """
+
+    def __init__(self):
+        self.index = None
+        self.version = None
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _shared_version(self):
+        try:
+            return cache.get(VERSION_CACHE_KEY)
+        except Exception:
+            return self.version
+
+    def get(self):
+        now = time.monotonic()
+        index = self.index
+        if index is not None and now - self.checked_at < settings.FIELD_INDEX_VERSION_CHECK_INTERVAL:
+            return index
+        shared_version = self._shared_version()
+        with self._lock:
+            if self.index is None:
+                self.index = build_index()
+            elif shared_version != self.version:
+                changed_ids = _changed_ids(self.version, shared_version)
+                if changed_ids is None:
+                    self.index = build_index()
+                else:
+                    _reload_fields(self.index, changed_ids)
+            self.version = shared_version
+            self.checked_at = now
+            return self.index
+
+    def bump_version(self, field_ids):
+        try:
+            try:
+                version = cache.incr(VERSION_CACHE_KEY)
+            except ValueError:
+                cache.set(VERSION_CACHE_KEY, 1, timeout=None)
+                version = 1
+            if field_ids is not None:
+                cache.set(CHANGES_CACHE_KEY.format(version), sorted(field_ids), timeout=settings.FIELD_INDEX_CHANGES_TTL)
+        except Exception:
+            return
+        with self._lock:
+            if version == (self.version or 0) + 1:
+                # 이 프로세스는 signal로 이미 증분 갱신했으므로 다시 읽지 않음
+                self.version = version
+            else:
+                # 그 사이 다른 프로세스의 변경이 있었음 → 다음 조회 때 바로 따라잡기
+                # (자기 변경분도 다시 읽게 되지만 DB 값으로 덮어쓰는 것이라 결과는 같음)
+                self.checked_at = 0.0
+
+
+def _changed_ids(local_version, shared_version):
+    """
+    local_version 이후 shared_version까지 바뀐 노지 id 집합
+    중간 기록이 하나라도 없거나 상한을 넘으면 None (전체 재적재)
+    """
+    if local_version is None or shared_version is None or shared_version < local_version:
+        return None
+    if shared_version - local_version > settings.FIELD_INDEX_MAX_CHANGES:
+        return None
+    keys = [CHANGES_CACHE_KEY.format(version) for version in range(local_version + 1, shared_version + 1)]
+    try:
+        changes = cache.get_many(keys)
+    except Exception:
+        return None
+    if len(changes) != len(keys):
+        return None
+    changed_ids = set()
+    for ids in changes.values():
+        changed_ids.update(ids)
+    if len(changed_ids) > settings.FIELD_INDEX_MAX_CHANGES:
+        return None
+    return changed_ids
+
+
+def _reload_fields(index, field_ids):
+    # 바뀐 노지만 DB에서 다시 읽음 (삭제된 노지는 조회되지 않으므로 제거된 상태로 남음)
+    from .models import Field
+
+    for field_id in field_ids:
+        index.remove(field_id)
+    rows = Field.objects.filter(pk__in=field_ids).values_list('field_id', 'owner_id', 'geometry')
+    for field_id, owner_id, geometry in rows:
+        index.add(field_id, decode_geometry(geometry), owner_id)
+
+
+_holder = _IndexHolder()
+
+
+def build_index():
+    from .models import Field
+
+    index = FieldSpatialIndex(cell_size=settings.FIELD_INDEX_CELL_SIZE)
+    for field_id, owner_id, geometry in Field.objects.values_list('field_id', 'owner_id', 'geometry').iterator():
+        index.add(field_id, decode_geometry(geometry), owner_id)
+    return index
+
+
+def get_field_index():
+    return _holder.get()
+
+
+def reset_field_index():
+    # 다음 조회 때 DB에서 다시 적재
+    _holder.index = None
+
+
+def fields_containing(lat, lon, owner_id=None):
+    return get_field_index().fields_containing(lat, lon, owner_id)
+
+
+def assign_points(points, owner_id=None):
+    return get_field_index().assign_points(points, owner_id)
+
+
+# 인덱스 갱신과 version 증가는 커밋 후에 (롤백된 변경이 다른 프로세스에 퍼지거나, 재적재가 커밋 전 DB를 읽지 않도록)
+def on_field_saved(field):
+    # 이름/작물만 바꾸는 save는 geometry를 디코딩하지도, version을 올리지도 않음
+    if not field.spatial_index_may_have_changed():
+        return
+    field_id, geometry, owner_id = field.field_id, field.geometry, field.owner_id
+    field._loaded_owner_id = owner_id
+
+    def apply():
+        if _holder.index is not None:
+            _holder.index.add(field_id, geometry, owner_id)
+        _holder.bump_version([field_id])
+
+    transaction.on_commit(apply)
+
+
+def on_field_deleted(field):
+    field_id = field.field_id
+
+    def apply():
+        if _holder.index is not None:
+            _holder.index.remove(field_id)
+        _holder.bump_version([field_id])
+
+    transaction.on_commit(apply)
+
+
+def on_fields_bulk_created(fields):
+    # bulk_create는 post_save signal을 보내지 않으므로 직접 반영
+    rows = [(field.field_id, field.geometry, field.owner_id) for field in fields]
+
+    def apply():
+        if _holder.index is not None:
+            if all(field_id for field_id, _, _ in rows):
+                for row in rows:
+                    _holder.index.add(*row)
+            else:
+                # pk를 돌려받지 못한 행이 있으면 다음 조회 때 재적재
+                _holder.index = None
+        field_ids = [field_id for field_id, _, _ in rows]
+        # pk를 모르는 행이 있으면 변경 기록을 남기지 않음 → 다른 프로세스도 전체 재적재
+        _holder.bump_version(field_ids if all(field_ids) else None)
+
+    transaction.on_commit(apply)
@@ -0,0 +1,45 @@
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .gazetteer import address_for_code
+from .models import Field
+from .vworld import VWorldError, get_parcel, point_bbox
+
+
+@shared_task
+def enrich_field_address(field_id, estimated_address=''):
+    """
+    save 시 추정했거나 비워둔 노지 주소를 VWorld 필지 정보(무게중심 기준)로 보정
+    그 사이 사용자가 주소를 바꿨으면(estimated_address와 다르면) 덮어쓰지 않음
+    """
+    field = Field.objects.filter(pk=field_id).values('centroid_lat', 'centroid_lon').first()
+    if not field or field['centroid_lat'] is None:
+        return
+
+    try:
+        parcel = get_parcel(point_bbox(field['centroid_lat'], field['centroid_lon']))
+    except VWorldError as e:
+        print(f"[경고] 노지 {field_id} 주소 보정 실패: {e}")
+        return
+
+    address = address_for_code(parcel['ld_cpsg_code'], default='') if parcel else ''
+    if address and address != estimated_address:
+        Field.objects.filter(pk=field_id, field_address=estimated_address).update(
+            field_address=address, updated_at=timezone.now()
+        )
+
+
+def enqueue_address_enrichment(field):
+    """커밋 후 주소 보정 작업 등록 (FIELD_VWORLD_ENRICHMENT = False 이거나 broker 장애 시 건너뜀)"""
+    if not settings.FIELD_VWORLD_ENRICHMENT:
+        return
+
+    def enqueue():
+        try:
+            enrich_field_address.delay(field.field_id, field.field_address)
+        except Exception as e:
+            print(f"[경고] 노지 {field.field_id} 주소 보정 작업 등록 실패: {e}")
+
+    transaction.on_commit(enqueue)
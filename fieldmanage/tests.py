@@ -1,3 +1,708 @@
-from django.test import TestCase
+import json
+import math
+import threading
+from http.server import ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from weather.utils import convert_to_grid
+from photoapp.models import FieldPic, PestResult
+from todolist.models import FieldTodo, TaskProgress
+from weather.models import Weather
+from .geometry import (
+    VECTORIZE_MIN_VERTICES, count_vertices, decode_geometry, encode_geometry, geodesic_area, ring_area,
+)
+from .gazetteer import (
+    address_for_code, forecast_grid, grid_for_field, mid_term_codes, region_for_address, representative_point,
+)
+from .importer import import_fields
+from .management.commands.fake_vworld import FakeVWorldHandler
+from .models import Field, ParcelCache
+from .tasks import enrich_field_address
+from .spatial_index import (
+    CHANGES_CACHE_KEY, VERSION_CACHE_KEY, FieldSpatialIndex, _IndexHolder, assign_points, fields_containing,
+    reset_field_index,
+)
+from .views import FieldGeoJSONExportAPIView
+from .vworld import normalize_bbox, point_bbox
+
+GEOMETRY = {
+    "type": "Polygon",
+    "coordinates": [[[126.39, 34.81], [126.40, 34.81], [126.40, 34.82], [126.39, 34.82], [126.39, 34.81]]],
+}
+
+
+class FieldListQueryCountTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@test.com', password='pw', username='owner')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_fields(self, count):
+        for i in range(count):
+            field = Field.objects.create(
+                field_name=f'노지{i}', field_address='전라남도 목포시', field_area=100.0,
+                crop_name='배추', description='', owner=self.user, geometry=GEOMETRY,
+            )
+            for minutes in (10, 5):
+                FieldPic.objects.create(
+                    field=field, pic_name=f'{i}_{minutes}.jpg', pic_path=f'pics/{i}_{minutes}.jpg',
+                    pic_time=timezone.now() - timezone.timedelta(minutes=minutes),
+                )
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/field/fields/')
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_query_count_does_not_grow_with_fields(self):
+        self.create_fields(2)
+        small_count, _ = self.count_list_queries()
+
+        self.create_fields(20)
+        large_count, data = self.count_list_queries()
+
+        self.assertEqual(len(data), 22)
+        self.assertEqual(small_count, large_count)
+
+    def test_image_url_is_latest_pic(self):
+        self.create_fields(1)
+        _, data = self.count_list_queries()
+        latest = FieldPic.objects.get(pic_name='0_5.jpg')
+        self.assertIn(f'/photo/media/{latest.pk}/original/?sig=', data[0]['image_url'])
+
+    def test_detail_uses_latest_pic(self):
+        self.create_fields(1)
+        field = Field.objects.get()
+        response = self.client.get(f'/field/fields/{field.pk}/')
+        self.assertEqual(response.status_code, 200)
+        latest = FieldPic.objects.get(pic_name='0_5.jpg')
+        self.assertIn(f'/photo/media/{latest.pk}/original/?sig=', response.data['image_url'])
+
+    def test_cursor_pagination(self):
+        self.create_fields(5)
+        seen, cursor = [], None
+        for _ in range(3):
+            params = {'page_size': 2, **({'cursor': cursor} if cursor else {})}
+            response = self.client.get('/field/fields/', params)
+            self.assertEqual(response.status_code, 200)
+            seen += [field['field_id'] for field in response.data['results']]
+            cursor = response.data['next_cursor']
+
+        self.assertIsNone(cursor)
+        self.assertEqual(seen, list(Field.objects.order_by('pk').values_list('pk', flat=True)))
+        self.assertEqual(self.client.get('/field/fields/', {'cursor': '!!'}).status_code, 400)
+
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class GetGeometryCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeVWorldHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.vworld_url = f'http://127.0.0.1:{cls.server.server_address[1]}/'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        FakeVWorldHandler.hits = 0
+        self.client = APIClient()
+
+    def post_bbox(self, bbox):
+        with self.settings(VWORLD_API_URL=self.vworld_url):
+            return self.client.post('/field/get-geometry/', {'bbox': bbox}, format='json')
+
+    def test_point_bbox_is_not_degenerate(self):
+        self.assertEqual(point_bbox(34.8123, 126.3951), '126.3950,34.8122,126.3952,34.8124')
+        minx, miny, maxx, maxy = map(float, point_bbox(34.81234, 126.39517).split(','))
+        self.assertTrue(minx < 126.39517 < maxx and miny < 34.81234 < maxy)
+
+    def test_normalize_bbox_quantizes_coordinates(self):
+        self.assertEqual(
+            normalize_bbox('126.391234,34.812341,126.391299,34.812399,EPSG:4326'),
+            '126.3912,34.8123,126.3913,34.8124,EPSG:4326',
+        )
+
+    def test_repeat_click_is_served_from_cache(self):
+        first = self.post_bbox('126.391234,34.812341,126.391299,34.812399')
+        second = self.post_bbox('126.391241,34.812338,126.391302,34.812401')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data['field_address'], '전라남도 목포시')
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(FakeVWorldHandler.hits, 1)
+
+    def test_db_fallback_when_redis_is_empty(self):
+        self.post_bbox('126.40,34.80,126.41,34.81')
+        cache.clear()
+        response = self.post_bbox('126.40,34.80,126.41,34.81')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(FakeVWorldHandler.hits, 1)
+
+    def test_lru_eviction(self):
+        with self.settings(VWORLD_CACHE_MAX_ENTRIES=2):
+            for i in range(3):
+                self.post_bbox(f'126.4{i},34.80,126.4{i}5,34.81')
+
+        self.assertEqual(ParcelCache.objects.count(), 2)
+        self.assertFalse(ParcelCache.objects.filter(bbox_key__startswith='126.4000').exists())
+
+
+def square(lon, lat, size=0.001):
+    return {
+        "type": "Polygon",
+        "coordinates": [[[lon, lat], [lon + size, lat], [lon + size, lat + size], [lon, lat + size], [lon, lat]]],
+    }
+
+
+class FieldSpatialIndexTest(TestCase):
+    def test_point_in_polygon_with_hole(self):
+        index = FieldSpatialIndex()
+        outer = square(126.0, 35.0, 0.01)["coordinates"][0]
+        hole = square(126.004, 35.004, 0.002)["coordinates"][0]
+        index.add(1, {"type": "Polygon", "coordinates": [outer, hole]}, owner_id=1)
+
+        self.assertEqual(index.fields_containing(35.001, 126.001), [1])
+        self.assertEqual(index.fields_containing(35.005, 126.005), [])
+        self.assertEqual(index.fields_containing(35.001, 126.001, owner_id=2), [])
+
+    def test_field_spanning_cells_and_removal(self):
+        index = FieldSpatialIndex(cell_size=0.001)
+        index.add(7, square(126.0, 35.0, 0.0035))
+        self.assertEqual(index.assign_points([(35.0005, 126.0005), (35.003, 126.003), (35.01, 126.01)]), [7, 7, None])
+
+        index.remove(7)
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.fields_containing(35.0005, 126.0005), [])
+
+    def test_index_follows_field_save_and_delete(self):
+        reset_field_index()
+        user = User.objects.create_user(email='index@test.com', password='pw', username='index')
+        field = Field.objects.create(
+            field_name='노지', field_address='전라남도 목포시', field_area=100.0,
+            crop_name='배추', description='', owner=user, geometry=square(126.39, 34.81),
+        )
+        self.assertEqual(fields_containing(34.8105, 126.3905), [field.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            field.geometry = square(126.50, 34.90)
+            field.save()
+            # 커밋 전에는 인덱스를 바꾸지 않음
+            self.assertEqual(fields_containing(34.8105, 126.3905), [field.pk])
+        self.assertEqual(assign_points([(34.8105, 126.3905), (34.9005, 126.5005)], owner_id=user.id), [None, field.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            field.delete()
+        self.assertEqual(fields_containing(34.9005, 126.5005), [])
+        reset_field_index()
+
+    def test_shared_version_is_checked_at_most_once_per_interval(self):
+        reset_field_index()
+        with mock.patch('fieldmanage.spatial_index.cache.get', return_value=None) as cache_get:
+            for _ in range(5):
+                fields_containing(34.8105, 126.3905)
+            self.assertEqual(cache_get.call_count, 1)
+            with self.settings(FIELD_INDEX_VERSION_CHECK_INTERVAL=0):
+                fields_containing(34.8105, 126.3905)
+            self.assertEqual(cache_get.call_count, 2)
+        reset_field_index()
+
+    @override_settings(CACHES=LOCMEM_CACHE)
+    def test_name_only_save_does_not_bump_version(self):
+        cache.clear()
+        user = User.objects.create_user(email='index@test.com', password='pw', username='index')
+        with self.captureOnCommitCallbacks(execute=True):
+            field = Field.objects.create(
+                field_name='노지', field_address='전라남도 목포시', field_area=100.0,
+                crop_name='배추', description='', owner=user, geometry=square(126.39, 34.81),
+            )
+        version = cache.get(VERSION_CACHE_KEY)
+
+        field = Field.objects.get(pk=field.pk)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            field.field_name = '이름만 변경'
+            field.save()
+        self.assertEqual(callbacks, [])
+        self.assertEqual(cache.get(VERSION_CACHE_KEY), version)
+        self.assertIsInstance(field.__dict__['geometry'], (bytes, memoryview))
+
+        other = User.objects.create_user(email='other@test.com', password='pw', username='other')
+        with self.captureOnCommitCallbacks(execute=True):
+            field.owner = other
+            field.save()
+        self.assertEqual(cache.get(VERSION_CACHE_KEY), version + 1)
+        self.assertEqual(cache.get(CHANGES_CACHE_KEY.format(version + 1)), [field.pk])
+
+    @override_settings(CACHES=LOCMEM_CACHE, FIELD_INDEX_VERSION_CHECK_INTERVAL=0)
+    def test_other_process_applies_published_changes_incrementally(self):
+        cache.clear()
+        reset_field_index()
+        user = User.objects.create_user(email='index@test.com', password='pw', username='index')
+        with self.captureOnCommitCallbacks(execute=True):
+            moved = Field.objects.create(
+                field_name='노지', field_address='전라남도 목포시', field_area=100.0,
+                crop_name='배추', description='', owner=user, geometry=square(126.39, 34.81),
+            )
+            removed = Field.objects.create(
+                field_name='노지2', field_address='전라남도 목포시', field_area=100.0,
+                crop_name='배추', description='', owner=user, geometry=square(126.60, 34.70),
+            )
+        # 다른 워커 프로세스의 인덱스
+        other = _IndexHolder()
+        other.get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            moved.geometry = square(126.50, 34.90)
+            moved.save()
+            removed.delete()
+
+        with mock.patch('fieldmanage.spatial_index.build_index') as rebuild:
+            index = other.get()
+        rebuild.assert_not_called()
+        self.assertEqual(index.fields_containing(34.8105, 126.3905), [])
+        self.assertEqual(index.fields_containing(34.9005, 126.5005), [moved.pk])
+        self.assertEqual(index.fields_containing(34.7005, 126.6005), [])
+
+        # 변경 기록이 만료됐으면 전체 재적재
+        with self.captureOnCommitCallbacks(execute=True):
+            moved.geometry = square(126.39, 34.81)
+            moved.save()
+        cache.delete(CHANGES_CACHE_KEY.format(cache.get(VERSION_CACHE_KEY)))
+        index = other.get()
+        self.assertEqual(index.fields_containing(34.8105, 126.3905), [moved.pk])
+        reset_field_index()
+
+
+class FieldGeometryDerivativesTest(TestCase):
+    def test_derivatives_are_stored_on_save(self):
+        user = User.objects.create_user(email='geo@test.com', password='pw', username='geo')
+        field = Field.objects.create(
+            field_name='노지', field_address='전라남도 목포시', field_area=100.0,
+            crop_name='배추', description='', owner=user, geometry=GEOMETRY,
+        )
+        field.refresh_from_db()
+
+        self.assertAlmostEqual(field.centroid_lon, 126.395, places=6)
+        self.assertAlmostEqual(field.centroid_lat, 34.815, places=6)
+        self.assertEqual(
+            (field.bbox_min_lon, field.bbox_min_lat, field.bbox_max_lon, field.bbox_max_lat),
+            (126.39, 34.81, 126.40, 34.82),
+        )
+        # 0.01° x 0.01° (위도 34.8도) ≒ 913m x 1112m
+        self.assertAlmostEqual(field.geodesic_area / 1_000_000, 1.017, places=2)
+        self.assertEqual(field.vertex_count, 5)
+        self.assertEqual((field.grid_nx, field.grid_ny), convert_to_grid(field.centroid_lat, field.centroid_lon))
+
+
+class FieldGeometryStorageTest(TestCase):
+    def test_encode_decode_round_trip(self):
+        multi = {"type": "MultiPolygon", "coordinates": [GEOMETRY["coordinates"], square(127.0, 35.0, 0.01)["coordinates"]]}
+        collection = {"type": "GeometryCollection", "geometries": [GEOMETRY, multi]}
+        point_3d = {"type": "Point", "coordinates": [126.39, 34.81, 12.5]}
+        for geometry in (GEOMETRY, multi, collection, point_3d):
+            self.assertEqual(decode_geometry(encode_geometry(geometry)), geometry)
+        self.assertEqual(encode_geometry(GEOMETRY)[:1], b'\x01')
+        self.assertEqual(encode_geometry(point_3d)[:1], b'{')
+
+    def test_geometry_is_decoded_lazily(self):
+        user = User.objects.create_user(email='geo@test.com', password='pw', username='geo')
+        Field.objects.create(
+            field_name='노지', field_address='전라남도 목포시', field_area=100.0,
+            crop_name='배추', description='', owner=user, geometry=GEOMETRY,
+        )
+        field = Field.objects.get()
+        self.assertIsInstance(field.__dict__['geometry'], bytes)
+        self.assertEqual(field.geometry, GEOMETRY)
+
+        # 접근하지 않은 geometry는 디코딩 없이 bytes 그대로 저장
+        field = Field.objects.get()
+        raw = Field._meta.get_field('geometry').pre_save(field, add=False)
+        self.assertEqual(raw, encode_geometry(GEOMETRY))
+        self.assertIsInstance(field.__dict__['geometry'], bytes)
+
+    def test_lod_tiers_are_decoded_per_level(self):
+        user = User.objects.create_user(email='geo@test.com', password='pw', username='geo')
+        Field.objects.create(
+            field_name='노지', field_address='전라남도 목포시', field_area=100.0,
+            crop_name='배추', description='', owner=user, geometry=GEOMETRY,
+        )
+        field = Field.objects.get()
+        self.assertEqual(sorted(field.geometry_lod), ['1', '2', '3'])
+        self.assertEqual(field.geometry_lod._decoded, {})
+        self.assertEqual(field.geometry_lod['2']['type'], 'Polygon')
+        self.assertEqual(list(field.geometry_lod._decoded), ['2'])
+
+        # geometry를 건드리지 않은 save는 파생값/LOD를 다시 계산하지 않음
+        field.field_name = '이름만 변경'
+        with mock.patch.object(Field, 'update_geometry_derivatives') as update:
+            field.save()
+        update.assert_not_called()
+        field.geometry = square(127.0, 35.0)
+        field.save()
+        field.refresh_from_db()
+        self.assertAlmostEqual(field.centroid_lon, 127.0005, places=4)
+        self.assertEqual(field.geometry_lod['1']['coordinates'][0][0], [127.0, 35.0])
+
+
+class FieldLodTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='lod@test.com', password='pw', username='lod')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        ring = [
+            [126.39 + 0.001 * math.cos(i * math.pi / 100), 34.81 + 0.001 * math.sin(i * math.pi / 100)]
+            for i in range(200)
+        ]
+        ring.append(ring[0])
+        self.field = Field.objects.create(
+            field_name='원형 노지', field_address='전라남도 목포시', field_area=100.0, crop_name='배추',
+            description='', owner=self.user, geometry={"type": "Polygon", "coordinates": [ring]},
+        )
+
+    def vertex_count(self, response):
+        return sum(len(ring) for ring in response['geometry']['coordinates'])
+
+    def test_lod_tiers_reduce_vertices(self):
+        full = self.client.get('/field/fields/').data[0]
+        counts = [self.vertex_count(self.client.get(f'/field/fields/?lod={lod}').data[0]) for lod in (1, 2, 3)]
+
+        self.assertEqual(self.vertex_count(full), 201)
+        self.assertTrue(201 > counts[0] > counts[1] > counts[2] >= 4)
+        self.assertNotIn('geometry_lod', full)
+
+    def test_detail_lod_and_invalid_value(self):
+        response = self.client.get(f'/field/fields/{self.field.pk}/?lod=3')
+        self.assertLess(self.vertex_count(response.data), 201)
+
+        self.assertEqual(self.client.get('/field/fields/?lod=9').status_code, 400)
+        self.assertEqual(self.client.get('/field/fields/?lod=abc').status_code, 400)
+
+    def test_missing_tier_falls_back_to_full_geometry_everywhere(self):
+        # 단계가 없는 노지(LOD 계산 전 저장 등)는 목록 API / GeoJSON 내보내기 모두 원본, 행마다 추가 쿼리 없음
+        for i in range(3):
+            Field.objects.create(
+                field_name=f'추가{i}', field_address='전라남도 목포시', field_area=10.0, crop_name='배추',
+                description='', owner=self.user, geometry=square(126.5 + i * 0.01, 34.9),
+            )
+        Field.objects.update(geometry_lod={})
+
+        with self.assertNumQueries(1):  # 최신 사진도 서브쿼리로 같은 쿼리
+            listed = self.client.get('/field/fields/?lod=2').data
+        self.assertEqual([self.vertex_count(field) for field in listed], [201, 5, 5, 5])
+
+        response = self.client.get('/field/fields.geojson?lod=2')
+        features = json.loads(b''.join(response.streaming_content))['features']
+        self.assertEqual([sum(len(ring) for ring in f['geometry']['coordinates']) for f in features], [201, 5, 5, 5])
+
+
+class FieldGeoJSONExportTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='gis@test.com', password='pw', username='gis')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        for i in range(3):
+            Field.objects.create(
+                field_name=f'노지{i}', field_address='전라남도 목포시', field_area=100.0, crop_name='배추',
+                description='', owner=self.user, geometry=square(126.39 + i * 0.01, 34.81),
+            )
+
+    def test_streams_feature_collection(self):
+        # 배치 경계를 넘겨서 스트리밍되는지 확인
+        with mock.patch.object(FieldGeoJSONExportAPIView, 'batch_size', 2):
+            response = self.client.get('/field/fields.geojson')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(body['type'], 'FeatureCollection')
+        self.assertEqual([f['properties']['field_name'] for f in body['features']], ['노지0', '노지1', '노지2'])
+        self.assertEqual(body['features'][0]['geometry']['type'], 'Polygon')
+
+    def test_etag_not_modified_until_fields_change(self):
+        etag = self.client.get('/field/fields.geojson')['ETag']
+
+        response = self.client.get('/field/fields.geojson', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        field = Field.objects.first()
+        field.field_name = '변경'
+        field.save()
+        response = self.client.get('/field/fields.geojson', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_changes_with_geometry_schema(self):
+        # updated_at을 바꾸지 않는 LOD backfill 뒤에도 이전 ?lod= 응답을 재사용하지 않음
+        etag = self.client.get('/field/fields.geojson', {'lod': 1})['ETag']
+        with self.settings(FIELD_GEOMETRY_SCHEMA_VERSION=3):
+            response = self.client.get('/field/fields.geojson', {'lod': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        with self.settings(FIELD_LOD_TOLERANCES=[0.00002, 0.00005, 0.0002]):
+            response = self.client.get('/field/fields.geojson', {'lod': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class FieldBulkImportTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeVWorldHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.vworld_url = f'http://127.0.0.1:{cls.server.server_address[1]}/'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        FakeVWorldHandler.hits = 0
+        self.user = User.objects.create_user(email='bulk@test.com', password='pw', username='bulk')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def post_rows(self, rows, **extra):
+        with self.settings(VWORLD_API_URL=self.vworld_url, VWORLD_MAX_CONCURRENCY=1):
+            return self.client.post('/field/fields/bulk/', {'fields': rows, **extra}, format='json')
+
+    def row(self, i, **extra):
+        return {'field_name': f'노지{i}', 'crop_name': '배추', 'description': '일괄 등록', **extra}
+
+    def test_bulk_import_resolves_parcels(self):
+        rows = [
+            self.row(0, bbox='126.40,34.80,126.41,34.81'),
+            self.row(1, lat=34.85, lon=126.45),
+            self.row(2, geometry=GEOMETRY, field_area=10.0, field_address='전라남도 무안군'),
+        ]
+        response = self.post_rows(rows)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(FakeVWorldHandler.hits, 2)
+        field = Field.objects.get(field_name='노지0')
+        self.assertEqual(field.field_address, '전라남도 목포시')
+        self.assertIsNotNone(field.centroid_lat)
+        # 좌표 하나로 조회한 필지도 면적이 있는 polygon
+        field = Field.objects.get(field_name='노지1')
+        self.assertGreater(field.field_area, 0)
+        self.assertLess(field.bbox_min_lon, field.bbox_max_lon)
+        self.assertLess(field.bbox_min_lat, field.bbox_max_lat)
+
+    def test_invalid_rows_are_reported(self):
+        rows = [self.row(0, bbox='126.40,34.80,126.41,34.81'), {'field_name': '주소없음'}, self.row(2, bbox='x')]
+
+        response = self.post_rows(rows)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['row'] for error in response.data['errors']], [1, 2])
+        self.assertFalse(Field.objects.exists())
+
+        self.assertEqual(self.post_rows(rows, skip_invalid='false').status_code, 400)
+        self.assertFalse(Field.objects.exists())
+
+        response = self.post_rows(rows, skip_invalid=True)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+
+
+class GazetteerTest(TestCase):
+    def test_region_lookup(self):
+        region = region_for_address('전라남도 목포시 용해동 123')
+        self.assertEqual(region.code, '46110')
+        self.assertEqual(region.region_key, '전라남도, 목포시')
+        self.assertEqual(address_for_code('00000'), '알 수 없는 지역')
+
+    def test_representative_point_only_for_provinces(self):
+        self.assertEqual(representative_point('전라남도'), (34.8161, 126.4629))
+        self.assertEqual(representative_point('세종특별자치시'), (36.4800, 127.2890))
+        self.assertIsNone(representative_point('전라남도, 목포시'))
+        self.assertIsNone(representative_point('없는지역'))
+
+    def test_forecast_grid_prefers_field_centroid(self):
+        # 시군구별 격자는 노지 무게중심에서 계산하고, 좌표가 없을 때만 시도 대표 격자 사용
+        self.assertEqual(forecast_grid('전라남도, 목포시', 34.81, 126.39), convert_to_grid(34.81, 126.39))
+        self.assertEqual(forecast_grid('전라남도, 목포시'), convert_to_grid(34.8161, 126.4629))
+        self.assertEqual(forecast_grid('강원특별자치도, 강릉시'), convert_to_grid(37.7519, 128.8761))
+        self.assertIsNone(forecast_grid('없는지역'))
+
+        user = User.objects.create_user(email='grid@test.com', password='pw', username='grid')
+        field = Field.objects.create(
+            field_name='노지', field_address='전라남도 목포시', field_area=100.0,
+            crop_name='배추', description='', owner=user, geometry=GEOMETRY,
+        )
+        self.assertEqual(grid_for_field(field), convert_to_grid(field.centroid_lat, field.centroid_lon))
+        no_geometry = Field.objects.create(
+            field_name='노지', field_address='전라남도 목포시', field_area=100.0,
+            crop_name='배추', description='', owner=user,
+        )
+        self.assertEqual(grid_for_field(no_geometry), forecast_grid('전라남도'))
+
+    def test_mid_term_codes(self):
+        self.assertEqual(mid_term_codes('전라남도, 목포시')['land'], '11F30000')
+        self.assertEqual(mid_term_codes('강원특별자치도, 강릉시')['land'], '11D20000')
+        self.assertEqual(mid_term_codes('강원특별자치도, 춘천시')['land'], '11D10000')
+        self.assertEqual(mid_term_codes('세종특별자치시')['temp'], '11C20404')
+        self.assertIsNone(mid_term_codes('없는지역'))
+
+
+@override_settings(CACHES=LOCMEM_CACHE, FIELD_DASHBOARD_CACHE_TIMEOUT=60)
+class FieldDashboardTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='owner@test.com', password='pw', username='owner')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_field(self, i):
+        field = Field.objects.create(
+            field_name=f'노지{i}', field_address='전라남도 목포시 용해동', field_area=100.0,
+            crop_name='배추', description='', owner=self.user, geometry=square(126.39 + i * 0.01, 34.81),
+        )
+        pic = FieldPic.objects.create(field=field, pic_name=f'{i}.jpg', pic_path=f'pics/{i}.jpg', pic_time=timezone.now())
+        PestResult.objects.create(field_pic=pic, pest_name='진딧물')
+        todo = FieldTodo.objects.create(
+            owner=self.user, field=field, task_name='물주기', start_date=timezone.now() - timezone.timedelta(days=1),
+            period=3,
+        )
+        TaskProgress.objects.create(task_id=todo, date=timezone.localdate(), status='done')
+        FieldTodo.objects.create(owner=self.user, field=field, task_name='관찰', start_date=timezone.now())
+        return field
+
+    def get_dashboard(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/field/dashboard/', {'refresh': '1'})
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_query_count_is_fixed(self):
+        Weather.objects.create(
+            region_name='전라남도, 목포시', date=timezone.localdate(), weather='맑음', temperature_avg=20.0, precipitation=0.0,
+        )
+        self.create_field(0)
+        small_count, _ = self.get_dashboard()
+        for i in range(1, 6):
+            self.create_field(i)
+        large_count, data = self.get_dashboard()
+
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(len(data['fields']), 6)
+        field = data['fields'][0]
+        self.assertEqual(field['todos'], {'total': 2, 'done': 1})
+        self.assertEqual(field['damage'], {'pest': 1, 'disease': 0})
+        self.assertEqual(field['weather']['weather'], '맑음')
+        self.assertIn(f"/photo/media/{FieldPic.objects.get(pic_name='0.jpg').pk}/original/?sig=", field['image_url'])
+
+    def test_response_is_cached_per_user(self):
+        self.create_field(0)
+        self.client.get('/field/dashboard/')
+        self.create_field(1)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/field/dashboard/')
+        self.assertEqual(len(response.data['fields']), 1)
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(len(self.get_dashboard()[1]['fields']), 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class FieldLocalDerivationTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeVWorldHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.vworld_url = f'http://127.0.0.1:{cls.server.server_address[1]}/'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        FakeVWorldHandler.hits = 0
+        self.user = User.objects.create_user(email='local@test.com', password='pw', username='local')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_field(self, **extra):
+        data = {'field_name': '노지', 'crop_name': '배추', 'description': '설명', 'geometry': GEOMETRY, **extra}
+        with mock.patch('fieldmanage.tasks.enrich_field_address.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post('/field/fields/', data, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return Field.objects.get(pk=response.data['field_id']), delay
+
+    def test_vectorized_area_matches_ring_area(self):
+        rings = [[[126.0 + 0.001 * math.cos(i / 50), 34.8 + 0.001 * math.sin(i / 50)] for i in range(315)]]
+        rings[0].append(rings[0][0])
+        polygon = {"type": "Polygon", "coordinates": rings}
+        self.assertGreater(count_vertices(polygon), VECTORIZE_MIN_VERTICES)
+        self.assertAlmostEqual(geodesic_area(polygon), ring_area(rings[0]), places=3)
+
+    def test_area_and_address_are_derived_without_vworld(self):
+        Field.objects.create(
+            field_name='이웃', field_address='전라남도 목포시 용해동 1', field_area=1.0, crop_name='배추',
+            description='', owner=self.user, geometry=square(126.395, 34.815),
+        )
+        field, delay = self.create_field()
+
+        self.assertAlmostEqual(field.field_area, round(field.geodesic_area, 1))
+        self.assertEqual(field.field_address, '전라남도 목포시')
+        self.assertEqual(FakeVWorldHandler.hits, 0)
+        delay.assert_called_once_with(field.field_id, '전라남도 목포시')
+
+        _, delay = self.create_field(field_area=10.0, field_address='전라남도 무안군')
+        delay.assert_not_called()
+
+    def test_bulk_import_enqueues_enrichment_without_returned_pks(self):
+        bulk_create = Field.objects.bulk_create
+
+        def without_pks(fields, **kwargs):
+            # MySQL처럼 생성된 pk를 돌려주지 않는 DB
+            created = bulk_create(fields, **kwargs)
+            for field in created:
+                field.field_id = None
+            return created
+
+        rows = [{'field_name': f'노지{i}', 'crop_name': '배추', 'description': '설명', 'geometry': square(126.4 + i * 0.01, 34.8)}
+                for i in range(2)]
+        with mock.patch.object(Field.objects, 'bulk_create', side_effect=without_pks), \
+                mock.patch('fieldmanage.tasks.enrich_field_address.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                created, errors = import_fields(self.user, rows)
+
+        self.assertEqual(errors, [])
+        ids = list(Field.objects.order_by('pk').values_list('pk', flat=True))
+        self.assertEqual([field.field_id for field in created], ids)
+        self.assertEqual([call.args for call in delay.call_args_list], [(pk, '') for pk in ids])
+
+    def test_enrichment_fills_address_from_vworld(self):
+        field, _ = self.create_field()
+        self.assertEqual(field.field_address, '')
+
+        with self.settings(VWORLD_API_URL=self.vworld_url):
+            enrich_field_address(field.field_id, '')
+        field.refresh_from_db()
+        self.assertEqual(field.field_address, '전라남도 목포시')
@@ -1,10 +1,16 @@
 from django.urls import path
-from .views import FieldListAPIView, FieldDetailAPIView, GetGeometryAPIView, FieldidListAPIView
+from .views import (
+    FieldListAPIView, FieldDetailAPIView, GetGeometryAPIView, FieldidListAPIView, FieldGeoJSONExportAPIView,
+    FieldBulkImportAPIView, FieldDashboardAPIView,
+)
 
 # ~/field
 urlpatterns = [
     path('fields/', FieldListAPIView.as_view(), name='field-list'),
+    path('fields/bulk/', FieldBulkImportAPIView.as_view(), name='field-bulk-import'),
     path('fields/<int:pk>/', FieldDetailAPIView.as_view(), name='field-detail'),
     path('get-geometry/', GetGeometryAPIView.as_view(), name='get-geometry'),
     path('fields/id/', FieldidListAPIView.as_view(), name='field-Id-list'),
+    path('dashboard/', FieldDashboardAPIView.as_view(), name='field-dashboard'),
+    path('fields.geojson', FieldGeoJSONExportAPIView.as_view(), name='field-geojson'),
 ]
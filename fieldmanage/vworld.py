@@ -0,0 +1,166 @@
+import math
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import ParcelCache
+
+CACHE_KEY_PREFIX = 'vworld:parcel:'
+
+# 좌표(lat/lon) 하나로 필지를 조회할 때 쓰는 bbox 크기
+POINT_BBOX_HALF_SIZE = 0.00001
+
+
+class VWorldError(Exception):
+    pass
+
+
+def normalize_bbox(bbox):
+    """
+    bbox("minx,miny,maxx,maxy[,EPSG:xxxx]" 문자열 또는 리스트)를 양자화된 문자열로 변환
+    같은 필지를 클릭한 요청들이 같은 캐시 키를 쓰도록 좌표를 VWORLD_BBOX_PRECISION 자리로 반올림
+    """
+    parts = bbox if isinstance(bbox, (list, tuple)) else str(bbox).split(',')
+    if len(parts) < 4:
+        raise ValueError('bbox는 minx,miny,maxx,maxy 형식이어야 합니다.')
+
+    precision = settings.VWORLD_BBOX_PRECISION
+    coords = [f"{float(value):.{precision}f}" for value in parts[:4]]
+    suffix = [str(value).strip() for value in parts[4:]]
+    return ','.join(coords + suffix)
+
+
+def point_bbox(lat, lon):
+    # VWORLD_BBOX_PRECISION 자리로 반올림하면 작은 bbox가 한 점이 되므로 그 격자에 맞춰 바깥쪽으로 내림/올림
+    scale = 10 ** settings.VWORLD_BBOX_PRECISION
+    return normalize_bbox([
+        math.floor((lon - POINT_BBOX_HALF_SIZE) * scale) / scale,
+        math.floor((lat - POINT_BBOX_HALF_SIZE) * scale) / scale,
+        math.ceil((lon + POINT_BBOX_HALF_SIZE) * scale) / scale,
+        math.ceil((lat + POINT_BBOX_HALF_SIZE) * scale) / scale,
+    ])
+
+
+def fetch_parcel(bbox_key):
+    """VWorld WFS 호출. 결과가 없으면 None, 호출 실패 시 VWorldError"""
+    params = {
+        "key": settings.VWORLD_API_KEY,
+        "domain": "orion.mokpo.ac.kr:8483",
+        "typename": "dt_d160",
+        "bbox": bbox_key,
+        "maxFeatures": "1",
+        "resultType": "results",
+        "srsName": "EPSG:4326",
+        "output": "json"
+    }
+
+    try:
+        response = requests.get(settings.VWORLD_API_URL, params=params, timeout=settings.VWORLD_TIMEOUT)
+    except requests.RequestException as e:
+        raise VWorldError(str(e))
+    if response.status_code != 200:
+        raise VWorldError(f"status {response.status_code}")
+
+    features = response.json().get('features')
+    if not features:
+        return None
+
+    feature = features[0]
+    properties = feature.get('properties', {})
+    area = properties.get('lndpcl_ar')
+    return {
+        "geometry": feature.get('geometry'),
+        "lndpcl_ar": float(area) if area not in (None, '') else None,
+        "ld_cpsg_code": properties.get('ld_cpsg_code'),
+    }
+
+
+def _cache_get(key):
+    try:
+        return cache.get(key)
+    except Exception as e:
+        print(f"[경고] Redis 캐시 조회 실패 → DB 캐시 사용: {e}")
+        return None
+
+
+def _cache_set(key, parcel):
+    try:
+        cache.set(key, parcel, timeout=settings.VWORLD_CACHE_TTL)
+    except Exception as e:
+        print(f"[경고] Redis 캐시 저장 실패: {e}")
+
+
+def _db_get(bbox_key):
+    now = timezone.now()
+    expire_before = now - timedelta(seconds=settings.VWORLD_CACHE_TTL)
+    entry = ParcelCache.objects.filter(bbox_key=bbox_key, fetched_at__gte=expire_before).first()
+    if not entry:
+        return None
+
+    ParcelCache.objects.filter(pk=entry.pk).update(last_accessed=now)
+    return {
+        "geometry": entry.geometry,
+        "lndpcl_ar": entry.lndpcl_ar,
+        "ld_cpsg_code": entry.ld_cpsg_code,
+    }
+
+
+def _db_set(bbox_key, parcel):
+    now = timezone.now()
+    ParcelCache.objects.update_or_create(
+        bbox_key=bbox_key,
+        defaults={
+            "geometry": parcel["geometry"],
+            "lndpcl_ar": parcel["lndpcl_ar"],
+            "ld_cpsg_code": parcel["ld_cpsg_code"] or "",
+            "fetched_at": now,
+            "last_accessed": now,
+        }
+    )
+
+    # LRU: 최대 개수를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+    overflow = ParcelCache.objects.count() - settings.VWORLD_CACHE_MAX_ENTRIES
+    if overflow > 0:
+        stale_ids = list(
+            ParcelCache.objects.order_by('last_accessed').values_list('pk', flat=True)[:overflow]
+        )
+        ParcelCache.objects.filter(pk__in=stale_ids).delete()
+
+
+def get_cached_parcel(bbox_key):
+    """Redis → DB 순서로 캐시 조회 (DB에서 찾으면 Redis에 다시 채움), 없으면 None"""
+    cache_key = CACHE_KEY_PREFIX + bbox_key
+
+    parcel = _cache_get(cache_key)
+    if parcel:
+        return parcel
+
+    parcel = _db_get(bbox_key)
+    if parcel:
+        _cache_set(cache_key, parcel)
+    return parcel
+
+
+def store_parcel(bbox_key, parcel):
+    _db_set(bbox_key, parcel)
+    _cache_set(CACHE_KEY_PREFIX + bbox_key, parcel)
+
+
+def get_parcel(bbox):
+    """
+    Redis → DB → VWorld 순서로 필지 정보를 조회하고 하위 계층에 다시 채워 넣음
+    반환값: {"geometry", "lndpcl_ar", "ld_cpsg_code"} 또는 None (해당 bbox에 필지 없음)
+    """
+    bbox_key = normalize_bbox(bbox)
+
+    parcel = get_cached_parcel(bbox_key)
+    if parcel:
+        return parcel
+
+    parcel = fetch_parcel(bbox_key)
+    if parcel:
+        store_parcel(bbox_key, parcel)
+    return parcel
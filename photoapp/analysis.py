@@ -0,0 +1,165 @@
+import time
+import uuid
+
+import redis
+from django.conf import settings
+
+from . import analyzer
+
+# 병해충 분석 서버로 보낼 사진 ID를 Redis에 모아 묶음으로 전송
+# - pending: 대기 목록 ("<photo_id>:<넣은 시각>"), 워커 재시작/여러 워커와 무관하게 하나
+# - inflight: 전송 중인 묶음. 결과 저장 후에만 지우므로 중간에 죽어도 다음 flush에서 다시 보냄 (at-least-once)
+# - lock: 한 번에 하나의 flush만 실행
+PENDING_KEY = 'photoapp:analysis:pending'
+INFLIGHT_KEY = 'photoapp:analysis:inflight'
+LOCK_KEY = 'photoapp:analysis:lock'
+METRICS_KEY = 'photoapp:analysis:metrics'
+
+_client = None
+
+
+def get_redis():
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.FIELDPIC_ANALYSIS_REDIS_URL)
+    return _client
+
+
+def push(photo_ids):
+    """대기 목록에 추가 후 목록 길이 반환 (FIELDPIC_ANALYSIS_BATCH_SIZE 이상이면 호출 측에서 flush 등록)"""
+    now = time.time()
+    return get_redis().rpush(PENDING_KEY, *[f'{photo_id}:{now:.3f}' for photo_id in photo_ids])
+
+
+def _parse(item):
+    photo_id, enqueued_at = item.decode().split(':')
+    return int(photo_id), float(enqueued_at)
+
+
+def oldest_age(client=None):
+    """대기 목록에서 가장 오래 기다린 사진의 대기 시간(초), 비어 있으면 None"""
+    item = (client or get_redis()).lindex(PENDING_KEY, 0)
+    return time.time() - _parse(item)[1] if item else None
+
+
+def _record(client, parsed, started):
+    # 지표: 묶음 크기, 넣은 시각 → 분석 결과 저장까지 걸린 시간(가장 오래 기다린 사진 기준)
+    done = time.time()
+    latency_ms = int((done - min(enqueued_at for _, enqueued_at in parsed)) * 1000)
+    max_latency_ms = max(latency_ms, int(client.hget(METRICS_KEY, 'max_latency_ms') or 0))
+    pipe = client.pipeline()
+    pipe.hincrby(METRICS_KEY, 'batches', 1)
+    pipe.hincrby(METRICS_KEY, 'photos', len(parsed))
+    pipe.hincrby(METRICS_KEY, 'latency_ms_sum', latency_ms)
+    pipe.hset(METRICS_KEY, mapping={
+        'last_batch_size': len(parsed),
+        'last_latency_ms': latency_ms,
+        'last_request_ms': int((done - started) * 1000),
+        'last_flush_at': int(done),
+        'max_latency_ms': max_latency_ms,
+    })
+    pipe.execute()
+
+
+def _send(client, items):
+    """
+    전송 중 목록의 항목들을 BATCH_SIZE 묶음으로 나눠 동시에 분석 → 결과 저장 후 전송 중 목록에서 제거
+    실패한 묶음은 전송 중 목록에 남기고 AnalyzerError (다음 flush에서 재전송)
+    """
+    size = settings.FIELDPIC_ANALYSIS_BATCH_SIZE
+    batches = [items[i:i + size] for i in range(0, len(items), size)]
+    parsed_batches = [[_parse(item) for item in batch] for batch in batches]
+    pics = analyzer.pics_by_path([photo_id for parsed in parsed_batches for photo_id, _ in parsed])
+    path_by_id = {pic.pk: path for path, pic in pics.items()}
+    path_batches = [[path_by_id[photo_id] for photo_id, _ in parsed if photo_id in path_by_id] for parsed in parsed_batches]
+
+    started = time.time()
+    outcomes = analyzer.analyze_many([paths for paths in path_batches if paths])
+    outcomes.reverse()
+    errors = []
+    for batch, parsed, paths in zip(batches, parsed_batches, path_batches):
+        outcome = outcomes.pop() if paths else []  # 삭제된 사진뿐인 묶음은 보낼 것 없음
+        if isinstance(outcome, analyzer.AnalyzerError):
+            errors.append(outcome)
+            continue
+        analyzer.store_results(outcome, pics)
+        pipe = client.pipeline()
+        for item in batch:
+            pipe.lrem(INFLIGHT_KEY, 1, item)
+        pipe.execute()
+        _record(client, parsed, started)
+
+    if errors:
+        client.hincrby(METRICS_KEY, 'failures', len(errors))
+        raise errors[0]
+    return len(items)
+
+
+def flush(force=False):
+    """
+    대기 목록을 FIELDPIC_ANALYSIS_BATCH_SIZE 개씩 분석 서버로 전송하고 결과 저장
+    묶음이 덜 찼으면 가장 오래된 사진이 FIELDPIC_ANALYSIS_MAX_WAIT 초 이상 기다렸거나 force일 때만 전송
+    반환값: 보낸 사진 수 (다른 flush가 실행 중이면 0)
+    """
+    client = get_redis()
+    token = uuid.uuid4().hex
+    if not client.set(LOCK_KEY, token, nx=True, ex=settings.FIELDPIC_ANALYSIS_LOCK_TIMEOUT):
+        return 0
+
+    sent = 0
+    try:
+        # 이전 flush가 전송 도중 죽었거나 실패했으면 그 묶음부터 다시 보냄
+        items = client.lrange(INFLIGHT_KEY, 0, -1)
+        if items:
+            sent += _send(client, items)
+
+        size = settings.FIELDPIC_ANALYSIS_BATCH_SIZE
+        # 한 번에 동시 요청 상한만큼의 묶음을 꺼내 병렬 전송
+        per_round = size * settings.FIELDPIC_ANALYZER_MAX_CONCURRENCY
+        while True:
+            pending = client.llen(PENDING_KEY)
+            if not pending:
+                break
+            count = min(pending, per_round)
+            if not force and count % size:
+                age = oldest_age(client)
+                if age is None or age < settings.FIELDPIC_ANALYSIS_MAX_WAIT:
+                    # 아직 기다릴 수 있으면 꽉 찬 묶음만 전송
+                    count -= count % size
+                    if not count:
+                        break
+
+            # 대기 → 전송 중 목록으로 원자적으로 옮김 (MULTI/EXEC)
+            pipe = client.pipeline(transaction=True)
+            for _ in range(count):
+                pipe.lmove(PENDING_KEY, INFLIGHT_KEY, 'LEFT', 'RIGHT')
+            items = [item for item in pipe.execute() if item]
+            sent += _send(client, items)
+    finally:
+        # lock 만료 후 다른 flush가 잡은 lock은 지우지 않음
+        if client.get(LOCK_KEY) == token.encode():
+            client.delete(LOCK_KEY)
+    return sent
+
+
+def metrics():
+    """묶음 크기 / 지연 시간 지표 + 현재 대기 상태"""
+    client = get_redis()
+    values = {key.decode(): int(value) for key, value in client.hgetall(METRICS_KEY).items()}
+    batches = values.get('batches', 0)
+    age = oldest_age(client)
+    return {
+        "pending": client.llen(PENDING_KEY),
+        "inflight": client.llen(INFLIGHT_KEY),
+        "oldest_pending_seconds": round(age, 1) if age is not None else None,
+        "batches": batches,
+        "photos": values.get('photos', 0),
+        "failures": values.get('failures', 0),
+        "avg_batch_size": round(values.get('photos', 0) / batches, 1) if batches else None,
+        "avg_latency_ms": values.get('latency_ms_sum', 0) // batches if batches else None,
+        "max_latency_ms": values.get('max_latency_ms'),
+        "last_batch_size": values.get('last_batch_size'),
+        "last_latency_ms": values.get('last_latency_ms'),
+        "last_request_ms": values.get('last_request_ms'),
+        "last_flush_at": values.get('last_flush_at'),
+    }
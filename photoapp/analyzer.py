@@ -0,0 +1,218 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from requests.adapters import HTTPAdapter
+
+# 병해충 분석 서버(Flask) 클라이언트
+# 요청: POST FIELDPIC_ANALYZER_URL {"file_paths": [...]}
+# 응답: {"results": [{"file_path": "...", "pests": ["이름", ...], "diseases": ["이름", ...]}, ...]}
+RETRY_STATUS = {429, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+_slots = None
+
+
+class AnalyzerError(Exception):
+    pass
+
+
+class AnalyzerBusy(AnalyzerError):
+    """FIELDPIC_ANALYZER_MAX_CONCURRENCY 개 요청이 이미 진행 중이라 자리를 얻지 못함"""
+
+
+def get_session():
+    """프로세스당 하나의 Session (keep-alive 연결 재사용, 풀 크기 = 동시 요청 상한)"""
+    global _session, _slots
+    with _session_lock:
+        if _session is None:
+            size = settings.FIELDPIC_ANALYZER_MAX_CONCURRENCY
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _slots = threading.BoundedSemaphore(size)
+            _session = session
+    return _session
+
+
+def close_session():
+    """연결 풀을 닫고 다음 호출 때 설정값으로 다시 만듦 (설정 변경 / 벤치마크용)"""
+    global _session, _slots
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = _slots = None
+
+
+def _backoff(attempt, response=None):
+    # Retry-After가 있으면 따르고, 없으면 지수 백오프 + full jitter (여러 워커가 동시에 재시도하지 않도록)
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return random.uniform(0, settings.FIELDPIC_ANALYZER_BACKOFF * 2 ** attempt)
+
+
+def analyze(file_paths):
+    """
+    분석 서버에 파일 경로 목록 전송 → [{"file_path", "pests", "diseases"}, ...]
+    연결 실패 / 타임아웃 / 429·5xx는 FIELDPIC_ANALYZER_RETRIES 번까지 재시도, 그래도 실패하면 AnalyzerError
+    """
+    session = get_session()
+    if not _slots.acquire(timeout=settings.FIELDPIC_ANALYZER_TIMEOUT):
+        raise AnalyzerBusy('분석 서버 동시 요청 수 초과')
+    try:
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = session.post(
+                    settings.FIELDPIC_ANALYZER_URL, json={"file_paths": file_paths},
+                    timeout=(settings.FIELDPIC_ANALYZER_CONNECT_TIMEOUT, settings.FIELDPIC_ANALYZER_TIMEOUT),
+                )
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response.json().get('results', [])
+                error = f"status {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = str(e)
+            except (requests.RequestException, ValueError) as e:  # 4xx / 잘못된 JSON은 재시도해도 같음
+                raise AnalyzerError(str(e)) from e
+
+            if attempt >= settings.FIELDPIC_ANALYZER_RETRIES:
+                raise AnalyzerError(f"{attempt + 1}회 시도 실패: {error}")
+            time.sleep(_backoff(attempt, response))
+            attempt += 1
+    finally:
+        _slots.release()
+
+
+def store_results(results, pics_by_path):
+    """
+    분석 응답을 콜백(ingest_detections)과 같은 규칙으로 저장: (사진, 이름)이 이미 있으면 건너뛰고 지우지 않음
+    → at-least-once 재전송에도 중복이 없고, 콜백으로 들어온 결과를 덮어쓰지 않음
+    반환값: (새로 저장한 해충 수, 병해 수)
+    """
+    detections = []
+    for result in results:
+        pic = pics_by_path.get(result.get('file_path'))
+        if pic is None:
+            continue
+        for key, kind in RESULT_KINDS:
+            detections += [(pic.pk, kind, name.strip()[:100]) for name in result.get(key) or [] if name.strip()]
+
+    new = _write_detections(detections)
+    return new['pest'], new['disease']
+
+
+def analyze_many(path_batches):
+    """
+    여러 묶음을 FIELDPIC_ANALYZER_MAX_CONCURRENCY 개까지 동시에 전송 (HTTP만, DB는 호출 측 스레드에서)
+    반환값: 묶음 순서대로 결과 목록 또는 AnalyzerError
+    """
+    def run(paths):
+        try:
+            return analyze(paths)
+        except AnalyzerError as e:
+            return e
+
+    if len(path_batches) == 1:
+        return [run(path_batches[0])]
+    workers = min(len(path_batches), settings.FIELDPIC_ANALYZER_MAX_CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, path_batches))
+
+
+def pics_by_path(photo_ids):
+    """사진 ID → {분석 서버에 보낼 전체 경로: FieldPic} (삭제된 사진 / 거의 같은 사진으로 표시된 사진은 빠짐)"""
+    from .models import FieldPic
+
+    pics = (
+        FieldPic.objects.filter(pk__in=photo_ids, near_duplicate_of__isnull=True)
+        .exclude(pic_path='').only('pic_path')
+    )
+    return {pic.file_path: pic for pic in pics}
+
+
+def analyze_pics(photo_ids):
+    """사진 ID 목록을 한 묶음으로 분석하고 결과 저장, 반환값: (해충 수, 병해 수)"""
+    pics = pics_by_path(photo_ids)
+    if not pics:  # 그 사이 삭제된 사진뿐이면 보낼 것 없음
+        return 0, 0
+    return store_results(analyze(list(pics)), pics)
+
+
+# 분석 서버 콜백(/photo/analysis/results/): 응답과 같은 모양이지만 file_path 대신 field_pic_id
+# {"results": [{"field_pic_id": 1, "pests": ["이름", ...], "diseases": ["이름", ...]}, ...]}
+RESULT_KINDS = (('pests', 'pest'), ('diseases', 'disease'))
+
+
+def parse_detections(results):
+    """콜백 본문의 results → [(field_pic_id, "pest" | "disease", 이름), ...], 형식이 틀리면 ValueError"""
+    if not isinstance(results, list):
+        raise ValueError('results must be a list')
+    detections = []
+    for index, result in enumerate(results):
+        if not isinstance(result, dict):
+            raise ValueError(f'results[{index}] must be an object')
+        field_pic_id = result.get('field_pic_id')
+        if not isinstance(field_pic_id, int) or isinstance(field_pic_id, bool):
+            raise ValueError(f'results[{index}].field_pic_id must be an integer')
+        for key, kind in RESULT_KINDS:
+            names = result.get(key) or []
+            if not isinstance(names, list) or not all(isinstance(name, str) and name.strip() for name in names):
+                raise ValueError(f'results[{index}].{key} must be a list of names')
+            if any(len(name.strip()) > 100 for name in names):
+                raise ValueError(f'results[{index}].{key}: name must be at most 100 characters')
+            detections += [(field_pic_id, kind, name.strip()) for name in names]
+    return detections
+
+
+def ingest_detections(detections):
+    """
+    (field_pic_id, 종류, 이름) 목록을 한 트랜잭션에서 bulk_create
+    FieldPic 존재 여부는 쿼리 한 번으로 확인, (사진, 이름)이 이미 있으면 건너뜀 → 분석 서버 재시도에도 중복 없음
+    반환값: {"pest": 새로 저장한 수, "disease": ..., "duplicates": 건너뛴 수, "unknown_field_pic_ids": [...]}
+    """
+    from .models import FieldPic
+
+    field_pic_ids = {field_pic_id for field_pic_id, _, _ in detections}
+    known = set(FieldPic.objects.filter(pk__in=field_pic_ids).values_list('pk', flat=True))
+    accepted = [detection for detection in detections if detection[0] in known]
+
+    summary = _write_detections(accepted)
+    summary["duplicates"] = len(accepted) - summary["pest"] - summary["disease"]
+    summary["unknown_field_pic_ids"] = sorted(field_pic_ids - known)
+    return summary
+
+
+def _write_detections(detections):
+    """
+    (field_pic_id, 종류, 이름) 목록 중 아직 없는 (사진, 이름)만 bulk_create (unique_together 기준, 기존 결과는 지우지 않음)
+    반환값: {"pest": 새로 저장한 수, "disease": ...}
+    """
+    from .models import DiseaseResult, PestResult
+
+    summary = {"pest": 0, "disease": 0}
+    with transaction.atomic():
+        for kind, model, name_field in (('pest', PestResult, 'pest_name'), ('disease', DiseaseResult, 'disease_name')):
+            wanted = {(field_pic_id, name) for field_pic_id, k, name in detections if k == kind}
+            if not wanted:
+                continue
+            existing = set(
+                model.objects.filter(field_pic_id__in={field_pic_id for field_pic_id, _ in wanted})
+                .values_list('field_pic_id', name_field)
+            )
+            new = sorted(wanted - existing)
+            # 동시에 같은 결과가 들어와도 unique_together에 걸린 행은 무시
+            model.objects.bulk_create(
+                [model(field_pic_id=field_pic_id, **{name_field: name}) for field_pic_id, name in new],
+                batch_size=1000, ignore_conflicts=True,
+            )
+            summary[kind] = len(new)
+    return summary
@@ -0,0 +1,211 @@
+import os
+import tarfile
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.timezone import make_aware
+
+from fieldmanage.spatial_index import assign_points
+from .exif import read_exif
+from .geo import geo_cell
+from .models import FieldPic
+from .storage import ALLOWED_EXTENSIONS, media_path, store_chunks
+from .tasks import enqueue_pic_batches
+
+# 비행 한 번 분량(수백 장)을 한 요청으로 받는 일괄 업로드
+ARCHIVE_ERRORS = (tarfile.TarError, zipfile.BadZipFile, EOFError)
+
+
+class ArchiveTooLarge(Exception):
+    """압축 멤버 하나가 FIELDPIC_UPLOAD_MAX_SIZE, 또는 풀었을 때 전체가 FIELDPIC_ARCHIVE_MAX_SIZE를 넘음 (413)"""
+
+
+def is_image_name(name):
+    # __MACOSX/._DJI_0001.JPG 같은 숨김/리소스 파일 제외
+    base = os.path.basename(name)
+    return not base.startswith('.') and os.path.splitext(base)[1].lower() in ALLOWED_EXTENSIONS
+
+
+def iter_uploaded_files(files):
+    """multipart 파일들 → (이름, UploadedFile), 사진이 아니면 (이름, None)"""
+    for uploaded_file in files:
+        yield uploaded_file.name, uploaded_file if is_image_name(uploaded_file.name) else None
+
+
+def _check_size(name, size, total):
+    # 압축 폭탄 방지: 멤버를 메모리로 읽기 전에 헤더의 크기로 확인, 반환값은 누적 크기
+    if size > settings.FIELDPIC_UPLOAD_MAX_SIZE:
+        raise ArchiveTooLarge(f'{name} is larger than {settings.FIELDPIC_UPLOAD_MAX_SIZE} bytes')
+    total += size
+    if total > settings.FIELDPIC_ARCHIVE_MAX_SIZE:
+        raise ArchiveTooLarge(f'archive expands to more than {settings.FIELDPIC_ARCHIVE_MAX_SIZE} bytes')
+    return total
+
+
+def iter_archive(archive):
+    """
+    zip / tar(.gz, .bz2, .xz) 업로드 파일 → (멤버 이름, bytes), 사진이 아니면 (이름, None)
+    tar는 스트림 모드('r|*')로 앞에서부터 한 번만 읽음
+    사진 멤버는 읽기 전에 크기 상한을 확인하고 넘으면 ArchiveTooLarge
+    (zipfile은 헤더의 file_size보다 많이 풀지 않고, tar 스트림은 헤더 크기만큼만 읽음)
+    """
+    total = 0
+    if archive.name.lower().endswith('.zip'):
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                if not is_image_name(info.filename):
+                    yield info.filename, None
+                    continue
+                total = _check_size(info.filename, info.file_size, total)
+                yield info.filename, zf.read(info)
+    else:
+        with tarfile.open(fileobj=archive, mode='r|*') as tf:
+            for member in tf:
+                if not member.isfile():
+                    continue
+                if not is_image_name(member.name):
+                    yield member.name, None
+                    continue
+                total = _check_size(member.name, member.size, total)
+                yield member.name, tf.extractfile(member).read()
+
+
+def _store(order, name, payload):
+    # 워커 스레드: 저장(SHA-256) + EXIF(APP1 세그먼트만) → DB는 건드리지 않음
+    chunks = payload.chunks() if hasattr(payload, 'chunks') else [payload]
+    digest, path, new = store_chunks(chunks, name)
+    latitude, longitude, pic_time = read_exif(media_path(path))
+    return {
+        'order': order, 'name': name, 'digest': digest, 'path': path, 'new': new,
+        'latitude': latitude, 'longitude': longitude, 'pic_time': pic_time,
+    }
+
+
+def discard_unused(path):
+    """노지를 찾지 못해 저장하지 않을 사진 파일 삭제 (그 사이 다른 FieldPic이 같은 내용을 참조하면 남김)"""
+    if not FieldPic.objects.filter(pic_path=path).exists():
+        try:
+            os.remove(media_path(path))
+        except FileNotFoundError:
+            pass
+
+
+def _bounded_map(fn, items, workers):
+    """items를 순서대로 스레드 풀에 넘기되 처리 중인 작업은 workers * 2개로 제한 (압축 멤버 메모리 상한)"""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for item in items:
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(fn, *item))
+        for future in pending:
+            yield future.result()
+
+
+def ingest(field, sources, owner_id=None):
+    """
+    (이름, 내용) 목록을 FieldPic으로 일괄 저장
+    - 파일 저장/해시/EXIF는 FIELDPIC_BULK_UPLOAD_WORKERS 개 스레드로 병렬 처리
+    - field가 None이면 EXIF 위치로 owner_id 사용자의 노지를 한 번에 배정 (여러 노지를 지나간 비행)
+      위치가 없거나 어느 노지에도 속하지 않는 사진은 저장하지 않고 unassigned로 돌려줌
+    - 같은 요청 안 / 같은 노지에 이미 있는 사진(content_hash)은 건너뜀
+    - FieldPic은 bulk_create (post_save 없음) → 축소본/분석 작업은 묶음 단위로 직접 등록
+    반환값: {"pics": [...], "duplicates": [이름, ...], "skipped": [이름, ...], "unassigned": [이름, ...]}
+    도중에 실패하면(압축 오류, 크기 초과, DB 오류 등) 이번 요청이 새로 저장한 파일을 지우고 예외를 그대로 올림
+    """
+    written = []
+
+    def store(order, name, payload):
+        result = _store(order, name, payload)
+        if result['new']:
+            written.append(result['path'])
+        return result
+
+    try:
+        return _ingest(field, sources, owner_id, store)
+    except Exception:
+        # DB 행은 롤백됐으므로 다른 FieldPic이 참조하지 않는 파일만 남지 않게 정리
+        for path in written:
+            discard_unused(path)
+        raise
+
+
+def _ingest(field, sources, owner_id, store):
+    skipped = []
+
+    def images():
+        for order, (name, payload) in enumerate(sources):
+            if payload is None:
+                skipped.append(name)
+            else:
+                yield order, name, payload
+
+    stored = {}
+    duplicates = []
+    for result in _bounded_map(store, images(), settings.FIELDPIC_BULK_UPLOAD_WORKERS):
+        # 같은 내용이 여러 번 오면 완료 순서와 무관하게 먼저 보낸 파일을 남김
+        kept = stored.setdefault(result['digest'], result)
+        if kept is not result:
+            if result['order'] < kept['order']:
+                stored[result['digest']], result = result, kept
+            duplicates.append(result['name'])
+
+    unassigned = []
+    if field is not None:
+        for result in stored.values():
+            result['field_id'] = field.pk
+    else:
+        # 요청 전체 좌표를 한 번에 배정 (격자 셀별 후보 재사용, bbox로 거른 뒤 polygon 판정)
+        results = list(stored.values())
+        field_ids = assign_points([(result['latitude'], result['longitude']) for result in results], owner_id)
+        for result, field_id in zip(results, field_ids):
+            result['field_id'] = field_id
+            if field_id is None:
+                unassigned.append(stored.pop(result['digest'])['name'])
+                if result['new']:
+                    discard_unused(result['path'])
+
+    existing = set(
+        FieldPic.objects.filter(
+            field_id__in={result['field_id'] for result in stored.values()}, content_hash__in=list(stored),
+        ).values_list('field_id', 'content_hash')
+    )
+    duplicates += [
+        stored.pop(digest)['name']
+        for digest, result in list(stored.items()) if (result['field_id'], digest) in existing
+    ]
+
+    pics = [
+        FieldPic(
+            field_id=result['field_id'],
+            pic_name=os.path.basename(result['name'])[:255],
+            pic_path=result['path'],
+            content_hash=digest,
+            latitude=result['latitude'],
+            longitude=result['longitude'],
+            geo_cell=geo_cell(result['latitude'], result['longitude']),  # bulk_create는 save()를 거치지 않음
+            pic_time=make_aware(result['pic_time']) if result['pic_time'] else None,
+        )
+        for digest, result in sorted(stored.items(), key=lambda item: item[1]['order'])
+    ]
+    wanted = {(result['field_id'], digest) for digest, result in stored.items()}
+    with transaction.atomic():
+        FieldPic.objects.bulk_create(pics, batch_size=settings.FIELDPIC_BULK_CREATE_BATCH)
+        # MySQL은 bulk_create가 pk를 채우지 않으므로 (field, content_hash) 인덱스로 다시 조회
+        created = [
+            pic for pic in FieldPic.objects.filter(
+                field_id__in={field_id for field_id, _ in wanted}, content_hash__in=list(stored),
+            )
+            .order_by('field_pic_id')
+            .values('field_pic_id', 'field_id', 'pic_name', 'content_hash', 'latitude', 'longitude', 'pic_time')
+            if (pic['field_id'], pic['content_hash']) in wanted
+        ]
+        enqueue_pic_batches([pic['field_pic_id'] for pic in created])
+
+    return {"pics": created, "duplicates": sorted(duplicates), "skipped": sorted(skipped), "unassigned": sorted(unassigned)}
@@ -0,0 +1,55 @@
+import os
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+from .media import media_url
+
+DERIVED_DIR = 'derived'
+EXTENSIONS = {'webp': '.webp', 'jpeg': '.jpg'}
+
+
+def derivative_name(pic):
+    # 내용 해시가 있으면 같은 사진끼리 썸네일도 공유
+    return pic.content_hash or f'pic{pic.pk}'
+
+
+def generate_derivatives(source_path, name, media_root=None, sizes=None, formats=None, quality=None):
+    """
+    원본 사진 하나로 크기별(FIELDPIC_DERIVATIVE_SIZES) / 형식별(webp, jpeg) 축소본 생성
+    DB를 쓰지 않으므로 backfill 시 프로세스 풀에서 그대로 호출 가능 (설정값은 인자로 전달)
+    반환값: {"thumb": {"webp": "derived/ab/cd/<name>_thumb.webp", "jpeg": ...}, ...} (MEDIA_ROOT 기준 상대 경로)
+    """
+    media_root = media_root or settings.MEDIA_ROOT
+    sizes = sizes or settings.FIELDPIC_DERIVATIVE_SIZES
+    formats = formats or settings.FIELDPIC_DERIVATIVE_FORMATS
+    quality = quality or settings.FIELDPIC_DERIVATIVE_QUALITY
+
+    relative_dir = os.path.join(DERIVED_DIR, name[:2], name[2:4])
+    os.makedirs(os.path.join(media_root, relative_dir), exist_ok=True)
+
+    result = {}
+    with Image.open(source_path) as image:
+        # JPEG는 디코딩 단계에서 1/2~1/8로 줄여 읽어 큰 드론 사진도 빠르게 처리
+        image.draft('RGB', (max(sizes.values()),) * 2)
+        image = ImageOps.exif_transpose(image).convert('RGB')
+
+        # 큰 크기부터 줄여가며 다음 크기의 입력으로 재사용
+        for label, size in sorted(sizes.items(), key=lambda item: -item[1]):
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            result[label] = {}
+            for fmt in formats:
+                relative_path = os.path.join(relative_dir, f'{name}_{label}{EXTENSIONS[fmt]}')
+                image.save(os.path.join(media_root, relative_path), fmt.upper(), quality=quality, optimize=True)
+                result[label][fmt] = relative_path
+    return result
+
+
+def derivative_urls(field_pic_id, derivatives, viewer_id, request=None):
+    """FieldPic.derivatives → {"thumb": {"webp": url, "jpeg": url}, ...} (/photo/media/ 서명 URL), 없으면 None"""
+    if not field_pic_id or not derivatives:
+        return None
+    return {
+        label: {fmt: media_url(field_pic_id, viewer_id, f'{label}.{fmt}', request) for fmt in files}
+        for label, files in derivatives.items()
+    }
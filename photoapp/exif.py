@@ -0,0 +1,127 @@
+# 사진 EXIF에서 촬영 위치(GPS)와 촬영 시각(DateTimeOriginal)만 읽는 경량 리더
+# JPEG는 파일 앞부분의 APP1(Exif) 세그먼트만 읽고 이미지 데이터/썸네일은 건드리지 않음
+import struct
+from datetime import datetime
+
+from PIL import Image
+
+EXIF_IFD_POINTER = 0x8769
+GPS_IFD_POINTER = 0x8825
+DATETIME_ORIGINAL = 0x9003
+GPS_LATITUDE_REF, GPS_LATITUDE, GPS_LONGITUDE_REF, GPS_LONGITUDE = 1, 2, 3, 4
+
+# TIFF 태그 type → (struct 형식, 바이트 수)
+TYPE_FORMATS = {1: ('B', 1), 2: ('s', 1), 3: ('H', 2), 4: ('I', 4), 5: ('II', 8), 7: ('B', 1), 9: ('i', 4), 10: ('ii', 8)}
+
+
+def read_app1(fp):
+    """JPEG 마커를 따라가며 Exif APP1 세그먼트 본문(TIFF 데이터)만 반환, 없으면 None"""
+    if fp.read(2) != b'\xff\xd8':
+        return None
+    while True:
+        marker = fp.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        if marker[1] in (0xD9, 0xDA):  # EOI / SOS 이후는 이미지 데이터
+            return None
+        if 0xD0 <= marker[1] <= 0xD7 or marker[1] == 0x01:  # 길이 없는 마커
+            continue
+        length, = struct.unpack('>H', fp.read(2))
+        if marker[1] == 0xE1:
+            segment = fp.read(length - 2)
+            if segment.startswith(b'Exif\x00\x00'):
+                return segment[6:]
+        else:
+            fp.seek(length - 2, 1)
+
+
+def _read_ifd(tiff, offset, order, wanted):
+    """IFD 하나에서 wanted 태그 값만 읽음 {tag: value}"""
+    values = {}
+    count, = struct.unpack_from(order + 'H', tiff, offset)
+    for i in range(count):
+        entry = offset + 2 + i * 12
+        tag, type_, n = struct.unpack_from(order + 'HHI', tiff, entry)
+        if tag not in wanted or type_ not in TYPE_FORMATS:
+            continue
+        fmt, size = TYPE_FORMATS[type_]
+        # 4바이트 이하면 값이 entry 안에, 넘으면 offset 위치에 있음
+        value_offset = entry + 8 if size * n <= 4 else struct.unpack_from(order + 'I', tiff, entry + 8)[0]
+        if type_ == 2:
+            values[tag] = tiff[value_offset:value_offset + n].split(b'\x00', 1)[0].decode('ascii', 'ignore')
+        else:
+            values[tag] = struct.unpack_from(order + fmt * n, tiff, value_offset)
+    return values
+
+
+def _to_degrees(rationals):
+    # (도 분자, 도 분모, 분 분자, 분 분모, 초 분자, 초 분모)
+    d, m, s = (rationals[i] / rationals[i + 1] if rationals[i + 1] else 0.0 for i in (0, 2, 4))
+    return d + m / 60.0 + s / 3600.0
+
+
+def _parse_datetime(value):
+    try:
+        return datetime.strptime(value.strip(), '%Y:%m:%d %H:%M:%S')
+    except (AttributeError, ValueError):
+        return None
+
+
+def parse_tiff(tiff):
+    """Exif TIFF 데이터 → (latitude, longitude, pic_time)"""
+    order = '<' if tiff[:2] == b'II' else '>'
+    ifd0_offset, = struct.unpack_from(order + 'I', tiff, 4)
+    ifd0 = _read_ifd(tiff, ifd0_offset, order, {EXIF_IFD_POINTER, GPS_IFD_POINTER})
+
+    pic_time = None
+    if EXIF_IFD_POINTER in ifd0:
+        exif = _read_ifd(tiff, ifd0[EXIF_IFD_POINTER][0], order, {DATETIME_ORIGINAL})
+        pic_time = _parse_datetime(exif.get(DATETIME_ORIGINAL))
+
+    latitude = longitude = None
+    if GPS_IFD_POINTER in ifd0:
+        gps = _read_ifd(
+            tiff, ifd0[GPS_IFD_POINTER][0], order,
+            {GPS_LATITUDE_REF, GPS_LATITUDE, GPS_LONGITUDE_REF, GPS_LONGITUDE},
+        )
+        if GPS_LATITUDE in gps and GPS_LONGITUDE in gps:
+            latitude = _to_degrees(gps[GPS_LATITUDE])
+            longitude = _to_degrees(gps[GPS_LONGITUDE])
+            if gps.get(GPS_LATITUDE_REF) == 'S':
+                latitude = -latitude
+            if gps.get(GPS_LONGITUDE_REF) == 'W':
+                longitude = -longitude
+    return latitude, longitude, pic_time
+
+
+def _read_with_pillow(path):
+    # JPEG가 아닌 형식(PNG, WebP, TIFF 등)은 Pillow로 헤더만 열어서 읽음
+    with Image.open(path) as image:
+        exif = image.getexif()
+        pic_time = _parse_datetime(exif.get_ifd(EXIF_IFD_POINTER).get(DATETIME_ORIGINAL))
+        gps = exif.get_ifd(GPS_IFD_POINTER)
+    latitude = longitude = None
+    if gps.get(GPS_LATITUDE) and gps.get(GPS_LONGITUDE):
+        latitude = sum(float(v) / 60 ** i for i, v in enumerate(gps[GPS_LATITUDE]))
+        longitude = sum(float(v) / 60 ** i for i, v in enumerate(gps[GPS_LONGITUDE]))
+        if gps.get(GPS_LATITUDE_REF) == 'S':
+            latitude = -latitude
+        if gps.get(GPS_LONGITUDE_REF) == 'W':
+            longitude = -longitude
+    return latitude, longitude, pic_time
+
+
+def read_exif(path):
+    """사진 파일 → (latitude, longitude, pic_time), 읽을 수 없는 값은 None"""
+    try:
+        with open(path, 'rb') as fp:
+            is_jpeg = fp.read(2) == b'\xff\xd8'
+            if is_jpeg:
+                fp.seek(0)
+                tiff = read_app1(fp)
+        if is_jpeg:
+            return parse_tiff(tiff) if tiff else (None, None, None)
+        return _read_with_pillow(path)
+    except (OSError, struct.error, ValueError, IndexError) as e:
+        print(f"EXIF error ({path}): {e}")
+        return None, None, None
@@ -0,0 +1,50 @@
+import math
+
+from django.conf import settings
+from django.db.models import Q
+
+# FieldPic 촬영 위치용 균일 격자. 셀 번호는 행 우선(row-major)이라
+# 같은 위도 행에서 이어진 셀들은 번호도 이어짐 → 영역 조회 = 행마다 geo_cell BETWEEN 한 번 (인덱스 범위 조회)
+METERS_PER_DEGREE = 111320.0
+
+
+def _columns(cell_size):
+    return math.ceil(360 / cell_size)
+
+
+def _row_col(lat, lon, cell_size):
+    return math.floor((lat + 90) / cell_size), math.floor((lon + 180) / cell_size)
+
+
+def geo_cell(lat, lon, cell_size=None):
+    """위경도 → 격자 셀 번호 (FIELDPIC_GEO_CELL_SIZE 도 단위), 좌표가 없으면 None"""
+    if lat is None or lon is None:
+        return None
+    cell_size = cell_size or settings.FIELDPIC_GEO_CELL_SIZE
+    row, col = _row_col(lat, lon, cell_size)
+    return row * _columns(cell_size) + col
+
+
+def bbox_cells_q(min_lat, min_lon, max_lat, max_lon, cell_size=None):
+    """
+    bbox를 덮는 셀들의 조건 (행마다 geo_cell__range 하나)
+    행이 FIELDPIC_GEO_MAX_ROWS 개를 넘을 만큼 넓으면 None (호출 측에서 거절)
+    """
+    cell_size = cell_size or settings.FIELDPIC_GEO_CELL_SIZE
+    columns = _columns(cell_size)
+    min_row, min_col = _row_col(min_lat, min_lon, cell_size)
+    max_row, max_col = _row_col(max_lat, max_lon, cell_size)
+    if max_row - min_row + 1 > settings.FIELDPIC_GEO_MAX_ROWS:
+        return None
+
+    condition = Q()
+    for row in range(min_row, max_row + 1):
+        condition |= Q(geo_cell__range=(row * columns + min_col, row * columns + max_col))
+    return condition
+
+
+def radius_bbox(lat, lon, radius):
+    """중심 + 반경(m) → (min_lat, min_lon, max_lat, max_lon), 경도 방향은 위도에 따라 늘림"""
+    dlat = radius / METERS_PER_DEGREE
+    dlon = radius / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
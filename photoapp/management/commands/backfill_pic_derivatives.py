@@ -0,0 +1,73 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from photoapp.derivatives import derivative_name, generate_derivatives
+from photoapp.models import FieldPic
+
+
+def _generate(args):
+    # 자식 프로세스에서 실행. 실패해도 전체 작업은 계속 진행
+    field_pic_id, source_path, name, options = args
+    try:
+        return field_pic_id, generate_derivatives(source_path, name, **options), None
+    except Exception as e:
+        return field_pic_id, None, str(e)
+
+
+class Command(BaseCommand):
+    help = "축소본(썸네일/미리보기)이 없는 기존 FieldPic을 프로세스 풀로 병렬 생성"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--batch-size", type=int, default=200, help="DB 조회/반영 단위")
+        parser.add_argument("--all", action="store_true", help="이미 축소본이 있는 사진도 다시 생성")
+
+    def handle(self, *args, **options):
+        queryset = FieldPic.objects.exclude(pic_path='').order_by('field_pic_id')
+        if not options["all"]:
+            queryset = queryset.filter(derivatives={})
+
+        # 설정값은 자식 프로세스에 인자로 넘김 (spawn 방식에서도 Django 설정 없이 동작)
+        pool_options = {
+            "media_root": settings.MEDIA_ROOT,
+            "sizes": settings.FIELDPIC_DERIVATIVE_SIZES,
+            "formats": settings.FIELDPIC_DERIVATIVE_FORMATS,
+            "quality": settings.FIELDPIC_DERIVATIVE_QUALITY,
+        }
+
+        started = time.perf_counter()
+        done = failed = 0
+        last_id = 0
+        with ProcessPoolExecutor(max_workers=options["workers"]) as executor:
+            while True:
+                pics = list(
+                    queryset.filter(field_pic_id__gt=last_id)
+                    .only('field_pic_id', 'pic_path', 'content_hash')[:options["batch_size"]]
+                )
+                if not pics:
+                    break
+                last_id = pics[-1].field_pic_id
+
+                jobs = [
+                    (pic.field_pic_id, pic.file_path, derivative_name(pic), pool_options)
+                    for pic in pics if os.path.exists(pic.file_path)
+                ]
+                failed += len(pics) - len(jobs)
+                updated = []
+                for future in as_completed([executor.submit(_generate, job) for job in jobs]):
+                    field_pic_id, derivatives, error = future.result()
+                    if error:
+                        failed += 1
+                        self.stderr.write(f"사진 {field_pic_id} 실패: {error}")
+                        continue
+                    updated.append(FieldPic(field_pic_id=field_pic_id, derivatives=derivatives))
+
+                FieldPic.objects.bulk_update(updated, ['derivatives'])
+                done += len(updated)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"{done}개 사진 축소본 생성 완료, 실패 {failed}개 ({elapsed:.1f}초)"))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from photoapp.geo import geo_cell
+from photoapp.models import FieldPic
+
+
+class Command(BaseCommand):
+    help = "기존 FieldPic의 geo_cell을 위경도에서 다시 계산 (FIELDPIC_GEO_CELL_SIZE를 바꾼 뒤에도 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--only-missing", action="store_true", help="geo_cell이 비어있는 사진만 계산")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = (
+            FieldPic.objects.filter(latitude__isnull=False, longitude__isnull=False)
+            .only("field_pic_id", "latitude", "longitude", "geo_cell")
+            .order_by("field_pic_id")
+        )
+        if options["only_missing"]:
+            queryset = queryset.filter(geo_cell__isnull=True)
+
+        batch = []
+        updated = 0
+        for pic in queryset.iterator(chunk_size=batch_size):
+            pic.geo_cell = geo_cell(pic.latitude, pic.longitude)
+            batch.append(pic)
+            if len(batch) >= batch_size:
+                FieldPic.objects.bulk_update(batch, ["geo_cell"])
+                updated += len(batch)
+                batch = []
+
+        if batch:
+            FieldPic.objects.bulk_update(batch, ["geo_cell"])
+            updated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"{updated}개 사진 geo_cell 갱신 완료"))
@@ -0,0 +1,42 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from photoapp.models import FieldPic
+from photoapp.phash import dhash_file, mark_near_duplicates
+
+
+class Command(BaseCommand):
+    help = "기존 FieldPic의 지각 해시(phash)를 계산하고 거의 같은 사진을 near_duplicate_of로 표시"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        queryset = (
+            FieldPic.objects.filter(phash__isnull=True).exclude(pic_path='')
+            .only("field_pic_id", "pic_path").order_by("field_pic_id")
+        )
+        hashed = failed = marked = 0
+        last_id = 0
+        while True:
+            pics = list(queryset.filter(field_pic_id__gt=last_id)[:options["batch_size"]])
+            if not pics:
+                break
+            last_id = pics[-1].field_pic_id
+
+            updated = []
+            for pic in pics:
+                try:
+                    pic.phash = dhash_file(pic.file_path)
+                except (OSError, ValueError) as e:
+                    failed += 1
+                    self.stderr.write(f"사진 {pic.field_pic_id} 실패: {e}")
+                    continue
+                updated.append(pic)
+            FieldPic.objects.bulk_update(updated, ["phash"])
+            hashed += len(updated)
+            # 앞 묶음에서 해시를 구한 사진도 후보로 읽으므로 묶음 경계와 무관
+            marked += mark_near_duplicates([pic.field_pic_id for pic in updated])
+
+        self.stdout.write(self.style.SUCCESS(f"{hashed}개 사진 해시 계산, 중복 {marked}개 표시, 실패 {failed}개"))
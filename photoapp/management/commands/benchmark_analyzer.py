@@ -0,0 +1,81 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from photoapp import analyzer
+from photoapp.management.commands.fake_analyzer import start_fake_analyzer
+
+
+def _percentile(values, ratio):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * ratio))] if values else 0.0
+
+
+class Command(BaseCommand):
+    help = "분석 서버 클라이언트 처리량 / 실패 처리 비교 (로컬 대체 서버 사용, DB 쓰지 않음)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--photos", type=int, default=2000)
+        parser.add_argument("--batch-size", type=int, default=10)
+        parser.add_argument("--latency", type=float, default=0.02, help="대체 서버 요청당 지연(초)")
+        parser.add_argument("--per-file-latency", type=float, default=0.002)
+        parser.add_argument("--failure-rate", type=float, default=0.05)
+        parser.add_argument("--server-concurrency", type=int, default=4, help="대체 서버 동시 처리 상한 (넘으면 429)")
+
+    def handle(self, *args, **options):
+        server, url = start_fake_analyzer(
+            latency=options["latency"], per_file_latency=options["per_file_latency"],
+            failure_rate=options["failure_rate"], max_concurrency=options["server_concurrency"],
+        )
+        size = options["batch_size"]
+        paths = [f"/data/pics/{i:06d}.jpg" for i in range(options["photos"])]
+        batches = [paths[i:i + size] for i in range(0, len(paths), size)]
+        self.stdout.write(
+            f"사진 {len(paths)}장 / 묶음 {size}장, 대체 서버 실패율 {options['failure_rate']:.0%}, "
+            f"동시 처리 상한 {options['server_concurrency']}"
+        )
+        try:
+            self.run("기존 (requests.post, 재시도 없음)", batches, lambda batch: self.legacy(url, batch))
+            for concurrency in (1, 2, 4, 8):
+                with override_settings(
+                    FIELDPIC_ANALYZER_URL=url, FIELDPIC_ANALYZER_MAX_CONCURRENCY=concurrency,
+                    FIELDPIC_ANALYZER_BACKOFF=0.05,
+                ):
+                    analyzer.close_session()
+                    self.run(f"analyzer 동시 {concurrency}", batches, analyzer.analyze, workers=concurrency)
+        finally:
+            analyzer.close_session()
+            server.shutdown()
+
+    def legacy(self, url, batch):
+        response = requests.post(url, json={"file_paths": batch})
+        if response.status_code != 200:
+            raise analyzer.AnalyzerError(f"status {response.status_code}")
+        return response.json()["results"]
+
+    def run(self, name, batches, send, workers=1):
+        timings, failed = [], 0
+
+        def timed(batch):
+            started = time.perf_counter()
+            try:
+                send(batch)
+                return time.perf_counter() - started, None
+            except analyzer.AnalyzerError as e:
+                return time.perf_counter() - started, e
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for elapsed, error in pool.map(timed, batches):
+                timings.append(elapsed)
+                failed += error is not None
+        total = time.perf_counter() - started
+
+        photos = sum(len(batch) for batch in batches)
+        self.stdout.write(
+            f"{name:<32} {photos / total:8.0f} 장/s  묶음 p50 {_percentile(timings, 0.5) * 1000:6.1f} ms  "
+            f"p95 {_percentile(timings, 0.95) * 1000:6.1f} ms  실패 묶음 {failed}/{len(batches)}"
+        )
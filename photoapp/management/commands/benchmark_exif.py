@@ -0,0 +1,52 @@
+import glob
+import os
+import time
+
+import piexif
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from photoapp.exif import read_exif
+
+
+def _piexif(path):
+    # 이전 방식: 파일 전체를 읽어 모든 IFD(썸네일 포함)를 파싱
+    return piexif.load(path)
+
+
+def _pillow(path):
+    with Image.open(path) as image:
+        return image.getexif().get_ifd(0x8825)
+
+
+class Command(BaseCommand):
+    help = "EXIF 읽기 방식 비교 (piexif.load / Pillow getexif / APP1 전용 read_exif). 예: benchmark_exif ~/drone_jpgs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JPEG 파일이 있는 디렉터리")
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        files = sorted(
+            path for pattern in ("*.jpg", "*.JPG", "*.jpeg", "*.JPEG")
+            for path in glob.glob(os.path.join(options["path"], "**", pattern), recursive=True)
+        )
+        if not files:
+            self.stderr.write("JPEG 파일이 없습니다.")
+            return
+
+        total_mb = sum(os.path.getsize(path) for path in files) / 1024 / 1024
+        self.stdout.write(f"파일 {len(files)}개, {total_mb:.1f} MiB")
+
+        with_gps = sum(1 for path in files if read_exif(path)[0] is not None)
+        self.stdout.write(f"read_exif GPS 인식: {with_gps}/{len(files)}")
+
+        for name, reader in (("piexif.load", _piexif), ("Pillow getexif", _pillow), ("read_exif (APP1)", read_exif)):
+            best = None
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                for path in files:
+                    reader(path)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            self.stdout.write(f"{name:<20} {best / len(files) * 1000:8.3f} ms/파일")
@@ -0,0 +1,28 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from photoapp.models import PicUpload
+from photoapp.resumable import part_path
+
+
+class Command(BaseCommand):
+    help = "FIELDPIC_UPLOAD_EXPIRE_HOURS 동안 완료되지 않은 이어받기 업로드와 임시 파일 삭제 (cron 등으로 주기 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=settings.FIELDPIC_UPLOAD_EXPIRE_HOURS)
+
+    def handle(self, *args, **options):
+        expired = PicUpload.objects.filter(created_at__lt=timezone.now() - timedelta(hours=options["hours"]))
+        count = 0
+        for upload in expired.iterator():
+            try:
+                os.remove(part_path(upload))
+            except FileNotFoundError:
+                pass
+            upload.delete()
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"만료된 업로드 {count}건 삭제"))
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+PESTS = ["담배거세미나방", "배추좀나방", "파밤나방", "진딧물"]
+DISEASES = ["노균병", "무름병", "뿌리혹병"]
+
+
+class FakeAnalyzerHandler(BaseHTTPRequestHandler):
+    """
+    병해충 분석 서버 로컬 대체 서버 (오프라인 테스트/벤치마크용)
+    파일 경로 해시로 결과를 정하므로 같은 사진은 항상 같은 결과
+    failure_rate 확률로 503, max_concurrency를 넘는 동시 요청은 429 + Retry-After
+    """
+    latency = 0.0
+    per_file_latency = 0.0
+    failure_rate = 0.0
+    max_concurrency = 0
+    active = 0
+    hits = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        cls = type(self)
+        with cls.lock:
+            cls.hits += 1
+            cls.active += 1
+            overloaded = cls.max_concurrency and cls.active > cls.max_concurrency
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if overloaded:
+                self.reply(429, {"error": "busy"}, {"Retry-After": "1"})
+                return
+            if random.random() < self.failure_rate:
+                self.reply(503, {"error": "model unavailable"})
+                return
+
+            paths = body.get("file_paths") or []
+            time.sleep(self.latency + self.per_file_latency * len(paths))
+            results = []
+            for path in paths:
+                digest = hashlib.sha256(path.encode("utf-8")).digest()
+                results.append({
+                    "file_path": path,
+                    "pests": [PESTS[digest[0] % len(PESTS)]] if digest[1] % 3 == 0 else [],
+                    "diseases": [DISEASES[digest[2] % len(DISEASES)]] if digest[3] % 4 == 0 else [],
+                })
+            self.reply(200, {"results": results})
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def reply(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_analyzer(port=0, **options):
+    """백그라운드 스레드로 대체 서버 시작 → (server, url), 끝나면 server.shutdown()"""
+    for key, value in options.items():
+        setattr(FakeAnalyzerHandler, key, value)
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeAnalyzerHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/analyze"
+
+
+class Command(BaseCommand):
+    help = "병해충 분석 서버 로컬 대체 서버 실행 (FIELDPIC_ANALYZER_URL=http://127.0.0.1:<port>/analyze 로 지정)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=5099)
+        parser.add_argument("--latency", type=float, default=0.0, help="요청당 응답 지연(초)")
+        parser.add_argument("--per-file-latency", type=float, default=0.0, help="사진 1장당 추가 지연(초)")
+        parser.add_argument("--failure-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+        parser.add_argument("--max-concurrency", type=int, default=0, help="넘으면 429 응답 (0 = 제한 없음)")
+
+    def handle(self, *args, **options):
+        FakeAnalyzerHandler.latency = options["latency"]
+        FakeAnalyzerHandler.per_file_latency = options["per_file_latency"]
+        FakeAnalyzerHandler.failure_rate = options["failure_rate"]
+        FakeAnalyzerHandler.max_concurrency = options["max_concurrency"]
+        server = ThreadingHTTPServer(("127.0.0.1", options["port"]), FakeAnalyzerHandler)
+        self.stdout.write(f"fake analyzer listening on http://127.0.0.1:{options['port']}/analyze")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
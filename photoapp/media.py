@@ -0,0 +1,141 @@
+import mimetypes
+import os
+import re
+import time
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import signing
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.urls import reverse
+
+from .storage import media_path
+
+# 사진 파일 전달: /photo/media/<field_pic_id>/<variant>/?sig=...
+# variant = 'original' 또는 축소본 '<label>.<fmt>' (예: thumb.webp)
+# sig = "<사진 ID>:<발급받은 사용자 ID>:<발급 시각>:<서명>" (FIELDPIC_MEDIA_URL_MAX_AGE 초 뒤 만료)
+# 발급 시각을 FIELDPIC_MEDIA_URL_ROUNDING 초 단위로 내림 → 그 구간 안에서는 URL이 같아 브라우저 캐시가 유지됨
+ORIGINAL = 'original'
+SIGNING_SALT = 'photoapp.media'
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+class MediaSigner(signing.TimestampSigner):
+    def timestamp(self):
+        step = settings.FIELDPIC_MEDIA_URL_ROUNDING
+        return signing.b62_encode(int(time.time()) // step * step)
+
+
+def sign(field_pic_id, viewer_id):
+    return MediaSigner(salt=SIGNING_SALT).sign(f'{field_pic_id}:{viewer_id}')
+
+
+def verify(field_pic_id, token):
+    """서명이 맞고 만료 전이면 URL을 발급받은 사용자 ID, 아니면 None"""
+    if not token:
+        return None
+    try:
+        # 발급 시각을 내림했으므로 그만큼 더 허용
+        value = MediaSigner(salt=SIGNING_SALT).unsign(
+            token, max_age=settings.FIELDPIC_MEDIA_URL_MAX_AGE + settings.FIELDPIC_MEDIA_URL_ROUNDING,
+        )
+    except signing.BadSignature:
+        return None
+    pic_id, _, viewer_id = value.partition(':')
+    if pic_id != str(field_pic_id) or not viewer_id.isdigit():
+        return None
+    return int(viewer_id)
+
+
+def media_url(field_pic_id, viewer_id, variant=ORIGINAL, request=None):
+    """사진 파일 URL (권한을 확인한 응답에서만 발급, viewer_id = 응답을 받는 사용자)"""
+    url = reverse('field-pic-media', args=[field_pic_id, variant]) + f'?sig={sign(field_pic_id, viewer_id)}'
+    return request.build_absolute_uri(url) if request else url
+
+
+def variant_path(pic, variant):
+    """variant → MEDIA_ROOT 기준 상대 경로, 없는 축소본이면 None"""
+    if variant == ORIGINAL:
+        return pic.pic_path or None
+    label, _, fmt = variant.partition('.')
+    return (pic.derivatives or {}).get(label, {}).get(fmt)
+
+
+def parse_range(header, size):
+    """
+    'bytes=0-1023' / 'bytes=1024-' / 'bytes=-1024' → (시작, 끝) (끝 포함)
+    헤더가 없거나 형식이 다르면(여러 구간 포함) None → 전체 전송, 파일 범위 밖이면 ValueError (416)
+    """
+    match = RANGE_RE.match(header or '')
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if not start:  # 끝에서 n바이트
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError('unsatisfiable range')
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as fp:
+        fp.seek(start)
+        while length:
+            chunk = fp.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _django_response(request, path, content_type):
+    # 개발용: Django가 직접 전송, Range는 한 구간만 지원
+    size = os.path.getsize(path)
+    try:
+        byte_range = parse_range(request.headers.get('Range'), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        return FileResponse(open(path, 'rb'), content_type=content_type)
+    start, end = byte_range
+    response = StreamingHttpResponse(_read_range(path, start, end - start + 1), status=206, content_type=content_type)
+    response['Content-Length'] = end - start + 1
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+def serve(request, relative_path, etag):
+    """
+    FIELDPIC_MEDIA_SERVER에 따라 파일 전송을 앞단 웹 서버에 넘기는 응답 (nginx / apache는 Range도 직접 처리)
+    내용 해시 경로라 바뀌지 않으므로 ETag + 긴 Cache-Control
+    """
+    etag = f'"{etag}"'
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+    else:
+        path = media_path(relative_path)
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        server = settings.FIELDPIC_MEDIA_SERVER
+        if server == 'nginx':
+            response = HttpResponse(content_type=content_type)
+            relative = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+            response['X-Accel-Redirect'] = settings.FIELDPIC_MEDIA_ACCEL_PREFIX + quote(relative)
+        elif server == 'apache':
+            response = HttpResponse(content_type=content_type)
+            response['X-Sendfile'] = path
+        elif not os.path.exists(path):
+            return HttpResponse(status=404)
+        else:
+            response = _django_response(request, path, content_type)
+        response['Accept-Ranges'] = 'bytes'
+
+    response['ETag'] = etag
+    # 권한 확인이 필요한 파일이므로 공유 캐시(CDN/프록시)에는 두지 않음
+    response['Cache-Control'] = f'private, max-age={settings.FIELDPIC_MEDIA_MAX_AGE}, immutable'
+    return response
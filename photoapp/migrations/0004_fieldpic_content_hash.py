@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fieldmanage', '0009_field_geometry_wkb'),
+        ('photoapp', '0003_remove_fieldpic_has_disease_remove_fieldpic_has_pest_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fieldpic',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='fieldpic',
+            index=models.Index(fields=['field', 'content_hash'], name='photoapp_fi_field_i_973e2a_idx'),
+        ),
+    ]
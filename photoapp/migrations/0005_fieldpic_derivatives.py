@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photoapp', '0004_fieldpic_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fieldpic',
+            name='derivatives',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:43
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fieldmanage', '0009_field_geometry_wkb'),
+        ('photoapp', '0005_fieldpic_derivatives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PicUpload',
+            fields=[
+                ('upload_id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('pic_name', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('field', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='fieldmanage.field')),
+            ],
+            options={
+                'db_table': 'photoapp_picupload',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:51
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def remove_duplicates(apps, schema_editor):
+    # 같은 사진 + 같은 이름 결과는 가장 먼저 저장된 것만 남김
+    for model_name, name_field in (('PestResult', 'pest_name'), ('DiseaseResult', 'disease_name')):
+        model = apps.get_model('photoapp', model_name)
+        duplicates = (
+            model.objects.values('field_pic_id', name_field)
+            .annotate(keep_id=Min('id'), count=Count('id'))
+            .filter(count__gt=1)
+            .order_by()
+        )
+        for row in duplicates:
+            model.objects.filter(field_pic_id=row['field_pic_id'], **{name_field: row[name_field]}) \
+                .exclude(id=row['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photoapp', '0006_picupload'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='diseaseresult',
+            unique_together={('field_pic', 'disease_name')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='pestresult',
+            unique_together={('field_pic', 'pest_name')},
+        ),
+    ]
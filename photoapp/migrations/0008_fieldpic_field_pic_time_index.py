@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fieldmanage', '0009_field_geometry_wkb'),
+        ('photoapp', '0007_result_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fieldpic',
+            index=models.Index(fields=['field', 'pic_time'], name='photoapp_fi_field_i_bbe3b7_idx'),
+        ),
+    ]
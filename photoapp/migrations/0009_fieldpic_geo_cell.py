@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fieldmanage', '0009_field_geometry_wkb'),
+        ('photoapp', '0008_fieldpic_field_pic_time_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fieldpic',
+            name='geo_cell',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='fieldpic',
+            index=models.Index(fields=['geo_cell', 'pic_time'], name='photoapp_fi_geo_cel_2d995d_idx'),
+        ),
+    ]
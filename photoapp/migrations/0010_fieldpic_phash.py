@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-18 08:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photoapp', '0009_fieldpic_geo_cell'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fieldpic',
+            name='near_duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='near_duplicates', to='photoapp.fieldpic'),
+        ),
+        migrations.AddField(
+            model_name='fieldpic',
+            name='phash',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+import os
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Q
+
+
+def to_relative(apps, schema_editor):
+    # 예전 값: MEDIA_ROOT/pics/ab/cd/<sha>.jpg (절대 경로) 또는 repository/... (BASE_DIR 기준) → MEDIA_ROOT 기준 상대 경로
+    # MEDIA_ROOT 밖의 절대 경로는 그대로 둠 (storage.media_path가 절대 경로도 처리)
+    FieldPic = apps.get_model('photoapp', 'FieldPic')
+    prefixes = [
+        os.path.join(settings.MEDIA_ROOT, ''),
+        os.path.join(os.path.relpath(settings.MEDIA_ROOT, settings.BASE_DIR), ''),
+    ]
+    condition = Q()
+    for prefix in prefixes:
+        condition |= Q(pic_path__startswith=prefix)
+
+    batch = []
+    for pic in FieldPic.objects.filter(condition).only('pic_path').iterator(chunk_size=1000):
+        prefix = next(prefix for prefix in prefixes if pic.pic_path.startswith(prefix))
+        pic.pic_path = pic.pic_path[len(prefix):].replace(os.sep, '/')
+        batch.append(pic)
+        if len(batch) >= 1000:
+            FieldPic.objects.bulk_update(batch, ['pic_path'])
+            batch = []
+    FieldPic.objects.bulk_update(batch, ['pic_path'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photoapp', '0010_fieldpic_phash'),
+    ]
+
+    operations = [
+        migrations.RunPython(to_relative, migrations.RunPython.noop),
+    ]
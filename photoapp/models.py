@@ -1,5 +1,42 @@
+import math
+import uuid
+
 from django.db import models
+from django.db.models import ExpressionWrapper, F, FloatField
 from fieldmanage.models import Field
+from .geo import METERS_PER_DEGREE, bbox_cells_q, geo_cell, radius_bbox
+from .storage import media_path
+
+
+class FieldPicQuerySet(models.QuerySet):
+    def within_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """
+        촬영 위치가 bbox 안인 사진. (geo_cell, pic_time) 인덱스 범위로 후보를 좁힌 뒤 정확한 좌표로 거름
+        범위가 FIELDPIC_GEO_MAX_ROWS 행보다 넓으면 ValueError
+        """
+        if min_lat > max_lat or min_lon > max_lon:
+            raise ValueError('min 값이 max 값보다 큽니다.')
+        cells = bbox_cells_q(min_lat, min_lon, max_lat, max_lon)
+        if cells is None:
+            raise ValueError('조회 범위가 너무 넓습니다.')
+        return self.filter(cells, latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon))
+
+    def within_radius(self, lat, lon, radius):
+        """중심에서 radius(m) 안에서 찍은 사진 (수 km 이내용 등장방형 근사, 거리 계산도 SQL에서)"""
+        dx = (F('longitude') - lon) * math.cos(math.radians(lat))
+        dy = F('latitude') - lat
+        return self.within_bbox(*radius_bbox(lat, lon, radius)).alias(
+            distance2=ExpressionWrapper(dx * dx + dy * dy, output_field=FloatField()),
+        ).filter(distance2__lte=(radius / METERS_PER_DEGREE) ** 2)
+
+    def taken_between(self, start=None, end=None):
+        """start <= pic_time < end (둘 중 하나만 줘도 됨)"""
+        queryset = self
+        if start is not None:
+            queryset = queryset.filter(pic_time__gte=start)
+        if end is not None:
+            queryset = queryset.filter(pic_time__lt=end)
+        return queryset
 
 
 class FieldPic(models.Model):
@@ -7,15 +44,54 @@ class FieldPic(models.Model):
     field = models.ForeignKey(Field, on_delete=models.CASCADE)    
     pic_name = models.CharField(max_length=255)
     pic_path = models.CharField(max_length=300, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True, default='')  # 파일 내용 SHA-256 (중복 업로드 판별)
+    derivatives = models.JSONField(default=dict, blank=True)  # {"thumb": {"webp": 상대 경로, "jpeg": ...}, ...}
+
+    # 저장 전에 EXIF를 이미 읽은 경우(일괄 업로드) True → post_save에서 EXIF 작업 생략 (DB 컬럼 아님)
+    exif_extracted = False
     #metadata로 받는 데이터(위도,경도,찍은시간)
     latitude = models.FloatField(null=True)
     longitude = models.FloatField(null=True)
     pic_time = models.DateTimeField(null=True)
+    geo_cell = models.BigIntegerField(null=True, blank=True)  # 촬영 위치 격자 셀 (photoapp.geo), 위경도와 함께 갱신
+    phash = models.BigIntegerField(null=True, blank=True)  # 지각 해시 dHash (photoapp.phash), 축소본 작업에서 계산
+    # 같은 노지에서 거의 같은 장면을 먼저 찍은 사진. 값이 있으면 분석 서버로 보내지 않음
+    near_duplicate_of = models.ForeignKey(
+        'self', null=True, blank=True, on_delete=models.SET_NULL, related_name='near_duplicates',
+    )
+
+    objects = FieldPicQuerySet.as_manager()
 
 
     class Meta:
         db_table = "photoapp_fieldpic"
+        indexes = [
+            models.Index(fields=['field', 'content_hash']),
+            models.Index(fields=['field', 'pic_time']),  # 노지별 최신(대표) 사진 조회
+            models.Index(fields=['geo_cell', 'pic_time']),  # 위치 + 기간 조회
+        ]
+
+    def save(self, *args, **kwargs):
+        self.geo_cell = geo_cell(self.latitude, self.longitude)
+        super().save(*args, **kwargs)
+
+    @property
+    def file_path(self):
+        """원본 파일의 절대 경로 (pic_path는 MEDIA_ROOT 기준 상대 경로)"""
+        return media_path(self.pic_path)
         
+class PicUpload(models.Model):
+    """이어받기(청크) 업로드 세션. 받은 바이트 수는 DB가 아니라 임시 파일 크기로 판단"""
+    upload_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    field = models.ForeignKey(Field, on_delete=models.CASCADE)
+    pic_name = models.CharField(max_length=255)
+    size = models.BigIntegerField()  # 전체 파일 크기 (byte)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "photoapp_picupload"
+
+
 class PestResult(models.Model):
     field_pic = models.ForeignKey(FieldPic, on_delete=models.CASCADE, related_name='pest_results')
     pest_name = models.CharField(max_length=100)
@@ -23,6 +99,7 @@ class PestResult(models.Model):
 
     class Meta:
         db_table = "pest_result"
+        unique_together = ('field_pic', 'pest_name')  # 분석 재전송 시 중복 방지
 
 class DiseaseResult(models.Model):
     field_pic = models.ForeignKey(FieldPic, on_delete=models.CASCADE, related_name='disease_results')
@@ -31,3 +108,4 @@ class DiseaseResult(models.Model):
 
     class Meta:
         db_table = "disease_result"
+        unique_together = ('field_pic', 'disease_name')
@@ -0,0 +1,139 @@
+import math
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from PIL import Image
+
+from .geo import METERS_PER_DEGREE
+
+# 지각 해시(dHash)로 거의 같은 사진(정지 비행 / 겹치는 경로에서 찍힌 프레임) 찾기
+# 64비트 해시를 FieldPic.phash(부호 있는 BigInteger)에 저장, 비교는 해밍 거리
+HASH_SIZE = 8
+MASK = (1 << HASH_SIZE * HASH_SIZE) - 1
+
+
+def to_signed(value):
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def hamming(a, b):
+    return ((a ^ b) & MASK).bit_count()
+
+
+def dhash(image):
+    """PIL 이미지 → dHash (9x8 흑백으로 줄인 뒤 가로로 이웃한 픽셀 밝기 비교, 부호 있는 64비트 정수)"""
+    pixels = image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BILINEAR).tobytes()
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            value = value << 1 | (pixels[offset + col] > pixels[offset + col + 1])
+    return to_signed(value)
+
+
+def dhash_file(path):
+    with Image.open(path) as image:
+        # JPEG는 1/8 크기로 디코딩 (9x8만 필요)
+        image.draft('L', (HASH_SIZE * 8, HASH_SIZE * 8))
+        return dhash(image)
+
+
+class BKTree:
+    """
+    해밍 거리 BK-tree. 노드 = [해시, 값, {부모와의 거리: 자식 노드}]
+    거리 d 이내 검색 시 삼각부등식으로 |자식 거리 - 현재 노드와의 거리| <= d 인 가지만 내려감
+    """
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value, item):
+        node = [value, item, {}]
+        if self.root is None:
+            self.root = node
+            return
+        current = self.root
+        while True:
+            distance = hamming(value, current[0])
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def search(self, value, max_distance):
+        """[(거리, 값), ...] 가까운 순"""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node_value, item, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= max_distance:
+                found.append((distance, item))
+            stack.extend(
+                child for child_distance, child in children.items()
+                if distance - max_distance <= child_distance <= distance + max_distance
+            )
+        found.sort(key=lambda match: match[0])
+        return found
+
+
+def _close(a, b, window, radius):
+    # 같은 장면: 촬영 시각 차이 window 이내, 둘 다 위치가 있으면 radius(m) 이내
+    if abs(a.pic_time - b.pic_time) > window:
+        return False
+    if None in (a.latitude, a.longitude, b.latitude, b.longitude):
+        return True
+    dx = (a.longitude - b.longitude) * math.cos(math.radians(a.latitude))
+    dy = a.latitude - b.latitude
+    return math.hypot(dx, dy) * METERS_PER_DEGREE <= radius
+
+
+def mark_near_duplicates(field_pic_ids):
+    """
+    해시와 촬영 시각이 있는 사진을 같은 노지 / 촬영 시각 ±FIELDPIC_NEAR_DUPLICATE_WINDOW 초 안의 원본과 비교해
+    해밍 거리 FIELDPIC_NEAR_DUPLICATE_DISTANCE 이하인 가장 가까운 사진을 near_duplicate_of로 기록
+    원본은 (촬영 시각, ID)가 자기보다 앞선 사진만 → 여러 워커가 동시에 판정해도 A→B, B→A 같은 순환이 생기지 않음
+    노지마다 후보를 (field, pic_time) 인덱스로 한 번 읽어 BK-tree를 만들고 사진마다 트리 검색
+    반환값: 중복으로 표시한 사진 수
+    """
+    from .models import FieldPic
+
+    columns = ('field_pic_id', 'field_id', 'phash', 'pic_time', 'latitude', 'longitude', 'near_duplicate_of')
+    pics = FieldPic.objects.filter(
+        pk__in=field_pic_ids, phash__isnull=False, pic_time__isnull=False, near_duplicate_of__isnull=True,
+    ).only(*columns).order_by('pic_time', 'field_pic_id')
+    by_field = defaultdict(list)
+    for pic in pics:
+        by_field[pic.field_id].append(pic)
+
+    window = timedelta(seconds=settings.FIELDPIC_NEAR_DUPLICATE_WINDOW)
+    max_distance = settings.FIELDPIC_NEAR_DUPLICATE_DISTANCE
+    radius = settings.FIELDPIC_NEAR_DUPLICATE_RADIUS
+    marked = []
+    for field_id, group in by_field.items():
+        candidates = FieldPic.objects.filter(
+            field_id=field_id, pic_time__range=(group[0].pic_time - window, group[-1].pic_time + window),
+            phash__isnull=False, near_duplicate_of__isnull=True,
+        ).exclude(pk__in=[pic.pk for pic in group]).only(*columns)
+        tree = BKTree()
+        for candidate in candidates:
+            tree.add(candidate.phash, candidate)
+
+        # 촬영 순서대로: 앞 프레임이 원본으로 트리에 들어가고 뒤 프레임이 그 중복이 됨
+        for pic in group:
+            key = (pic.pic_time, pic.pk)
+            match = next(
+                (original for _, original in tree.search(pic.phash, max_distance)
+                 if (original.pic_time, original.pk) < key and _close(pic, original, window, radius)),
+                None,
+            )
+            if match is None:
+                tree.add(pic.phash, pic)
+            else:
+                pic.near_duplicate_of_id = match.pk
+                marked.append(pic)
+
+    FieldPic.objects.bulk_update(marked, ['near_duplicate_of'])
+    return len(marked)
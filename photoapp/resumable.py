@@ -0,0 +1,68 @@
+import fcntl
+import os
+import re
+
+from django.conf import settings
+
+# 이어받기 업로드: 청크를 MEDIA_ROOT/tmp/uploads/<upload_id>.part 뒤에 이어 붙임
+# 연결이 끊겨도 디스크에 써진 만큼은 남고, 다음 PUT은 그 크기(offset)부터 시작
+UPLOAD_DIR = os.path.join('tmp', 'uploads')
+CHUNK_SIZE = 64 * 1024
+
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+class UploadConflict(Exception):
+    """요청한 시작 위치가 현재 offset과 다르거나 같은 업로드에 다른 PUT이 진행 중"""
+
+
+def part_path(upload):
+    return os.path.join(settings.MEDIA_ROOT, UPLOAD_DIR, f'{upload.upload_id}.part')
+
+
+def create_part(upload):
+    os.makedirs(os.path.dirname(part_path(upload)), exist_ok=True)
+    open(part_path(upload), 'wb').close()
+
+
+def received(upload):
+    """지금까지 받은 바이트 수 (임시 파일이 없으면 None)"""
+    try:
+        return os.path.getsize(part_path(upload))
+    except FileNotFoundError:
+        return None
+
+
+def parse_content_range(value):
+    """'bytes 0-1048575/15728640' → (0, 1048575, 15728640), 형식이 틀리면 None"""
+    match = CONTENT_RANGE_RE.match(value or '')
+    if not match:
+        return None
+    start, end, total = map(int, match.groups())
+    return (start, end, total) if start <= end < total else None
+
+
+def append_chunk(upload, start, length, stream):
+    """
+    stream에서 length 바이트를 CHUNK_SIZE씩 읽어 임시 파일 끝에 붙이고 새 offset 반환
+    start가 현재 offset과 다르면 UploadConflict (클라이언트는 GET으로 offset 확인 후 재시도)
+    """
+    with open(part_path(upload), 'ab') as fp:
+        try:
+            fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadConflict('다른 요청이 같은 업로드를 이어 쓰는 중입니다.')
+
+        offset = fp.tell()
+        if start != offset:
+            raise UploadConflict(f'offset {offset}부터 보내야 합니다.')
+
+        remaining = length
+        while remaining:
+            chunk = stream.read(min(CHUNK_SIZE, remaining))
+            if not chunk:  # 연결 끊김: 여기까지 쓴 만큼만 유지
+                break
+            fp.write(chunk)
+            remaining -= len(chunk)
+        fp.flush()
+        return fp.tell()
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import FieldPic
+from .tasks import enqueue_derivatives, enqueue_exif
+
+
+@receiver(post_save, sender=FieldPic)
+def process_new_pic(sender, instance, created, **kwargs):
+    # EXIF → 축소본/해시 → 중복 판정 → 분석 순으로 이어서 등록 (중복 판정에 촬영 시각/위치 필요)
+    if created and instance.pic_path:
+        if instance.exif_extracted:
+            enqueue_derivatives(instance)
+        else:
+            enqueue_exif(instance)
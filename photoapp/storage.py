@@ -0,0 +1,85 @@
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+
+# 원본 파일명 대신 내용 SHA-256으로 저장: MEDIA_ROOT/pics/ab/cd/abcd....jpg
+# DB(FieldPic.pic_path)에는 MEDIA_ROOT 기준 상대 경로('pics/ab/cd/abcd....jpg')만 저장 → MEDIA_ROOT / 서버가 바뀌어도 그대로
+CONTENT_DIR = 'pics'
+ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.tif', '.tiff', '.heic'}
+
+
+def content_path(digest, extension=''):
+    """digest 앞 4자리로 2단계 샤딩한 상대 경로 (디렉터리당 파일 수 제한)"""
+    return '/'.join((CONTENT_DIR, digest[:2], digest[2:4], digest + extension))
+
+
+def media_path(relative_path):
+    """MEDIA_ROOT 기준 상대 경로 → 파일 시스템 절대 경로 (이전 버전이 저장한 절대 경로는 그대로)"""
+    return os.path.join(settings.MEDIA_ROOT, relative_path)
+
+
+def _extension(filename):
+    extension = os.path.splitext(filename or '')[1].lower()
+    return extension if extension in ALLOWED_EXTENSIONS else ''
+
+
+def store_upload(uploaded_file):
+    """
+    업로드 파일을 임시 파일로 받으면서 같은 루프에서 SHA-256 계산 후 내용 주소 경로로 이동
+    같은 내용이 이미 있으면 임시 파일만 지우고 기존 파일 사용
+    반환값: (digest, MEDIA_ROOT 기준 상대 경로, 새로 저장했는지 여부)
+    """
+    return store_chunks(uploaded_file.chunks(), uploaded_file.name)
+
+
+def store_chunks(chunks, filename):
+    """store_upload와 같지만 bytes 조각 iterable을 받음 (압축 파일 멤버 등)"""
+    tmp_dir = os.path.join(settings.MEDIA_ROOT, 'tmp')  # os.replace가 원자적이도록 같은 파일시스템에 임시 저장
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    sha256 = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            for chunk in chunks:
+                sha256.update(chunk)
+                tmp.write(chunk)
+
+        digest = sha256.hexdigest()
+        relative_path = content_path(digest, _extension(filename))
+        path = media_path(relative_path)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            return digest, relative_path, False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        return digest, relative_path, True
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def store_file(source_path, filename, chunk_size=1024 * 1024):
+    """
+    이미 MEDIA_ROOT 안에 받아둔 파일(이어받기 업로드 등)을 조금씩 읽어 해시한 뒤 내용 주소 경로로 이동
+    메모리에 통째로 올리지 않음, 반환값은 store_upload와 같음
+    """
+    sha256 = hashlib.sha256()
+    with open(source_path, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(chunk_size), b''):
+            sha256.update(chunk)
+
+    digest = sha256.hexdigest()
+    relative_path = content_path(digest, _extension(filename))
+    path = media_path(relative_path)
+    if os.path.exists(path):
+        os.remove(source_path)
+        return digest, relative_path, False
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(source_path, path)
+    return digest, relative_path, True
@@ -1,28 +1,169 @@
 from celery import shared_task
 from django.conf import settings
-import requests
+from django.db import transaction
+from django.utils.timezone import make_aware
 import os
-from datetime import datetime, timedelta
 
-pic_buffer = []
-last_send_time = datetime.now()
+from . import analysis, analyzer
+from .phash import mark_near_duplicates
+
 
 @shared_task
 def enqueue_pic_path_task(photo_id):
-    global pic_buffer, last_send_time
-
-    pic_buffer.append(photo_id)
+    # 이전 버전에서 큐에 남아 있는 메시지 처리용 (새 코드는 축소본 작업 뒤 queue_unflagged_for_analysis)
+    queue_for_analysis([photo_id])
 
-    if len(pic_buffer) >= 10 or (datetime.now() - last_send_time > timedelta(minutes=1)):
-        send_pics_to_flask_task.delay(pic_buffer)
-        pic_buffer = []
-        last_send_time = datetime.now()
 
 @shared_task
 def send_pics_to_flask_task(photo_ids):
-    full_paths = [os.path.join(settings.BASE_DIR, path) for path in pic_paths]
     try:
-        response = requests.post("http://172.26.21.246:5000/analyze", json={"file_paths": full_paths})
-        return response.json()
+        pests, diseases = analyzer.analyze_pics(photo_ids)
+        return {"pests": pests, "diseases": diseases}
+    except analyzer.AnalyzerError as e:
+        return {"error": str(e)}
+
+
+@shared_task
+def flush_analysis_queue(force=False):
+    """
+    Redis 대기 목록을 묶음으로 분석 서버에 전송
+    묶음이 찼을 때(queue_for_analysis)와 Celery beat 주기(CELERY_BEAT_SCHEDULE, 대기 시간 기준)로 실행
+    """
+    try:
+        return analysis.flush(force=force)
+    except analyzer.AnalyzerError as e:
+        # 전송 중 목록에 남아 있으므로 다음 flush에서 다시 보냄
+        print(f"[경고] 분석 서버 전송 실패, 다음 flush에서 재시도: {e}")
+        return 0
+
+
+def queue_for_analysis(photo_ids):
+    """사진 ID를 Redis 대기 목록에 넣고 묶음 크기가 차면 flush 작업 등록"""
+    if photo_ids and analysis.push(photo_ids) >= settings.FIELDPIC_ANALYSIS_BATCH_SIZE:
+        flush_analysis_queue.delay()
+
+
+def queue_unflagged_for_analysis(field_pic_ids):
+    """
+    축소본 작업에서 중복 판정(mark_near_duplicates)을 마친 뒤 호출
+    near-duplicate로 표시된 사진은 빼고 분석 대기 목록에 추가 (Redis 장애 시 경고만 남김)
+    """
+    from .models import FieldPic
+
+    ids = list(
+        FieldPic.objects.filter(pk__in=field_pic_ids, near_duplicate_of__isnull=True)
+        .order_by('field_pic_id')
+        .values_list('field_pic_id', flat=True)
+    )
+    try:
+        queue_for_analysis(ids)
+    except Exception as e:
+        print(f"[경고] 사진 {len(ids)}장 분석 대기 등록 실패: {e}")
+
+
+def _process_pic(field_pic_id):
+    # 축소본 + 지각 해시, 원본 파일이 없으면 False
+    from .derivatives import derivative_name, generate_derivatives
+    from .models import FieldPic
+    from .phash import dhash_file
+
+    pic = FieldPic.objects.filter(pk=field_pic_id).first()
+    if not pic or not pic.pic_path or not os.path.exists(pic.file_path):
+        return False
+    derivatives = generate_derivatives(pic.file_path, derivative_name(pic))
+    # save()를 거치지 않아 post_save가 다시 돌지 않음
+    FieldPic.objects.filter(pk=field_pic_id).update(derivatives=derivatives, phash=dhash_file(pic.file_path))
+    return True
+
+
+@shared_task
+def generate_pic_derivatives(field_pic_id):
+    # 업로드 후 처리 순서: (EXIF) → 축소본 + 해시 → 중복 판정 → 분석 대기 (중복 사진은 분석 서버로 보내지 않음)
+    # Pillow가 못 여는 사진(HEIC, 깨진 JPEG)도 분석 대기에는 반드시 넣음 (축소본은 backfill_pic_derivatives로 다시 생성)
+    try:
+        if _process_pic(field_pic_id):
+            mark_near_duplicates([field_pic_id])
     except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+        print(f"[경고] 사진 {field_pic_id} 축소본 생성 실패: {e}")
+    finally:
+        queue_unflagged_for_analysis([field_pic_id])
+
+
+@shared_task
+def extract_pic_exif(field_pic_id):
+    """업로드 요청 밖에서 EXIF(GPS, 촬영 시각)를 읽어 FieldPic에 반영한 뒤 축소본 작업 등록 (중복 판정에 촬영 시각/위치 필요)"""
+    from .exif import read_exif
+    from .geo import geo_cell
+    from .models import FieldPic
+
+    pic = FieldPic.objects.filter(pk=field_pic_id).only('pic_path').first()
+    if not pic or not pic.pic_path:
+        return
+    latitude, longitude, pic_time = read_exif(pic.file_path)
+    FieldPic.objects.filter(pk=field_pic_id).update(
+        latitude=latitude, longitude=longitude, geo_cell=geo_cell(latitude, longitude),
+        pic_time=make_aware(pic_time) if pic_time else None,
+    )
+    try:
+        generate_pic_derivatives.delay(field_pic_id)
+    except Exception as e:
+        # 축소본/중복 판정은 건너뛰더라도 분석은 빠뜨리지 않음
+        print(f"[경고] 사진 {field_pic_id} 축소본 작업 등록 실패, 분석 대기에 바로 추가: {e}")
+        queue_unflagged_for_analysis([field_pic_id])
+
+
+def enqueue_exif(pic):
+    """커밋 후 EXIF 작업 등록 (축소본 / 분석은 EXIF 작업이 이어서 등록)"""
+    def enqueue():
+        try:
+            extract_pic_exif.delay(pic.field_pic_id)
+        except Exception as e:
+            print(f"[경고] 사진 {pic.field_pic_id} EXIF 작업 등록 실패: {e}")
+
+    transaction.on_commit(enqueue)
+
+
+def enqueue_derivatives(pic):
+    """커밋 후 축소본 생성 작업 등록, 분석은 축소본 작업이 이어서 등록 (broker 장애 시 backfill_pic_derivatives로 나중에 생성)"""
+    def enqueue():
+        try:
+            generate_pic_derivatives.delay(pic.field_pic_id)
+        except Exception as e:
+            print(f"[경고] 사진 {pic.field_pic_id} 축소본 작업 등록 실패: {e}")
+
+    transaction.on_commit(enqueue)
+
+
+@shared_task
+def generate_pic_derivatives_batch(field_pic_ids):
+    # 중복 판정은 묶음 전체를 노지별 BK-tree 하나로, 판정 후 중복이 아닌 사진만 분석 대기
+    processed = []
+    for field_pic_id in field_pic_ids:
+        # 깨진 사진 한 장 때문에 묶음 전체가 실패하지 않도록 (축소본은 backfill_pic_derivatives로 다시 생성)
+        try:
+            if _process_pic(field_pic_id):
+                processed.append(field_pic_id)
+        except Exception as e:
+            print(f"[경고] 사진 {field_pic_id} 축소본 생성 실패: {e}")
+    mark_near_duplicates(processed)
+    queue_unflagged_for_analysis(field_pic_ids)
+
+
+def enqueue_pic_batches(field_pic_ids):
+    """
+    일괄 업로드용: 사진마다 작업을 만들지 않고 FIELDPIC_BULK_TASK_BATCH 개씩 묶어
+    커밋 후 축소본 작업 등록, 분석은 각 묶음 작업이 중복 판정 후 대기 목록에 추가 (EXIF는 업로드 중에 이미 읽음)
+    """
+    size = settings.FIELDPIC_BULK_TASK_BATCH
+    batches = [field_pic_ids[i:i + size] for i in range(0, len(field_pic_ids), size)]
+
+    def enqueue():
+        for batch in batches:
+            try:
+                generate_pic_derivatives_batch.delay(batch)
+            except Exception as e:
+                # broker 장애 시 남은 묶음도 실패하므로 중단 (축소본은 backfill_pic_derivatives로 생성)
+                print(f"[경고] 사진 {len(field_pic_ids)}장 일괄 작업 등록 실패: {e}")
+                return
+
+    transaction.on_commit(enqueue)
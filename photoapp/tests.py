@@ -0,0 +1,965 @@
+import importlib
+import io
+import os
+import random
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+import piexif
+from PIL import Image
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from fieldmanage.models import Field
+from fieldmanage.spatial_index import reset_field_index
+from .models import DiseaseResult, FieldPic, PestResult, PicUpload
+from .exif import read_exif
+from . import analysis, analyzer
+from .phash import BKTree, dhash, hamming, mark_near_duplicates
+from .management.commands.fake_analyzer import FakeAnalyzerHandler, start_fake_analyzer
+from .tasks import (
+    extract_pic_exif, flush_analysis_queue, generate_pic_derivatives, generate_pic_derivatives_batch, queue_for_analysis,
+)
+
+
+def jpeg_bytes(color, size=(8, 8)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+def gps_jpeg_bytes(lat, lon, taken, byte_order='big'):
+    """GPS / DateTimeOriginal이 들어간 JPEG (big = piexif 'MM', little = Pillow 'II')"""
+    def rational(value):
+        minutes, seconds = divmod(abs(value) * 3600, 60)
+        degrees, minutes = divmod(minutes, 60)
+        return ((int(degrees), 1), (int(minutes), 1), (round(seconds * 1000), 1000))
+
+    buffer = io.BytesIO()
+    image = Image.new('RGB', (64, 48), 'green')
+    if byte_order == 'big':
+        exif = piexif.dump({
+            'Exif': {piexif.ExifIFD.DateTimeOriginal: taken.strftime('%Y:%m:%d %H:%M:%S').encode()},
+            'GPS': {
+                piexif.GPSIFD.GPSLatitudeRef: b'N' if lat >= 0 else b'S', piexif.GPSIFD.GPSLatitude: rational(lat),
+                piexif.GPSIFD.GPSLongitudeRef: b'E' if lon >= 0 else b'W', piexif.GPSIFD.GPSLongitude: rational(lon),
+            },
+            'thumbnail': jpeg_bytes('red'),
+        })
+    else:
+        exif = Image.Exif()
+        exif.endian = '<'
+        exif[0x8769] = {0x9003: taken.strftime('%Y:%m:%d %H:%M:%S')}
+        exif[0x8825] = {
+            1: 'N' if lat >= 0 else 'S', 2: tuple(n / d for n, d in rational(lat)),
+            3: 'E' if lon >= 0 else 'W', 4: tuple(n / d for n, d in rational(lon)),
+        }
+    image.save(buffer, format='JPEG', exif=exif)
+    return buffer.getvalue()
+
+
+class ExifReaderTest(TestCase):
+    def test_reads_gps_and_datetime_in_both_byte_orders(self):
+        taken = datetime(2025, 5, 26, 10, 11, 12)
+        for byte_order in ('big', 'little'):
+            with tempfile.NamedTemporaryFile(suffix='.jpg') as tmp:
+                tmp.write(gps_jpeg_bytes(34.8123, -126.3945, taken, byte_order))
+                tmp.flush()
+                lat, lon, pic_time = read_exif(tmp.name)
+            self.assertAlmostEqual(lat, 34.8123, places=5)
+            self.assertAlmostEqual(lon, -126.3945, places=5)
+            self.assertEqual(pic_time, taken)
+
+    def test_missing_exif(self):
+        with tempfile.NamedTemporaryFile(suffix='.jpg') as tmp:
+            tmp.write(jpeg_bytes('red'))
+            tmp.flush()
+            self.assertEqual(read_exif(tmp.name), (None, None, None))
+
+
+class FieldPicTestCase(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        user = User.objects.create_user(email='pic@test.com', password='pw', username='pic')
+        self.field = Field.objects.create(
+            field_name='노지', field_address='전라남도 목포시', field_area=100.0,
+            crop_name='배추', description='', owner=user,
+        )
+        self.client = APIClient()
+
+    def upload(self, name, content):
+        return self.client.post('/photo/upload/', {
+            'field_id': self.field.field_id,
+            'pic_path': SimpleUploadedFile(name, content, content_type='image/jpeg'),
+        }, format='multipart')
+
+
+class UploadFieldPicTest(FieldPicTestCase):
+    def test_duplicate_upload_reuses_existing_pic(self):
+        content = jpeg_bytes('red')
+        first = self.upload('DJI_0001.JPG', content).data['data']
+        second = self.upload('DJI_0001 (1).JPG', content).data['data']
+
+        self.assertFalse(first['duplicate'])
+        self.assertTrue(second['duplicate'])
+        self.assertEqual(first['id'], second['id'])
+        self.assertEqual(FieldPic.objects.count(), 1)
+
+        digest = first['content_hash']
+        self.assertTrue(first['pic_path'].endswith(os.path.join('pics', digest[:2], digest[2:4], digest + '.jpg')))
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'tmp')), [])
+
+    def test_same_name_different_content_is_kept(self):
+        first = self.upload('DJI_0001.JPG', jpeg_bytes('red')).data['data']
+        second = self.upload('DJI_0001.JPG', jpeg_bytes('blue')).data['data']
+
+        self.assertNotEqual(first['pic_path'], second['pic_path'])
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, first['pic_path'])))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, second['pic_path'])))
+
+    def test_derivatives_are_generated_after_upload(self):
+        with mock.patch('photoapp.tasks.generate_pic_derivatives.delay') as delay, \
+                mock.patch('photoapp.tasks.extract_pic_exif.delay') as exif:
+            with self.captureOnCommitCallbacks(execute=True):
+                data = self.upload('DJI_0002.JPG', jpeg_bytes('green', size=(2000, 1500))).data['data']
+            exif.assert_called_once_with(data['id'])
+            delay.assert_not_called()  # EXIF 작업이 끝난 뒤 등록
+            extract_pic_exif(data['id'])
+        delay.assert_called_once_with(data['id'])
+
+        with mock.patch('photoapp.tasks.queue_for_analysis'):
+            generate_pic_derivatives(data['id'])
+        derivatives = FieldPic.objects.get(pk=data['id']).derivatives
+        self.assertEqual(set(derivatives), {'thumb', 'preview'})
+        with Image.open(os.path.join(self.media_root, derivatives['thumb']['webp'])) as thumb:
+            self.assertEqual(thumb.format, 'WEBP')
+            self.assertEqual(thumb.size, (256, 192))
+        with Image.open(os.path.join(self.media_root, derivatives['preview']['jpeg'])) as preview:
+            self.assertEqual(preview.size, (1024, 768))
+
+        self.client.force_authenticate(user=self.field.owner)
+        field = self.client.get('/field/fields/').data[0]
+        self.assertIn(f"/photo/media/{data['id']}/thumb.jpeg/?sig=", field['thumbnails']['thumb']['jpeg'])
+
+    def test_backfill_uses_process_pool(self):
+        for color in ('red', 'blue', 'white'):
+            self.upload(f'{color}.jpg', jpeg_bytes(color, size=(600, 400)))
+        self.assertFalse(FieldPic.objects.exclude(derivatives={}).exists())
+
+        call_command('backfill_pic_derivatives', workers=2, stdout=io.StringIO())
+        self.assertEqual(FieldPic.objects.filter(derivatives={}).count(), 0)
+
+    def test_exif_is_extracted_outside_the_request(self):
+        content = gps_jpeg_bytes(34.8123, 126.3945, datetime(2025, 5, 26, 10, 11, 12))
+        with mock.patch('photoapp.tasks.extract_pic_exif.delay') as delay, \
+                mock.patch('photoapp.tasks.generate_pic_derivatives.delay'):
+            with self.captureOnCommitCallbacks(execute=True):
+                data = self.upload('DJI_0003.JPG', content).data['data']
+        self.assertIsNone(data['latitude'])
+        delay.assert_called_once_with(data['id'])
+
+        with mock.patch('photoapp.tasks.generate_pic_derivatives.delay') as derivatives:
+            extract_pic_exif(data['id'])
+        derivatives.assert_called_once_with(data['id'])
+        pic = FieldPic.objects.get(pk=data['id'])
+        self.assertAlmostEqual(pic.latitude, 34.8123, places=5)
+        self.assertAlmostEqual(pic.longitude, 126.3945, places=5)
+        self.assertEqual(pic.pic_time.year, 2025)
+
+
+@override_settings(FIELDPIC_BULK_TASK_BATCH=2)
+class BulkUploadFieldPicTest(FieldPicTestCase):
+    def bulk_upload(self, **files):
+        with mock.patch('photoapp.tasks.generate_pic_derivatives_batch.delay') as derivatives, \
+                mock.patch('photoapp.tasks.queue_for_analysis') as analyze:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post('/photo/upload/bulk/', {
+                    'field_id': self.field.field_id, **files,
+                }, format='multipart')
+        return response, derivatives, analyze
+
+    def flight(self):
+        taken = datetime(2025, 5, 26, 10, 0, 0)
+        return [
+            (f'flight/DJI_{i:04d}.JPG', gps_jpeg_bytes(34.81 + i / 1000, 126.39, taken.replace(second=i)))
+            for i in range(5)
+        ]
+
+    def test_multiple_files(self):
+        existing = self.upload('DJI_0000.JPG', self.flight()[0][1]).data['data']
+        pics = [SimpleUploadedFile(os.path.basename(name), content) for name, content in self.flight()]
+        pics.append(SimpleUploadedFile('DJI_0001_copy.JPG', self.flight()[1][1]))
+        pics.append(SimpleUploadedFile('flight.log', b'log'))
+
+        response, derivatives, analyze = self.bulk_upload(pics=pics)
+        data = response.data['data']
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data['created'], 4)
+        self.assertEqual(sorted(data['duplicates']), ['DJI_0000.JPG', 'DJI_0001_copy.JPG'])
+        self.assertEqual(data['skipped'], ['flight.log'])
+        self.assertEqual(FieldPic.objects.filter(field=self.field).count(), 5)
+
+        # EXIF는 업로드 중에 읽어 바로 채움
+        pic = FieldPic.objects.get(pk=data['pics'][0]['id'])
+        self.assertAlmostEqual(pic.latitude, 34.811, places=5)
+        self.assertEqual(pic.pic_time.second, 1)
+
+        # 새 사진 4장 → 2장씩 묶어 작업 2번, 기존 사진은 다시 처리하지 않음
+        ids = [pic['id'] for pic in data['pics']]
+        self.assertNotIn(existing['id'], ids)
+        self.assertEqual([call.args[0] for call in derivatives.call_args_list], [ids[:2], ids[2:]])
+        analyze.assert_not_called()  # 분석은 축소본 묶음 작업이 중복 판정 후 등록
+
+    def test_zip_and_tar_archives(self):
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, 'w') as zf:
+            for name, content in self.flight()[:3]:
+                zf.writestr(name, content)
+            zf.writestr('__MACOSX/flight/._DJI_0000.JPG', b'resource fork')
+        response, _, _ = self.bulk_upload(archive=SimpleUploadedFile('flight.zip', zip_buffer.getvalue()))
+        self.assertEqual(response.data['data']['created'], 3)
+        self.assertEqual(response.data['data']['skipped'], ['__MACOSX/flight/._DJI_0000.JPG'])
+
+        tar_buffer = io.BytesIO()
+        with tarfile.open(fileobj=tar_buffer, mode='w:gz') as tf:
+            for name, content in self.flight():
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                tf.addfile(info, io.BytesIO(content))
+        response, _, _ = self.bulk_upload(archive=SimpleUploadedFile('flight.tar.gz', tar_buffer.getvalue()))
+        self.assertEqual(response.data['data']['created'], 2)
+        self.assertEqual(len(response.data['data']['duplicates']), 3)
+        self.assertEqual(
+            sorted(FieldPic.objects.filter(field=self.field).values_list('pic_name', flat=True)),
+            [f'DJI_{i:04d}.JPG' for i in range(5)],
+        )
+
+    def test_invalid_archive(self):
+        response, _, _ = self.bulk_upload(archive=SimpleUploadedFile('flight.zip', b'not a zip'))
+        self.assertEqual(response.status_code, 400)
+        response, _, _ = self.bulk_upload()
+        self.assertEqual(response.status_code, 400)
+
+    def test_archive_size_limits_clean_up_stored_files(self):
+        flight = self.flight()[:3]
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, 'w') as zf:
+            for name, content in flight:
+                zf.writestr(name, content)
+        size = max(len(content) for _, content in flight)
+
+        def stored_files():
+            return [name for _, _, names in os.walk(os.path.join(self.media_root, 'pics')) for name in names]
+
+        with override_settings(FIELDPIC_UPLOAD_MAX_SIZE=size - 1):
+            response, _, _ = self.bulk_upload(archive=SimpleUploadedFile('flight.zip', zip_buffer.getvalue()))
+        self.assertEqual(response.status_code, 413)
+
+        # 두 장을 저장한 뒤 세 번째에서 전체 크기 초과 → 이미 저장한 파일도 정리
+        with override_settings(FIELDPIC_ARCHIVE_MAX_SIZE=size * 2 + 1):
+            response, _, _ = self.bulk_upload(archive=SimpleUploadedFile('flight.zip', zip_buffer.getvalue()))
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(FieldPic.objects.exists())
+        self.assertEqual(stored_files(), [])
+
+    def test_unreadable_single_upload_is_still_queued_for_analysis(self):
+        with mock.patch('photoapp.tasks.extract_pic_exif.delay', side_effect=extract_pic_exif), \
+                mock.patch('photoapp.tasks.generate_pic_derivatives.delay', side_effect=generate_pic_derivatives), \
+                mock.patch('photoapp.tasks.queue_for_analysis') as analyze:
+            with self.captureOnCommitCallbacks(execute=True):
+                heic = self.upload('IMG_0001.heic', b'ftypheic not decodable by Pillow').data['data']
+        analyze.assert_called_once_with([heic['id']])
+        self.assertEqual(FieldPic.objects.get(pk=heic['id']).derivatives, {})
+
+        # 축소본 작업 등록이 실패해도 분석 대기에는 추가
+        with mock.patch('photoapp.tasks.extract_pic_exif.delay'):
+            with self.captureOnCommitCallbacks(execute=True):
+                data = self.upload('DJI_0001.JPG', jpeg_bytes('red')).data['data']
+        with mock.patch('photoapp.tasks.generate_pic_derivatives.delay', side_effect=ConnectionError('broker down')), \
+                mock.patch('photoapp.tasks.queue_for_analysis') as analyze:
+            extract_pic_exif(data['id'])
+        analyze.assert_called_once_with([data['id']])
+
+    def test_broken_pic_does_not_fail_the_batch(self):
+        response, derivatives, _ = self.bulk_upload(pics=[
+            SimpleUploadedFile(os.path.basename(name), content) for name, content in self.flight()[:2]
+        ])
+        ids = [pic['id'] for pic in response.data['data']['pics']]
+        with open(FieldPic.objects.get(pk=ids[0]).file_path, 'wb') as fp:
+            fp.write(b'not a jpeg')
+
+        with mock.patch('photoapp.tasks.queue_for_analysis') as analyze:
+            generate_pic_derivatives_batch(ids)
+        self.assertEqual(FieldPic.objects.get(pk=ids[0]).derivatives, {})
+        self.assertNotEqual(FieldPic.objects.get(pk=ids[1]).derivatives, {})
+        analyze.assert_called_once_with(ids)
+
+
+class ResumableUploadTest(FieldPicTestCase):
+    def start(self, content, name='DJI_0100.JPG'):
+        response = self.client.post('/photo/upload/resumable/', {
+            'field_id': self.field.field_id, 'pic_name': name, 'size': len(content),
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['upload_id']
+
+    def put(self, upload_id, content, start, end):
+        return self.client.generic(
+            'PUT', f'/photo/upload/resumable/{upload_id}/', content[start:end + 1],
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{len(content)}',
+        )
+
+    def test_resume_after_interruption(self):
+        content = gps_jpeg_bytes(34.8123, 126.3945, datetime(2025, 5, 26, 10, 11, 12))
+        upload_id = self.start(content)
+        half = len(content) // 2
+
+        self.assertEqual(self.put(upload_id, content, 0, half - 1).data['offset'], half)
+        # 끊긴 뒤: offset 확인 → 이미 받은 구간을 다시 보내면 409 + 현재 offset
+        self.assertEqual(self.client.get(f'/photo/upload/resumable/{upload_id}/').data['offset'], half)
+        conflict = self.put(upload_id, content, 0, half - 1)
+        self.assertEqual(conflict.status_code, 409)
+        self.assertEqual(conflict.data['offset'], half)
+
+        incomplete = self.client.post(f'/photo/upload/resumable/{upload_id}/complete/')
+        self.assertEqual(incomplete.status_code, 409)
+
+        self.assertEqual(self.put(upload_id, content, half, len(content) - 1).data['offset'], len(content))
+        with mock.patch('photoapp.tasks.extract_pic_exif.delay') as exif, \
+                mock.patch('photoapp.tasks.generate_pic_derivatives.delay'):
+            with self.captureOnCommitCallbacks(execute=True):
+                data = self.client.post(f'/photo/upload/resumable/{upload_id}/complete/').data['data']
+        exif.assert_called_once_with(data['id'])
+
+        pic = FieldPic.objects.get(pk=data['id'])
+        self.assertEqual(pic.pic_name, 'DJI_0100.JPG')
+        with open(pic.file_path, 'rb') as fp:
+            self.assertEqual(fp.read(), content)
+        self.assertFalse(PicUpload.objects.exists())
+        self.assertEqual(self.client.get(f'/photo/upload/resumable/{upload_id}/').status_code, 404)
+
+        # 같은 사진을 다시 이어받기로 올리면 기존 FieldPic 반환
+        upload_id = self.start(content)
+        self.put(upload_id, content, 0, len(content) - 1)
+        again = self.client.post(f'/photo/upload/resumable/{upload_id}/complete/').data['data']
+        self.assertTrue(again['duplicate'])
+        self.assertEqual(again['id'], data['id'])
+
+    def test_invalid_requests(self):
+        content = jpeg_bytes('red')
+        upload_id = self.start(content)
+        response = self.client.put(
+            f'/photo/upload/resumable/{upload_id}/', content, content_type='application/octet-stream',
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/photo/upload/resumable/', {
+            'field_id': self.field.field_id, 'pic_name': 'big.jpg', 'size': 10 ** 12,
+        }, format='json')
+        self.assertEqual(response.status_code, 413)
+
+    def test_cleanup_expired_uploads(self):
+        upload_id = self.start(jpeg_bytes('red'))
+        PicUpload.objects.update(created_at=datetime(2020, 1, 1, tzinfo=timezone.utc))
+        call_command('cleanup_pic_uploads', stdout=io.StringIO())
+        self.assertFalse(PicUpload.objects.filter(pk=upload_id).exists())
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'tmp', 'uploads')), [])
+
+
+class FakeRedis:
+    """분석 대기열이 쓰는 명령만 흉내 낸 메모리 Redis (테스트 환경에 Redis 서버 없음)"""
+    def __init__(self):
+        self.data = {}
+
+    def _encode(self, value):
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(self._encode(value) for value in values)
+        return len(self.data[key])
+
+    def llen(self, key):
+        return len(self.data.get(key, []))
+
+    def lindex(self, key, index):
+        values = self.data.get(key, [])
+        return values[index] if -len(values) <= index < len(values) else None
+
+    def lrange(self, key, start, end):
+        values = self.data.get(key, [])
+        return values[start:None if end == -1 else end + 1]
+
+    def lmove(self, source, destination, where_from, where_to):
+        if not self.data.get(source):
+            return None
+        value = self.data[source].pop(0 if where_from == 'LEFT' else -1)
+        target = self.data.setdefault(destination, [])
+        target.insert(len(target) if where_to == 'RIGHT' else 0, value)
+        return value
+
+    def lrem(self, key, count, value):
+        values = self.data.get(key, [])
+        if value in values:
+            values.remove(value)
+            return 1
+        return 0
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = self._encode(value)
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(self._encode(field))
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update({self._encode(k): self._encode(v) for k, v in mapping.items()})
+
+    def hincrby(self, key, field, amount=1):
+        values = self.data.setdefault(key, {})
+        values[self._encode(field)] = self._encode(int(values.get(self._encode(field), 0)) + amount)
+
+    def pipeline(self, transaction=True):
+        redis_ = self
+
+        class Pipeline:
+            def __init__(self):
+                self.calls = []
+
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+            def execute(self):
+                return [getattr(redis_, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+        return Pipeline()
+
+
+class FakeAnalyzerTestCase(FieldPicTestCase):
+    """로컬 대체 분석 서버(fake_analyzer)를 띄우고 FIELDPIC_ANALYZER_URL을 그쪽으로 돌림"""
+    def setUp(self):
+        super().setUp()
+        self.server, url = start_fake_analyzer(latency=0.0, per_file_latency=0.0, failure_rate=0.0, max_concurrency=0)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        FakeAnalyzerHandler.hits = 0
+        override = override_settings(FIELDPIC_ANALYZER_URL=url, FIELDPIC_ANALYZER_BACKOFF=0.0)
+        override.enable()
+        self.addCleanup(override.disable)
+        analyzer.close_session()
+        self.addCleanup(analyzer.close_session)
+
+        self.pics = [
+            FieldPic.objects.create(field=self.field, pic_name=f'{i}.jpg', pic_path=f'/data/{i}.jpg') for i in range(5)
+        ]
+        self.ids = [pic.field_pic_id for pic in self.pics]
+
+    def expected_count(self):
+        # 대체 서버 결과는 파일 경로로 정해지므로 다시 물어봐서 기대값 계산
+        results = analyzer.analyze([os.path.join(settings.BASE_DIR, pic.pic_path) for pic in self.pics])
+        return sum(len(result['pests']) + len(result['diseases']) for result in results)
+
+    def result_count(self):
+        return PestResult.objects.count() + DiseaseResult.objects.count()
+
+
+class AnalyzerClientTest(FakeAnalyzerTestCase):
+    def test_results_are_stored_once(self):
+        expected = analyzer.analyze([os.path.join(settings.BASE_DIR, pic.pic_path) for pic in self.pics])
+        pests = sum(len(set(result['pests'])) for result in expected)
+        diseases = sum(len(set(result['diseases'])) for result in expected)
+
+        self.assertEqual(analyzer.analyze_pics(self.ids), (pests, diseases))
+        # 같은 사진을 다시 분석해도 결과가 두 배가 되지 않음
+        self.assertEqual(analyzer.analyze_pics(self.ids), (0, 0))
+        self.assertEqual((PestResult.objects.count(), DiseaseResult.objects.count()), (pests, diseases))
+
+    @override_settings(FIELDPIC_ANALYZER_RETRIES=2)
+    def test_retries_then_fails(self):
+        FakeAnalyzerHandler.failure_rate = 1.0
+        with self.assertRaises(analyzer.AnalyzerError):
+            analyzer.analyze_pics(self.ids)
+        self.assertEqual(FakeAnalyzerHandler.hits, 3)
+        self.assertEqual(self.result_count(), 0)
+
+    def test_concurrency_cap(self):
+        # 대체 서버는 동시 2개까지만 받음 → 클라이언트 상한 2면 429 없이 처리
+        FakeAnalyzerHandler.max_concurrency = 2
+        FakeAnalyzerHandler.latency = 0.05
+        with override_settings(FIELDPIC_ANALYZER_MAX_CONCURRENCY=2), \
+                mock.patch('photoapp.analyzer._backoff', return_value=0) as backoff:
+            analyzer.close_session()
+            outcomes = analyzer.analyze_many([[f'/data/{i}.jpg'] for i in range(6)])
+        self.assertTrue(all(isinstance(outcome, list) for outcome in outcomes))
+        backoff.assert_not_called()
+        self.assertEqual(FakeAnalyzerHandler.hits, 6)
+
+
+@override_settings(FIELDPIC_ANALYSIS_BATCH_SIZE=3, FIELDPIC_ANALYSIS_MAX_WAIT=60, FIELDPIC_ANALYZER_MAX_CONCURRENCY=2)
+class AnalysisQueueTest(FakeAnalyzerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.redis = FakeRedis()
+        patcher = mock.patch('photoapp.analysis.get_redis', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_flush_on_size_and_age(self):
+        with mock.patch('photoapp.tasks.flush_analysis_queue.delay') as flush_delay:
+            queue_for_analysis(self.ids[:2])
+            flush_delay.assert_not_called()
+            queue_for_analysis(self.ids[2:])
+            flush_delay.assert_called_once_with()
+
+        # 3장 묶음 하나 전송, 남은 2장은 아직 MAX_WAIT 전이라 대기
+        self.assertEqual(flush_analysis_queue(), 3)
+        self.assertEqual(FakeAnalyzerHandler.hits, 1)
+        self.assertEqual(self.redis.llen(analysis.PENDING_KEY), 2)
+
+        with mock.patch('photoapp.analysis.time.time', return_value=time.time() + 61):
+            self.assertEqual(flush_analysis_queue(), 2)
+        self.assertEqual(FakeAnalyzerHandler.hits, 2)
+        self.assertEqual(self.result_count(), self.expected_count())
+
+        metrics = analysis.metrics()
+        self.assertEqual((metrics['pending'], metrics['inflight']), (0, 0))
+        self.assertEqual((metrics['batches'], metrics['photos'], metrics['last_batch_size']), (2, 5, 2))
+        self.assertGreaterEqual(metrics['max_latency_ms'], 61000)
+
+    def test_failed_batch_is_resent(self):
+        analysis.push(self.ids[:3])
+        FakeAnalyzerHandler.failure_rate = 1.0
+        with override_settings(FIELDPIC_ANALYZER_RETRIES=0):
+            self.assertEqual(flush_analysis_queue(), 0)
+        # 전송 실패한 묶음은 전송 중 목록에 남고 lock은 풀림
+        self.assertEqual(self.redis.llen(analysis.INFLIGHT_KEY), 3)
+        self.assertIsNone(self.redis.get(analysis.LOCK_KEY))
+
+        FakeAnalyzerHandler.failure_rate = 0.0
+        analysis.push(self.ids[3:])
+        self.assertEqual(flush_analysis_queue(force=True), 5)
+        self.assertEqual((self.redis.llen(analysis.INFLIGHT_KEY), self.redis.llen(analysis.PENDING_KEY)), (0, 0))
+        self.assertEqual(self.result_count(), self.expected_count())
+        self.assertEqual(analysis.metrics()['failures'], 1)
+
+    def test_flush_is_skipped_while_locked(self):
+        analysis.push(self.ids)
+        self.redis.set(analysis.LOCK_KEY, 'other')
+        self.assertEqual(flush_analysis_queue(force=True), 0)
+        self.assertEqual(FakeAnalyzerHandler.hits, 0)
+
+    def test_upload_queues_analysis_after_derivatives(self):
+        with mock.patch('photoapp.tasks.extract_pic_exif.delay', side_effect=extract_pic_exif), \
+                mock.patch('photoapp.tasks.generate_pic_derivatives.delay') as derivatives:
+            with self.captureOnCommitCallbacks(execute=True):
+                data = self.upload('DJI_0200.JPG', jpeg_bytes('blue')).data['data']
+        self.assertEqual(self.redis.llen(analysis.PENDING_KEY), 0)
+
+        generate_pic_derivatives(*derivatives.call_args.args)
+        self.assertEqual(self.redis.lindex(analysis.PENDING_KEY, -1).split(b':')[0], str(data['id']).encode())
+
+
+@override_settings(FIELDPIC_ANALYZER_CALLBACK_TOKEN='secret')
+class AnalysisResultIngestTest(FieldPicTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pics = [
+            FieldPic.objects.create(field=self.field, pic_name=f'{i}.jpg', pic_path=f'/data/{i}.jpg') for i in range(3)
+        ]
+
+    def post(self, results, token='secret'):
+        return self.client.post(
+            '/photo/analysis/results/', {'results': results}, format='json', HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+
+    def test_batch_is_idempotent(self):
+        results = [
+            {'field_pic_id': self.pics[0].pk, 'pests': ['진딧물', '파밤나방'], 'diseases': ['노균병']},
+            {'field_pic_id': self.pics[1].pk, 'pests': ['진딧물', '진딧물']},
+            {'field_pic_id': 999999, 'pests': ['진딧물']},
+        ]
+        with self.assertNumQueries(7):  # FieldPic 확인 1 + (기존 조회 1 + insert 1) x 2 + savepoint 2
+            data = self.post(results).data['data']
+        self.assertEqual((data['pest'], data['disease'], data['duplicates']), (3, 1, 1))
+        self.assertEqual(data['unknown_field_pic_ids'], [999999])
+
+        # 분석 서버 재시도: 같은 결과를 다시 보내도 그대로
+        results.append({'field_pic_id': self.pics[2].pk, 'diseases': ['무름병']})
+        data = self.post(results).data['data']
+        self.assertEqual((data['pest'], data['disease'], data['duplicates']), (0, 1, 5))
+        self.assertEqual(PestResult.objects.count(), 3)
+        self.assertEqual(DiseaseResult.objects.count(), 2)
+
+    def test_response_path_keeps_callback_results(self):
+        self.post([{'field_pic_id': self.pics[0].pk, 'pests': ['진딧물'], 'diseases': ['노균병']}])
+        pics = {pic.file_path: pic for pic in self.pics[:1]}
+        stored = analyzer.store_results([{'file_path': self.pics[0].file_path, 'pests': ['진딧물', '파밤나방']}], pics)
+
+        self.assertEqual(stored, (1, 0))
+        self.assertEqual(
+            sorted(PestResult.objects.filter(field_pic=self.pics[0]).values_list('pest_name', flat=True)),
+            ['진딧물', '파밤나방'],
+        )
+        self.assertTrue(DiseaseResult.objects.filter(field_pic=self.pics[0], disease_name='노균병').exists())
+
+    def test_rejects_bad_token_and_payload(self):
+        self.assertEqual(self.post([], token='wrong').status_code, 403)
+        with override_settings(FIELDPIC_ANALYZER_CALLBACK_TOKEN=''):
+            self.assertEqual(self.post([], token='').status_code, 403)
+        self.assertEqual(self.post([{'field_pic_id': '1', 'pests': ['진딧물']}]).status_code, 400)
+        self.assertEqual(self.post([{'field_pic_id': self.pics[0].pk, 'pests': 'x' * 101}]).status_code, 400)
+        with override_settings(FIELDPIC_ANALYSIS_RESULT_MAX=1):
+            response = self.post([{'field_pic_id': self.pics[0].pk, 'pests': ['a', 'b']}])
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(PestResult.objects.exists())
+
+
+class FieldSummaryTest(FieldPicTestCase):
+    def test_cover_is_latest_pic_in_one_query(self):
+        other = Field.objects.create(
+            field_name='빈 노지', field_address='전라남도 목포시', field_area=10.0,
+            crop_name='무', description='', owner=self.field.owner,
+        )
+        FieldPic.objects.bulk_create([
+            FieldPic(field=self.field, pic_name=f'{day}.jpg', pic_path=f'pics/{day}.jpg',
+                     pic_time=datetime(2025, 5, day, tzinfo=timezone.utc))
+            for day in (3, 9, 1)
+        ] + [FieldPic(field=self.field, pic_name='no-exif.jpg', pic_path='pics/no-exif.jpg')])
+        FieldPic.objects.filter(pic_name='9.jpg').update(
+            derivatives={'thumb': {'webp': 'derived/9_thumb.webp'}},
+        )
+
+        self.client.force_authenticate(user=self.field.owner)
+        with self.assertNumQueries(1):
+            data = self.client.get('/photo/summary/').data
+        self.assertEqual([item['field_id'] for item in data], [self.field.field_id, other.field_id])
+        latest = FieldPic.objects.get(pic_name='9.jpg')
+        self.assertIn(f'/photo/media/{latest.pk}/original/?sig=', data[0]['image_url'])
+        self.assertIn(f'/photo/media/{latest.pk}/thumb.webp/?sig=', data[0]['thumbnails']['thumb']['webp'])
+        self.assertIsNone(data[1]['image_url'])
+        self.assertIsNone(data[1]['thumbnails'])
+
+    def test_scoped_to_requesting_user(self):
+        self.assertEqual(self.client.get('/photo/summary/', {'user_id': self.field.owner_id}).status_code, 401)
+
+        stranger = User.objects.create_user(email='stranger@test.com', password='pw', username='stranger')
+        self.client.force_authenticate(user=stranger)
+        self.assertEqual(self.client.get('/photo/summary/').data, [])
+        self.assertEqual(self.client.get('/photo/summary/', {'user_id': self.field.owner_id}).status_code, 403)
+        self.assertEqual(self.client.get('/photo/summary/', {'user_id': 'abc'}).status_code, 400)
+
+
+class FieldPicSearchTest(FieldPicTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.field.owner)
+
+    def pic(self, name, lat, lon, day=1, field=None):
+        return FieldPic.objects.create(
+            field=field or self.field, pic_name=name, pic_path=f'pics/{name}',
+            latitude=lat, longitude=lon, pic_time=datetime(2025, 5, day, tzinfo=timezone.utc),
+        )
+
+    def search(self, **params):
+        return self.client.get('/photo/search/', params)
+
+    def test_radius_only_own_pics(self):
+        other_user = User.objects.create_user(email='other@test.com', password='pw', username='other')
+        other = Field.objects.create(
+            field_name='남의 노지', field_address='전라남도 목포시', field_area=10.0,
+            crop_name='무', description='', owner=other_user,
+        )
+        self.pic('center.jpg', 34.81, 126.39)
+        self.pic('north-50m.jpg', 34.81045, 126.39)
+        self.pic('east-300m.jpg', 34.81, 126.3933)
+        self.pic('other.jpg', 34.81, 126.39, field=other)
+        FieldPic.objects.create(field=self.field, pic_name='no-gps.jpg', pic_path='pics/no-gps.jpg')
+
+        response = self.search(lat=34.81, lon=126.39, radius=100)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['pic_name'] for item in response.data['results']], ['north-50m.jpg', 'center.jpg'])
+        self.assertIsNone(response.data['next_cursor'])
+
+    def test_field_polygon_time_window_and_pages(self):
+        # 직각삼각형 노지: bbox 안이지만 빗변 바깥인 사진은 제외
+        self.field.geometry = {'type': 'Polygon', 'coordinates': [
+            [[126.39, 34.81], [126.40, 34.81], [126.39, 34.82], [126.39, 34.81]],
+        ]}
+        self.field.save()
+        for day in (1, 2, 3, 4):
+            self.pic(f'inside-{day}.jpg', 34.812, 126.392, day=day)
+        self.pic('outside-triangle.jpg', 34.819, 126.399, day=2)
+
+        names, cursor = [], None
+        while True:
+            params = {'field_id': self.field.field_id, 'start': '2025-05-02T00:00:00', 'end': '2025-05-04T00:00:00', 'page_size': 1}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.search(**params).data
+            names += [item['pic_name'] for item in data['results']]
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(names, ['inside-3.jpg', 'inside-2.jpg'])
+
+    def test_rejects_missing_or_too_large_area(self):
+        self.assertEqual(self.search().status_code, 400)
+        self.assertEqual(self.search(lat=34.81, lon=126.39).status_code, 400)
+        with override_settings(FIELDPIC_GEO_MAX_ROWS=10):
+            response = self.search(min_lat=34.0, min_lon=126.0, max_lat=35.0, max_lon=127.0)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.search(polygon='not json').status_code, 400)
+
+    def test_backfill_geo_cells(self):
+        pic = self.pic('center.jpg', 34.81, 126.39)
+        FieldPic.objects.filter(pk=pic.pk).update(geo_cell=None)
+        call_command('backfill_pic_geo_cells', stdout=io.StringIO())
+        self.assertEqual(self.search(lat=34.81, lon=126.39, radius=10).data['results'][0]['id'], pic.pk)
+
+
+def square(lon, lat, size=0.003):
+    return {'type': 'Polygon', 'coordinates': [[
+        [lon, lat], [lon + size, lat], [lon + size, lat + size], [lon, lat + size], [lon, lat],
+    ]]}
+
+
+class FieldAutoAssignTest(FieldPicTestCase):
+    def setUp(self):
+        super().setUp()
+        reset_field_index()
+        self.addCleanup(reset_field_index)
+        self.owner = self.field.owner
+        self.field.geometry = square(126.389, 34.809)
+        self.field.save()
+        self.other_field = Field.objects.create(
+            field_name='옆 노지', field_address='전라남도 목포시', field_area=100.0,
+            crop_name='무', description='', owner=self.owner, geometry=square(126.389, 34.819),
+        )
+        # 같은 위치의 다른 사용자 노지에는 배정되지 않아야 함
+        stranger = User.objects.create_user(email='stranger@test.com', password='pw', username='stranger')
+        Field.objects.create(
+            field_name='남의 노지', field_address='전라남도 목포시', field_area=100.0,
+            crop_name='무', description='', owner=stranger, geometry=square(126.389, 34.809),
+        )
+
+    def test_bulk_flight_over_several_fields(self):
+        taken = datetime(2025, 5, 26, 10, 0, 0)
+        pics = [
+            SimpleUploadedFile(name, gps_jpeg_bytes(lat, 126.39, taken))
+            for name, lat in (('a1.JPG', 34.810), ('a2.JPG', 34.811), ('b1.JPG', 34.820), ('road.JPG', 34.830))
+        ] + [SimpleUploadedFile('no-gps.JPG', jpeg_bytes('blue'))]
+
+        with mock.patch('photoapp.tasks.generate_pic_derivatives_batch.delay'), \
+                mock.patch('photoapp.tasks.queue_for_analysis'):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post('/photo/upload/bulk/', {
+                    'user_id': self.owner.id, 'pics': pics,
+                }, format='multipart')
+
+        data = response.data['data']
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {pic['pic_name']: pic['field_id'] for pic in data['pics']},
+            {'a1.JPG': self.field.pk, 'a2.JPG': self.field.pk, 'b1.JPG': self.other_field.pk},
+        )
+        self.assertEqual(data['unassigned'], ['no-gps.JPG', 'road.JPG'])
+        # 배정되지 않은 사진 파일은 남기지 않음
+        stored = [name for _, _, names in os.walk(os.path.join(self.media_root, 'pics')) for name in names]
+        self.assertEqual(len(stored), 3)
+
+    def test_single_upload_without_field_id(self):
+        def post(content, **data):
+            with mock.patch('photoapp.tasks.extract_pic_exif.delay') as exif, \
+                    mock.patch('photoapp.tasks.generate_pic_derivatives.delay'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.client.post('/photo/upload/', {
+                        'pic_path': SimpleUploadedFile('DJI_0001.JPG', content, content_type='image/jpeg'), **data,
+                    }, format='multipart')
+            return response, exif
+
+        response, exif = post(gps_jpeg_bytes(34.820, 126.39, datetime(2025, 5, 26, 10, 0, 0)), user_id=self.owner.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['field_id'], self.other_field.pk)
+        self.assertAlmostEqual(response.data['data']['latitude'], 34.820, places=5)
+        exif.assert_not_called()  # 위치를 찾느라 이미 읽음
+
+        response, _ = post(gps_jpeg_bytes(34.830, 126.39, datetime(2025, 5, 26, 10, 0, 0)), user_id=self.owner.id)
+        self.assertEqual(response.status_code, 422)
+        response, _ = post(jpeg_bytes('blue'))
+        self.assertEqual(response.status_code, 400)
+
+
+class NearDuplicateTest(FieldPicTestCase):
+    def scene(self, seed):
+        image = Image.new('L', (320, 240))
+        image.putdata([(x * seed + y * 7) % 256 for y in range(240) for x in range(320)])
+        return image
+
+    def test_dhash_survives_resize_but_not_new_scene(self):
+        original = dhash(self.scene(3))
+        self.assertLessEqual(hamming(original, dhash(self.scene(3).resize((160, 120)))), 4)
+        self.assertGreater(hamming(original, dhash(self.scene(11))), 10)
+
+    def test_bk_tree_matches_linear_search(self):
+        rnd = random.Random(7)
+        hashes = [rnd.getrandbits(64) - (1 << 63) for _ in range(500)]
+        tree = BKTree()
+        for index, value in enumerate(hashes):
+            tree.add(value, index)
+        for query in hashes[:20]:
+            expected = sorted(i for i, value in enumerate(hashes) if hamming(query, value) <= 12)
+            self.assertEqual(sorted(i for _, i in tree.search(query, 12)), expected)
+
+    def test_hovering_frames_are_flagged_and_skip_analysis(self):
+        taken = datetime(2025, 5, 26, 10, 0, 0)
+        frames = [
+            ('hover-1.JPG', 34.81, taken),
+            ('hover-2.JPG', 34.81, taken.replace(second=2)),  # 같은 자리에서 2초 뒤
+            ('next-row.JPG', 34.811, taken.replace(second=4)),  # 같은 모양이어도 100m 떨어짐
+        ]
+        pics = [SimpleUploadedFile(name, gps_jpeg_bytes(lat, 126.39, time)) for name, lat, time in frames]
+        # 커밋 후 등록 순서 그대로 실행 (축소본 묶음 작업을 바로 실행)
+        with mock.patch('photoapp.tasks.generate_pic_derivatives_batch.delay', side_effect=generate_pic_derivatives_batch), \
+                mock.patch('photoapp.tasks.queue_for_analysis') as analyze:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post('/photo/upload/bulk/', {'field_id': self.field.field_id, 'pics': pics}, format='multipart')
+
+        by_name = {pic.pic_name: pic for pic in FieldPic.objects.filter(field=self.field)}
+        analyze.assert_called_once_with(sorted([by_name['hover-1.JPG'].pk, by_name['next-row.JPG'].pk]))
+        self.assertIsNotNone(by_name['hover-1.JPG'].phash)
+        self.assertIsNone(by_name['hover-1.JPG'].near_duplicate_of_id)
+        self.assertEqual(by_name['hover-2.JPG'].near_duplicate_of_id, by_name['hover-1.JPG'].pk)
+        self.assertIsNone(by_name['next-row.JPG'].near_duplicate_of_id)
+
+        paths = analyzer.pics_by_path([pic.pk for pic in by_name.values()])
+        self.assertEqual(sorted(pic.pic_name for pic in paths.values()), ['hover-1.JPG', 'next-row.JPG'])
+
+    def test_interleaved_workers_never_flag_each_other(self):
+        taken = datetime(2025, 5, 26, 10, 0, 0, tzinfo=timezone.utc)
+        first, second = [
+            FieldPic.objects.create(
+                field=self.field, pic_name=f'{i}.jpg', pic_path=f'pics/{i}.jpg', phash=12345,
+                latitude=34.81, longitude=126.39, pic_time=taken.replace(second=i * 2),
+            )
+            for i in range(2)
+        ]
+        # 두 워커가 모두 읽은 뒤에 쓰는 경우: 쓰기를 모아뒀다가 나중에 반영
+        writes = []
+        with mock.patch.object(FieldPic.objects, 'bulk_update', side_effect=lambda pics, fields: writes.extend(pics)):
+            mark_near_duplicates([second.pk])
+            mark_near_duplicates([first.pk])
+        FieldPic.objects.bulk_update(writes, ['near_duplicate_of'])
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertIsNone(first.near_duplicate_of_id)
+        self.assertEqual(second.near_duplicate_of_id, first.pk)
+
+    def test_single_uploads_queue_analysis_after_flagging(self):
+        taken = datetime(2025, 5, 26, 10, 0, 0)
+        with mock.patch('photoapp.tasks.extract_pic_exif.delay', side_effect=extract_pic_exif), \
+                mock.patch('photoapp.tasks.generate_pic_derivatives.delay', side_effect=generate_pic_derivatives), \
+                mock.patch('photoapp.tasks.queue_for_analysis') as analyze:
+            for second in (0, 2):
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.upload(f'hover-{second}.JPG', gps_jpeg_bytes(34.81, 126.39, taken.replace(second=second)))
+
+        first, second = FieldPic.objects.filter(field=self.field).order_by('pic_time')
+        self.assertEqual(second.near_duplicate_of_id, first.pk)
+        self.assertEqual([call.args[0] for call in analyze.call_args_list], [[first.pk], []])
+
+
+class FieldPicMediaTest(FieldPicTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = jpeg_bytes('red', size=(64, 48))
+        self.data = self.upload('DJI_0001.JPG', self.content).data['data']
+        self.url = self.data['image_url']
+
+    def test_signed_url_with_range_and_cache_headers(self):
+        self.assertEqual(self.data['pic_path'], FieldPic.objects.get().pic_path)
+        self.assertFalse(os.path.isabs(self.data['pic_path']))
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('immutable', response['Cache-Control'])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), self.content[10:20])
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.content)}')
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-5:])
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.content)}-').status_code, 416)
+
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_ownership_without_signature(self):
+        unsigned = f"/photo/media/{self.data['id']}/original/"
+        self.assertEqual(self.client.get(unsigned).status_code, 404)
+        self.assertEqual(self.client.get(unsigned + '?sig=forged').status_code, 404)
+        self.assertEqual(self.client.get(f"/photo/media/{self.data['id']}/thumb.webp/" + self.url[self.url.index('?'):]).status_code, 404)
+
+        stranger = User.objects.create_user(email='stranger@test.com', password='pw', username='stranger')
+        self.client.force_authenticate(user=stranger)
+        self.assertEqual(self.client.get(unsigned).status_code, 404)
+        self.client.force_authenticate(user=self.field.owner)
+        self.assertEqual(self.client.get(unsigned).status_code, 200)
+
+    def test_signature_expires_and_follows_ownership(self):
+        with mock.patch('photoapp.media.time.time', return_value=time.time() + settings.FIELDPIC_MEDIA_URL_MAX_AGE * 2):
+            self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        # 같은 사진이라도 다른 사진 ID로 바꾼 서명, 노지 주인이 바뀐 뒤의 서명은 거부
+        other = FieldPic.objects.create(field=self.field, pic_name='other.jpg', pic_path=self.data['pic_path'])
+        self.assertEqual(self.client.get(f'/photo/media/{other.pk}/original/' + self.url[self.url.index('?'):]).status_code, 404)
+        stranger = User.objects.create_user(email='stranger@test.com', password='pw', username='stranger')
+        Field.objects.filter(pk=self.field.pk).update(owner=stranger)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_transfer_is_handed_to_web_server(self):
+        with override_settings(FIELDPIC_MEDIA_SERVER='nginx'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + self.data['pic_path'])
+        self.assertEqual(response.content, b'')
+        with override_settings(FIELDPIC_MEDIA_SERVER='apache'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Sendfile'], os.path.join(self.media_root, self.data['pic_path']))
+
+    def test_migration_makes_paths_relative(self):
+        pic = FieldPic.objects.get()
+        FieldPic.objects.update(pic_path=os.path.join(self.media_root, pic.pic_path))
+        FieldPic.objects.create(field=self.field, pic_name='elsewhere.jpg', pic_path='/mnt/old/elsewhere.jpg')
+
+        importlib.import_module('photoapp.migrations.0011_relative_pic_path').to_relative(apps, None)
+        self.assertEqual(FieldPic.objects.get(pk=pic.pk).pic_path, pic.pic_path)
+        self.assertEqual(FieldPic.objects.get(pic_name='elsewhere.jpg').pic_path, '/mnt/old/elsewhere.jpg')
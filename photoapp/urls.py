@@ -1,8 +1,27 @@
 from django.urls import path
-from .views import UploadFieldPicAPIView,FieldSummaryAPIView
+from .views import (
+    UploadFieldPicAPIView, BulkUploadFieldPicAPIView, ResumableUploadAPIView,
+    ResumableUploadChunkAPIView, ResumableUploadCompleteAPIView,
+    AnalysisResultAPIView, AnalysisQueueMetricsAPIView, FieldSummaryAPIView, FieldPicSearchAPIView,
+    FieldPicMediaAPIView,
+)
 
 urlpatterns = [
     path('upload/', UploadFieldPicAPIView.as_view(), name='upload-field-pic'),
+    # 여러 장 / zip·tar 일괄 업로드
+    path('upload/bulk/', BulkUploadFieldPicAPIView.as_view(), name='bulk-upload-field-pic'),
+    # 이어받기(청크) 업로드: 시작 → 바이트 구간 PUT → offset 조회 → 완료
+    path('upload/resumable/', ResumableUploadAPIView.as_view(), name='resumable-upload'),
+    path('upload/resumable/<uuid:upload_id>/', ResumableUploadChunkAPIView.as_view(), name='resumable-upload-detail'),
+    path('upload/resumable/<uuid:upload_id>/complete/', ResumableUploadCompleteAPIView.as_view(), name='resumable-upload-complete'),
+    # 분석 서버 결과 콜백 (공유 토큰)
+    path('analysis/results/', AnalysisResultAPIView.as_view(), name='analysis-results'),
+    # 분석 서버 전송 대기열 지표 (관리자)
+    path('analysis/metrics/', AnalysisQueueMetricsAPIView.as_view(), name='analysis-queue-metrics'),
+    # 사진 원본 / 축소본 파일 (권한 확인 후 nginx / apache로 전송 위임)
+    path('media/<int:field_pic_id>/<str:variant>/', FieldPicMediaAPIView.as_view(), name='field-pic-media'),
+    # 촬영 위치(반경 / bbox / 다각형 / 노지) + 기간으로 사진 조회
+    path('search/', FieldPicSearchAPIView.as_view(), name='field-pic-search'),
     #대표자신 get 
     path('summary/', FieldSummaryAPIView.as_view(), name='field-summary'),  
 
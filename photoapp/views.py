@@ -1,84 +1,91 @@
 import os
 import json
 import base64
+import hmac
 from datetime import datetime, timedelta
-from random import choice
 
+import redis
 from django.conf import settings
-from django.utils.timezone import make_aware
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser, BasePermission
 from rest_framework.authentication import SessionAuthentication, BasicAuthentication
 
-from rest_framework.parsers import MultiPartParser, FormParser
-
-from PIL import Image
-from PIL.ExifTags import TAGS, GPSTAGS
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
 from .serializers import FieldPicSerializer
-from .models import FieldPic
+from .models import FieldPic, PicUpload
 from fieldmanage.models import Field
-from .tasks import enqueue_pic_path_task
-import piexif
-
-def convert_to_degrees(value):
-
-    d = float(value[0][0]) / float(value[0][1])
-    m = float(value[1][0]) / float(value[1][1])
-    s = float(value[2][0]) / float(value[2][1])
-    
-    return d + (m / 60.0) + (s / 3600.0)
-
-
-def extract_exif_data(img_path):
+from .storage import media_path, store_file, store_upload
+from . import analysis, analyzer
+from .derivatives import derivative_urls
+from . import media
+from .media import media_url
+from .bulk import ARCHIVE_ERRORS, ArchiveTooLarge, discard_unused, ingest, iter_archive, iter_uploaded_files
+from .exif import read_exif
+from .resumable import UploadConflict, append_chunk, create_part, parse_content_range, part_path, received
+from config.pagination import KeysetPagination
+from fieldmanage.geometry import contains_point, get_bbox
+from fieldmanage.spatial_index import assign_points
+
+User = get_user_model()
+
+def save_field_pic(field, pic_name, pic_path, content_hash, serializer=None, exif=None):
+    """
+    같은 노지에 같은 내용(content_hash)의 사진이 있으면 그 FieldPic을, 없으면 새로 저장해 반환
+    EXIF(위치/촬영 시각)와 축소본은 저장 후 Celery 작업에서 채움 (photoapp.signals)
+    노지 자동 배정처럼 EXIF를 이미 읽었으면 exif=(latitude, longitude, pic_time)로 넘겨 EXIF 작업 생략
+    반환값: (FieldPic, 중복 여부)
+    """
+    instance = FieldPic.objects.filter(field=field, content_hash=content_hash).first()
+    if instance is not None:
+        return instance, True
+    values = {'field': field, 'pic_name': pic_name, 'pic_path': pic_path, 'content_hash': content_hash}
+    if serializer:
+        return serializer.save(**values), False
+
+    if exif is not None:
+        latitude, longitude, pic_time = exif
+        values.update(latitude=latitude, longitude=longitude, pic_time=timezone.make_aware(pic_time) if pic_time else None)
+    instance = FieldPic(**values)
+    instance.exif_extracted = exif is not None
+    instance.save()
+    return instance, False
+
+
+def owner_id_param(request):
+    """field_id 없이 올릴 때 노지를 찾을 사용자 (user_id), 없거나 정수가 아니면 None"""
     try:
-        # img = Image.open(img_path)
-        exif_dict = piexif.load(img_path)
-        print(exif_dict)
-        
-        # exif_data = img.getexif()
-        gps_data = {}
-        pic_time = None
-        for tag, value in exif_dict.items():
-            tag_name = TAGS.get(tag, tag)
-            
-            if tag_name == 'DateTimeOriginal':
-                try:
-                    pic_time = datetime.strptime(value, '%Y:%m:%d %H:%M:%S')
-                except Exception as e:
-                    print(f"Time parse error: {e}")
-            if tag_name == 'GPSInfo' and isinstance(value, dict) or hasattr(value, 'items'):
-                for t in value:
-                    sub_tag = GPSTAGS.get(t, t)
-                    gps_data[sub_tag] = value[t]
-
-        lat = gps_data.get('GPSLatitude')
-        lat_ref = gps_data.get('GPSLatitudeRef')
-        lon = gps_data.get('GPSLongitude')
-        lon_ref = gps_data.get('GPSLongitudeRef')
-
-        latitude = convert_to_degrees(lat) if lat else None
-        longitude = convert_to_degrees(lon) if lon else None
-
-        if latitude and lat_ref == 'S':
-            latitude = -latitude
-        if longitude and lon_ref == 'W':
-            longitude = -longitude
-        return latitude, longitude, pic_time
-
-
-    except Exception as e:
-        print(f"EXIF error: {e}")
-        return None, None, None
-
-def get_dynamic_path(user_id, field_id):
-    repo_root = settings.MEDIA_ROOT
-    user_dir = os.path.join(repo_root, f'user_id_{user_id}')
-    field_dir = os.path.join(user_dir, f'field_id_{field_id}')
-    os.makedirs(field_dir, exist_ok=True)
-    return field_dir
+        return int(request.data.get('user_id'))
+    except (TypeError, ValueError):
+        return None
+
+
+def field_pic_response(instance, field, duplicate=False):
+    return Response({
+        'status': 'success',
+        'message': 'FieldPic already uploaded' if duplicate else 'FieldPic uploaded successfully',
+        'data': {
+            'id': instance.field_pic_id,
+            'pic_name': instance.pic_name,
+            'pic_path': instance.pic_path,
+            # 업로드는 인증 없이 받으므로 노지 주인에게 발급
+            'image_url': media_url(instance.field_pic_id, field.owner_id) if instance.pic_path else None,
+            'content_hash': instance.content_hash,
+            'duplicate': duplicate,
+            'longitude': instance.longitude,
+            'latitude': instance.latitude,
+            'pic_time': instance.pic_time.strftime('%Y-%m-%d %H:%M:%S') if instance.pic_time else None,
+            'field_id': field.field_id,
+            'user_id': field.owner.id
+        }
+    })
+
 
 class UploadFieldPicAPIView(APIView):
     authentication_classes = []  # ⬅️ 인증 완전히 비활성화
@@ -89,7 +96,11 @@ class UploadFieldPicAPIView(APIView):
         field_id = request.data.get('field_id')
 
         if not field_id:
-            return Response({'error': 'field_id is required'}, status=400)
+            # field_id 대신 user_id를 주면 사진 GPS 위치로 그 사용자의 노지를 찾아 저장
+            owner_id = owner_id_param(request)
+            if owner_id is None:
+                return Response({'error': 'field_id or user_id is required'}, status=400)
+            return self.post_auto_assign(request, owner_id)
 
         try:
             field = Field.objects.get(pk=field_id)
@@ -98,83 +109,410 @@ class UploadFieldPicAPIView(APIView):
 
         serializer = FieldPicSerializer(data=request.data)
         if serializer.is_valid():
-            instance = serializer.save(field=field)
             image_file = request.FILES.get('pic_path')
-            
+            duplicate = False
+
             if image_file:
                 try:
-                    save_dir = get_dynamic_path(field.owner.id, field.field_id)
-                    filename = image_file.name
-                    filepath = os.path.join(save_dir, filename)
-                    with open(filepath, 'wb+') as dest:
-                        print(filepath)
-                        for chunk in image_file.chunks():
-                            dest.write(chunk)
-
-                    # ✅ 사진 이름 및 경로 저장
-                    instance.pic_name = image_file.name
-                    instance.pic_path = filepath
-
-                    # EXIF 데이터 추출 및 저장
-                    img = Image.open(filepath)
-                    lat, lon, pic_time = extract_exif_data(filepath)
-                    instance.latitude = lat if lat else None
-                    instance.longitude = lon if lon else None
-                    instance.pic_time = make_aware(pic_time) if pic_time else None
-                    instance.save()
-
-                except Exception as e:
+                    # 받으면서 SHA-256 계산 → pics/ab/cd/<sha256>.jpg 로 한 번만 저장
+                    digest, filepath, _ = store_upload(image_file)
+                except OSError as e:
                     return Response({'error': f'Image processing failed: {str(e)}'}, status=500)
 
-            return Response({
-                'status': 'success',
-                'message': 'FieldPic uploaded successfully',
-                'data': {
-                    'id': instance.field_pic_id,
-                    'pic_name': instance.pic_name,
-                    'pic_path': instance.pic_path,
-                    'longitude': instance.longitude,
-                    'latitude': instance.latitude,
-                    'pic_time': instance.pic_time.strftime('%Y-%m-%d %H:%M:%S') if instance.pic_time else None,
-                    'field_id': field.field_id,
-                    'user_id': field.owner.id
-                }
-            })
+                # 같은 노지에 같은 사진이 이미 있으면 EXIF/분석 없이 기존 FieldPic 반환
+                instance, duplicate = save_field_pic(field, image_file.name, filepath, digest, serializer)
+            else:
+                instance = serializer.save(field=field)
+
+            return field_pic_response(instance, field, duplicate)
         else:
             return Response({'status': 'error', 'errors': serializer.errors}, status=400)
 
+    def post_auto_assign(self, request, owner_id):
+        image_file = request.FILES.get('pic_path')
+        if not image_file:
+            return Response({'error': 'pic_path is required'}, status=400)
 
+        try:
+            digest, filepath, new = store_upload(image_file)
+        except OSError as e:
+            return Response({'error': f'Image processing failed: {str(e)}'}, status=500)
+
+        # 노지를 정하려면 위치가 필요하므로 EXIF는 요청 안에서 읽음 (APP1 세그먼트만)
+        latitude, longitude, pic_time = read_exif(media_path(filepath))
+        field_id = assign_points([(latitude, longitude)], owner_id)[0]
+        if field_id is None:
+            if new:
+                discard_unused(filepath)
+            message = 'Photo has no GPS location' if latitude is None else 'No field contains the photo location'
+            return Response({'error': message}, status=422)
+
+        field = Field.objects.select_related('owner').get(pk=field_id)
+        instance, duplicate = save_field_pic(
+            field, image_file.name, filepath, digest, exif=(latitude, longitude, pic_time),
+        )
+        return field_pic_response(instance, field, duplicate)
+
+
+class ResumableUploadMixin:
+    """
+    큰 사진을 끊겨도 이어서 올리는 업로드 (드론 지상국 / 농촌 회선용)
+    1. POST   upload/resumable/                 {field_id, pic_name, size} → upload_id
+    2. PUT    upload/resumable/<id>/            Content-Range: bytes start-end/size, 본문 = 해당 바이트
+    3. GET    upload/resumable/<id>/            → 받은 offset (끊긴 뒤 여기서부터 다시 PUT)
+    4. POST   upload/resumable/<id>/complete/   → FieldPic 생성 (일반 업로드와 같은 응답)
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
 
+    def get_upload(self, upload_id):
+        upload = PicUpload.objects.select_related('field__owner').filter(pk=upload_id).first()
+        if upload is None or received(upload) is None:
+            return None
+        return upload
 
-class FieldSummaryAPIView(APIView):
+    def offset_response(self, upload, status=200, error=None):
+        data = {'upload_id': str(upload.upload_id), 'offset': received(upload), 'size': upload.size}
+        if error:
+            data['error'] = error
+        return Response(data, status=status)
+
+
+class ResumableUploadAPIView(ResumableUploadMixin, APIView):
+    parser_classes = [JSONParser, FormParser]
+
+    def post(self, request):
+        field_id = request.data.get('field_id')
+        pic_name = request.data.get('pic_name')
+        try:
+            size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            size = 0
+        if not field_id or not pic_name or size <= 0:
+            return Response({'error': 'field_id, pic_name and size are required'}, status=400)
+        if size > settings.FIELDPIC_UPLOAD_MAX_SIZE:
+            return Response({'error': f'size must be <= {settings.FIELDPIC_UPLOAD_MAX_SIZE}'}, status=413)
+
+        try:
+            field = Field.objects.get(pk=field_id)
+        except Field.DoesNotExist:
+            return Response({'error': 'Invalid field_id'}, status=404)
+
+        upload = PicUpload.objects.create(field=field, pic_name=pic_name[:255], size=size)
+        create_part(upload)
+        return self.offset_response(upload, status=201)
+
+
+class ResumableUploadChunkAPIView(ResumableUploadMixin, APIView):
+    def get(self, request, upload_id):
+        upload = self.get_upload(upload_id)
+        if upload is None:
+            return Response({'error': 'Invalid upload_id'}, status=404)
+        return self.offset_response(upload)
+
+    def put(self, request, upload_id):
+        upload = self.get_upload(upload_id)
+        if upload is None:
+            return Response({'error': 'Invalid upload_id'}, status=404)
+
+        content_range = parse_content_range(request.headers.get('Content-Range'))
+        if content_range is None or content_range[2] != upload.size:
+            return self.offset_response(upload, status=400, error='Content-Range: bytes start-end/size is required')
+        start, end, _ = content_range
+
+        try:
+            # 파서를 거치지 않고 요청 본문을 조금씩 읽어 바로 디스크에 씀
+            offset = append_chunk(upload, start, end - start + 1, request.stream)
+        except UploadConflict as e:
+            return self.offset_response(upload, status=409, error=str(e))
+        return Response({'upload_id': str(upload.upload_id), 'offset': offset, 'size': upload.size})
+
+
+class ResumableUploadCompleteAPIView(ResumableUploadMixin, APIView):
+    def post(self, request, upload_id):
+        upload = self.get_upload(upload_id)
+        if upload is None:
+            return Response({'error': 'Invalid upload_id'}, status=404)
+        if received(upload) != upload.size:
+            return self.offset_response(upload, status=409, error='upload is not complete')
+
+        try:
+            # 청크를 이어 붙인 임시 파일을 그대로 해시 → 내용 주소 경로로 이동 (메모리에 올리지 않음)
+            digest, filepath, _ = store_file(part_path(upload), upload.pic_name)
+        except OSError as e:
+            return Response({'error': f'Image processing failed: {str(e)}'}, status=500)
+
+        instance, duplicate = save_field_pic(upload.field, upload.pic_name, filepath, digest)
+        upload.delete()
+        return field_pic_response(instance, upload.field, duplicate)
+
+
+class BulkUploadFieldPicAPIView(APIView):
+    """
+    드론 비행 한 번 분량의 사진을 한 요청으로 업로드
+    multipart: field_id + pics(여러 파일) 또는 archive(zip / tar / tar.gz)
+    field_id 대신 user_id를 주면 사진마다 GPS 위치로 그 사용자의 노지를 배정 (여러 노지를 지나간 비행)
+    """
+    authentication_classes = []
     permission_classes = [AllowAny]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        field_id = request.data.get('field_id')
+        field = owner_id = None
+
+        if field_id:
+            try:
+                field = Field.objects.get(pk=field_id)
+            except Field.DoesNotExist:
+                return Response({'error': 'Invalid field_id'}, status=404)
+        else:
+            owner_id = owner_id_param(request)
+            if owner_id is None:
+                return Response({'error': 'field_id or user_id is required'}, status=400)
+
+        archive = request.FILES.get('archive')
+        files = request.FILES.getlist('pics')
+        if not archive and not files:
+            return Response({'error': 'pics or archive is required'}, status=400)
+
+        sources = iter_archive(archive) if archive else iter_uploaded_files(files)
+        try:
+            result = ingest(field, sources, owner_id)
+        except ARCHIVE_ERRORS as e:
+            return Response({'error': f'Invalid archive: {str(e)}'}, status=400)
+        except ArchiveTooLarge as e:
+            return Response({'error': str(e)}, status=413)
+        except OSError as e:
+            return Response({'error': f'Image processing failed: {str(e)}'}, status=500)
+
+        return Response({
+            'status': 'success',
+            'message': f"{len(result['pics'])} FieldPics uploaded",
+            'data': {
+                'field_id': field.field_id if field else None,
+                'created': len(result['pics']),
+                'duplicates': result['duplicates'],
+                'skipped': result['skipped'],
+                'unassigned': result['unassigned'],
+                'pics': [{
+                    'id': pic['field_pic_id'],
+                    'field_id': pic['field_id'],
+                    'pic_name': pic['pic_name'],
+                    'content_hash': pic['content_hash'],
+                    'longitude': pic['longitude'],
+                    'latitude': pic['latitude'],
+                    'pic_time': pic['pic_time'].strftime('%Y-%m-%d %H:%M:%S') if pic['pic_time'] else None,
+                } for pic in result['pics']],
+            }
+        })
+
+
+class AnalyzerTokenPermission(BasePermission):
+    """분석 서버 콜백용: Authorization: Bearer <FIELDPIC_ANALYZER_CALLBACK_TOKEN> (토큰 미설정 시 모두 거부)"""
+    def has_permission(self, request, view):
+        token = settings.FIELDPIC_ANALYZER_CALLBACK_TOKEN
+        header = request.headers.get('Authorization', '')
+        return bool(token) and hmac.compare_digest(header.encode(), f'Bearer {token}'.encode())
+
+
+class AnalysisResultAPIView(APIView):
+    """
+    분석 서버가 여러 사진의 병해충 결과를 한 번에 돌려주는 콜백
+    {"results": [{"field_pic_id": 1, "pests": [...], "diseases": [...]}, ...]}
+    같은 결과를 다시 보내도 (사진, 이름) 기준으로 중복 저장하지 않음
+    """
+    authentication_classes = []  # JWT 대신 공유 토큰
+    permission_classes = [AnalyzerTokenPermission]
+    parser_classes = [JSONParser]
+
+    def post(self, request):
+        try:
+            detections = analyzer.parse_detections(request.data.get('results'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        if len(detections) > settings.FIELDPIC_ANALYSIS_RESULT_MAX:
+            return Response({'error': f'at most {settings.FIELDPIC_ANALYSIS_RESULT_MAX} detections per request'}, status=413)
+
+        summary = analyzer.ingest_detections(detections)
+        return Response({
+            'status': 'success',
+            'message': f"{summary['pest'] + summary['disease']} results saved",
+            'data': summary,
+        })
+
+
+class AnalysisQueueMetricsAPIView(APIView):
+    """분석 서버 전송 대기열 지표 (묶음 크기, 지연 시간, 대기/전송 중 사진 수)"""
+    permission_classes = [IsAdminUser]
 
     def get(self, request):
-        user_id = request.query_params.get('user_id')
-        if not user_id:
-            return Response({"error": "user_id is required"}, status=400)
+        try:
+            return Response(analysis.metrics())
+        except redis.RedisError as e:
+            return Response({'error': f'Redis unavailable: {str(e)}'}, status=503)
+
+
+def _float_param(params, name):
+    try:
+        return float(params[name])
+    except ValueError:
+        raise ValueError(f'{name} must be a number')
+
+
+def _time_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f'{name} must be an ISO 8601 datetime')
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+class FieldPicSearchAPIView(APIView):
+    """
+    촬영 위치 + 기간으로 사진 조회 (본인 노지의 사진만, 관리자는 전체)
+    위치 조건은 하나만: ?lat=&lon=&radius=(m) | ?min_lat=&min_lon=&max_lat=&max_lon= | ?polygon=GeoJSON | ?field_id=(노지 경계)
+    기간: ?start= / ?end= (ISO 8601, start 이상 end 미만)
+    (geo_cell, pic_time) 인덱스로 후보를 좁히고 최신 업로드순 cursor 페이지네이션 → 사진 수와 무관하게 페이지당 비용 일정
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        pics = FieldPic.objects.only(
+            'field_pic_id', 'field_id', 'pic_name', 'latitude', 'longitude', 'pic_time', 'derivatives',
+            'near_duplicate_of',
+        )
+        if not request.user.is_staff:
+            pics = pics.filter(field__owner=request.user)
+
+        geometry = None
+        try:
+            pics = pics.taken_between(_time_param(params, 'start'), _time_param(params, 'end'))
+            if 'radius' in params:
+                radius = _float_param(params, 'radius')
+                if radius <= 0:
+                    raise ValueError('radius must be positive')
+                pics = pics.within_radius(_float_param(params, 'lat'), _float_param(params, 'lon'), radius)
+            elif 'min_lat' in params:
+                pics = pics.within_bbox(*(_float_param(params, name) for name in ('min_lat', 'min_lon', 'max_lat', 'max_lon')))
+            elif 'polygon' in params or 'field_id' in params:
+                if 'polygon' in params:
+                    geometry = json.loads(params['polygon'])
+                else:
+                    fields = Field.objects.all() if request.user.is_staff else Field.objects.filter(owner=request.user)
+                    field = fields.filter(pk=params['field_id']).only('geometry').first()
+                    if field is None:
+                        return Response({'error': 'Field not found'}, status=404)
+                    geometry = field.geometry
+                bbox = get_bbox(geometry)
+                if bbox is None:
+                    raise ValueError('polygon must be a GeoJSON Polygon or MultiPolygon')
+                min_lon, min_lat, max_lon, max_lat = bbox
+                pics = pics.within_bbox(min_lat, min_lon, max_lat, max_lon)
+            else:
+                raise ValueError('one of radius, min_lat, polygon or field_id is required')
+        except KeyError as e:
+            return Response({'error': f'{e.args[0]} is required'}, status=400)
+        except (ValueError, TypeError, IndexError) as e:  # json.JSONDecodeError는 ValueError
+            return Response({'error': str(e)}, status=400)
+
+        # ORDER BY pk DESC LIMIT이면 DB가 geo_cell 인덱스 대신 pk를 거꾸로 훑음 → 인덱스를 못 쓰는 pk + 0으로 정렬
+        pics = pics.annotate(search_order=F('field_pic_id') + 0)
+        paginator = KeysetPagination(key='search_order', descending=True)
+        if geometry is None:
+            page = paginator.paginate_queryset(pics, request)
+        else:
+            # bbox 안 후보 중 실제 다각형 안에 있는 사진만
+            page = paginator.paginate_filtered(
+                pics, request, lambda pic: contains_point(geometry, pic.longitude, pic.latitude),
+            )
+        return paginator.get_paginated_response([
+            {
+                'id': pic.field_pic_id,
+                'field_id': pic.field_id,
+                'pic_name': pic.pic_name,
+                'latitude': pic.latitude,
+                'longitude': pic.longitude,
+                'pic_time': pic.pic_time.strftime('%Y-%m-%d %H:%M:%S') if pic.pic_time else None,
+                'image_url': media_url(pic.field_pic_id, request.user.pk, request=request),
+                'thumbnails': derivative_urls(pic.field_pic_id, pic.derivatives, request.user.pk, request),
+                'near_duplicate_of': pic.near_duplicate_of_id,
+            }
+            for pic in page
+        ])
+
+
+class FieldPicMediaAPIView(APIView):
+    """
+    사진 원본 / 축소본 파일 (variant = original | <label>.<fmt>)
+    본인 노지 사진(관리자는 전체)이거나 API 응답으로 발급한 서명(?sig=)이 맞을 때만 전달
+    바이트 전송은 FIELDPIC_MEDIA_SERVER(nginx X-Accel-Redirect / apache X-Sendfile)가 맡아 워커를 점유하지 않음
+    """
+    permission_classes = [AllowAny]  # <img> 태그는 인증 헤더 없이 서명 URL로 열므로 권한은 아래에서 확인
+
+    def get(self, request, field_pic_id, variant):
+        pic = (
+            FieldPic.objects.filter(pk=field_pic_id)
+            .only('field_pic_id', 'pic_path', 'content_hash', 'derivatives', 'field__owner')
+            .select_related('field')
+            .first()
+        )
+        allowed = pic is not None and (
+            self.signed_for_owner(pic, media.verify(field_pic_id, request.query_params.get('sig')))
+            or (request.user.is_authenticated and (request.user.is_staff or pic.field.owner_id == request.user.pk))
+        )
+        relative_path = media.variant_path(pic, variant) if allowed else None
+        if not relative_path:
+            return Response({'error': 'Not found'}, status=404)
+        return media.serve(request, relative_path, etag=f'{pic.content_hash or pic.pk}-{variant}')
+
+    @staticmethod
+    def signed_for_owner(pic, viewer_id):
+        # 서명이 맞아도 URL을 받은 사용자가 지금도 노지 주인(또는 관리자)일 때만 허용
+        if viewer_id is None:
+            return False
+        return viewer_id == pic.field.owner_id or User.objects.filter(pk=viewer_id, is_staff=True).exists()
+
+
+class FieldSummaryAPIView(APIView):
+    """본인 노지 목록 + 대표 사진 (관리자는 ?user_id=로 다른 사용자 조회)"""
+    permission_classes = [IsAuthenticated]
 
-        fields = Field.objects.filter(owner_id=user_id)
+    def get(self, request):
+        user_id = request.query_params.get('user_id')
+        if user_id is None:
+            user_id = request.user.pk
+        else:
+            try:
+                user_id = int(user_id)
+            except ValueError:
+                return Response({"error": "user_id must be an integer"}, status=400)
+            if user_id != request.user.pk and not request.user.is_staff:
+                return Response({"error": "Forbidden"}, status=403)
+
+        # 대표 사진 = 노지별 최신 사진 (서브쿼리로 함께 조회 → 노지/사진 수와 무관하게 쿼리 1회)
+        fields = (
+            Field.objects.filter(owner_id=user_id)
+            .only('field_id', 'field_name', 'description')
+            .with_latest_pic()
+            .order_by('field_id')
+        )
         result = []
 
         for field in fields:
-            pics = FieldPic.objects.filter(field_id=field.pk)
-            selected_pic = choice(pics) if pics.exists() else None
-
-            image_info = None
-            if selected_pic:
-                relative_media_path = selected_pic.pic_path.replace("repository/", "")
-                image_url = request.build_absolute_uri(settings.MEDIA_URL + relative_media_path)
-                image_info = {
-                    "image_url": image_url,
-                }
+            # 사진 URL은 요청한 사용자에게 발급
+            image_url = media_url(field.latest_pic_id, request.user.pk, request=request) if field.latest_pic_id else None
 
             result.append({
-                "user_id": int(user_id),
+                "user_id": user_id,
                 "field_id": field.pk,
                 "field_name": field.field_name,
                 "description": field.description,
-                "image_url": image_info["image_url"] if image_info else None
+                "image_url": image_url,
+                "thumbnails": derivative_urls(field.latest_pic_id, field.latest_pic_derivatives, request.user.pk, request),
             })
 
         return Response(result)
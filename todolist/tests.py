@@ -1,3 +1,35 @@
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import User
+from fieldmanage.models import Field
+from .models import FieldTodo
+
+
+class AllFieldTodosPaginationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='todo@test.com', password='pw', username='todo')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        field = Field.objects.create(
+            field_name='노지', field_address='전라남도 목포시', field_area=100.0,
+            crop_name='배추', description='', owner=self.user,
+        )
+        for i in range(5):
+            FieldTodo.objects.create(owner=self.user, field=field, task_name=f'할 일{i}', start_date=timezone.now())
+
+    def test_cursor_pagination(self):
+        url = '/todo/todos/all/'
+        seen, cursor = [], None
+        for _ in range(3):
+            params = {'page_size': 2, **({'cursor': cursor} if cursor else {})}
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            seen += [todo['task_id'] for todo in response.data['results']]
+            cursor = response.data['next_cursor']
+
+        self.assertIsNone(cursor)
+        self.assertEqual(seen, list(FieldTodo.objects.order_by('pk').values_list('pk', flat=True)))
+        self.assertEqual(self.client.get(url, {'cursor': '!!'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'cursor': 'IngiIg'}).status_code, 400)
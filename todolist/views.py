@@ -11,6 +11,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.utils.dateparse import parse_datetime
 from datetime import timedelta
 
+from config.pagination import KeysetPagination
 from .models import FieldTodo, Field, TaskProgress
 from fieldmanage.models import MonthlyKeyword
 from .serializers import FieldTodoSerializer, TaskProgressUpdateSerializer
@@ -84,6 +85,11 @@ class AllFieldTodosAPIView(APIView):
             except ValueError:
                 return Response({'error': '날짜 형식이 잘못되었습니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
+        paginator = KeysetPagination()
+        if paginator.is_requested(request):
+            page = paginator.paginate_queryset(todos, request)
+            return paginator.get_paginated_response(FieldTodoSerializer(page, many=True).data)
+
         serializer = FieldTodoSerializer(todos, many=True)
         return Response(serializer.data)
     
@@ -3,7 +3,8 @@ from weather.models import HourlyWeather, Weather
 from fieldmanage.models import Field
 from weather.weather_api.short_term import get_ultra_short_forecast
 from weather.weather_api.short_mid_term import get_combined_weather
-from weather.utils import get_region_name_from_address
+from weather.utils import get_region_name_from_address, get_field_lon_lat
+from fieldmanage.gazetteer import grid_for_field
 from django.utils import timezone
 
 @shared_task
@@ -11,10 +12,11 @@ def short_term_task_fetch_and_store_hourly_weather():
     today = timezone.now().date()
     region_cache = set()
 
-    for field in Field.objects.all():
+    # geometry(JSON) 대신 저장된 무게중심 컬럼만 읽음
+    fields = Field.objects.only('field_name', 'field_address', 'centroid_lat', 'centroid_lon', 'grid_nx', 'grid_ny')
+    for field in fields:
         try:
-            polygon = field.geometry['coordinates'][0]
-            lon, lat = polygon[0]
+            lon, lat = get_field_lon_lat(field)
             address = field.field_address
             region_name = get_region_name_from_address(address)
 
@@ -35,7 +37,7 @@ def short_term_task_fetch_and_store_hourly_weather():
                 # 단기+중기 예보 최초 저장
                 existing = Weather.objects.filter(region_name=region_name, date=today)
                 if not existing.exists():
-                    forecasts = get_combined_weather(lat, lon, address)
+                    forecasts = get_combined_weather(lat, lon, address, grid_for_field(field))
                     for f in forecasts:
                         Weather.objects.update_or_create(
                             region_name=region_name,
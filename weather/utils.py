@@ -38,6 +38,12 @@ def convert_to_grid(lat, lon):
 
 # "도 시" → "도, 시"
 def get_region_name_from_address(address: str) -> str:
+    from fieldmanage.gazetteer import region_for_address
+
+    region = region_for_address(address)
+    if region:
+        return region.region_key
+
     parts = address.split()
     if len(parts) >= 2:
         return f"{parts[0]}, {parts[1]}"
@@ -75,4 +81,10 @@ def extract_lon_lat_from_geometry(geometry):
         print(f"[오류] geometry 파싱 실패: {str(e)}. 기본 좌표(서울시청)로 대체합니다.")
         lon, lat = 126.9784, 37.5666
 
-    return lon, lat
\ No newline at end of file
+    return lon, lat
+
+# ✅ 노지 위경도: save 시 저장된 무게중심 우선, 없으면 (backfill 전 데이터) geometry 파싱
+def get_field_lon_lat(field):
+    if field.centroid_lon is not None and field.centroid_lat is not None:
+        return field.centroid_lon, field.centroid_lat
+    return extract_lon_lat_from_geometry(field.geometry)
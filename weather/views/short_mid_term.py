@@ -4,7 +4,8 @@ from rest_framework.permissions import IsAuthenticated
 from fieldmanage.models import Field
 from weather.models import Weather
 from weather.weather_api.short_mid_term import get_combined_weather
-from weather.utils import get_region_name_from_address, extract_lon_lat_from_geometry
+from weather.utils import get_region_name_from_address, get_field_lon_lat
+from fieldmanage.gazetteer import grid_for_field, representative_point
 from datetime import date, timedelta
 
 class DailyTenDaysWeatherAPIView(APIView):
@@ -17,16 +18,22 @@ class DailyTenDaysWeatherAPIView(APIView):
         print(f"[DEBUG] 로그인된 사용자 ID: {user.id}")
         print(f"[DEBUG] 요청받은 field_id: {field_id}")
         region_name = request.data.get("region_name")
-        lat, lon = None, None
+        lat, lon, grid = None, None, None
 
         if not region_name and field_id:
             try:
-                field = Field.objects.get(pk=field_id, owner=user)
+                field = Field.objects.defer('geometry').get(pk=field_id, owner=user)
             except Field.DoesNotExist:
                 return Response({"error": "해당 field_id의 Field가 존재하지 않습니다."}, status=400)
 
             region_name = get_region_name_from_address(field.field_address)
-            lon, lat = extract_lon_lat_from_geometry(field.geometry)
+            lon, lat = get_field_lon_lat(field)
+            grid = grid_for_field(field)
+        elif region_name:
+            # 노지 없이 시도 이름만 온 경우 시도청 좌표로 조회 (시군구는 노지 좌표가 있어야 새로 조회)
+            point = representative_point(region_name)
+            if point:
+                lat, lon = point
 
         today = date.today()
         target_dates = [today + timedelta(days=i) for i in range(8)]
@@ -37,7 +44,7 @@ class DailyTenDaysWeatherAPIView(APIView):
                 return Response({"error": "해당 지역의 날씨 데이터가 없습니다.\n(lat/lon 값이 없어서 새로 호출할 수 없습니다)"}, status=400)
 
             try:
-                forecasts = get_combined_weather(lat, lon, region_name)
+                forecasts = get_combined_weather(lat, lon, region_name, grid)
                 for forecast in forecasts:
                     Weather.objects.update_or_create(
                         region_name=forecast["region_name"],
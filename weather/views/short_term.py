@@ -5,7 +5,8 @@ from fieldmanage.models import Field
 from weather.weather_api.short_term import get_or_create_hourly_weather
 from weather.weather_api.short_mid_term import get_combined_weather
 from weather.models import Weather
-from weather.utils import get_region_name_from_address, extract_lon_lat_from_geometry
+from weather.utils import get_region_name_from_address, get_field_lon_lat
+from fieldmanage.gazetteer import grid_for_field
 import datetime
 from datetime import date, timedelta
 
@@ -19,9 +20,9 @@ class RealtimeShortTermWeatherAPIView(APIView):
         # ✅ 필드 조회
         try:
             if field_id:
-                field = Field.objects.get(field_id=field_id, owner=user)
+                field = Field.objects.defer('geometry').get(field_id=field_id, owner=user)
             else:
-                field = Field.objects.filter(owner=user).first()
+                field = Field.objects.defer('geometry').filter(owner=user).first()
             if not field:
                 return Response({"error": "해당 유저의 노지가 없습니다."}, status=404)
         except Field.DoesNotExist:
@@ -29,7 +30,7 @@ class RealtimeShortTermWeatherAPIView(APIView):
 
         # ✅ 위경도 및 주소 추출
         try:
-            lon, lat = extract_lon_lat_from_geometry(field.geometry)
+            lon, lat = get_field_lon_lat(field)
             region_name = get_region_name_from_address(field.field_address)
         except Exception:
             return Response({"error": "geometry 또는 주소 파싱 오류"}, status=400)
@@ -57,7 +58,7 @@ class RealtimeShortTermWeatherAPIView(APIView):
 
         if not existing_forecast.exists():
             try:
-                forecasts = get_combined_weather(lat, lon, region_name)
+                forecasts = get_combined_weather(lat, lon, region_name, grid_for_field(field))
                 for forecast in forecasts:
                     Weather.objects.update_or_create(
                         region_name=forecast["region_name"],
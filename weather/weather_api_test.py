@@ -2,27 +2,7 @@ import requests
 import datetime
 from django.conf import settings
 from .utils import convert_to_grid, get_region_name_from_address
-
-MID_TERM_REGION_CODE = {
-    "서울특별시": {"land": "11B00000", "temp": "11B10101"},
-    "인천광역시": {"land": "11B00000", "temp": "11B20201"},
-    "경기도": {"land": "11B00000", "temp": "11B20601"},
-    "강원도 영서": {"land": "11D10000", "temp": "11D10301"},
-    "강원도 영동": {"land": "11D20000", "temp": "11D20501"},
-    "충청북도": {"land": "11C10000", "temp": "11C10301"},
-    "대전광역시": {"land": "11C20000", "temp": "11C20401"},
-    "세종특별자치시": {"land": "11C20000", "temp": "11C20404"},
-    "충청남도": {"land": "11C20000", "temp": "11C20402"},
-    "전라북도": {"land": "11F10000", "temp": "11F10201"},
-    "광주광역시": {"land": "11F20000", "temp": "11F20501"},
-    "전라남도": {"land": "11F30000", "temp": "11F30401"},
-    "대구광역시": {"land": "11H10000", "temp": "11H10701"},
-    "경상북도": {"land": "11H10000", "temp": "11H10501"},
-    "부산광역시": {"land": "11H20000", "temp": "11H20201"},
-    "울산광역시": {"land": "11H20000", "temp": "11H20101"},
-    "경상남도": {"land": "11H20000", "temp": "11H20301"},
-    "제주특별자치도": {"land": "11G00000", "temp": "11G00201"}
-}
+from fieldmanage.gazetteer import mid_term_codes
 
 def get_short_term(lat, lon):
     nx, ny = convert_to_grid(lat, lon)
@@ -81,7 +61,7 @@ def get_short_term(lat, lon):
     return summary
 
 def get_mid_term(region_name):
-    code = MID_TERM_REGION_CODE.get(region_name)
+    code = mid_term_codes(region_name)
     if not code:
         return []
 